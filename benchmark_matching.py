@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the chatbot's intent matching.
+Generates a large synthetic intents file and compares the indexed matcher
+against scoring every pattern one by one.
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+
+RESPONSES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "responses.json")
+
+
+def make_synthetic_intents(path: str, intents: int = 500, patterns_per_intent: int = 100, seed: int = 42):
+    """Write a synthetic intents file with intents * patterns_per_intent patterns."""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                  for _ in range(20000)]
+
+    data = {"intents": []}
+    for i in range(intents):
+        patterns = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6)))
+                    for _ in range(patterns_per_intent)]
+        data["intents"].append({
+            "tag": f"intent_{i}",
+            "patterns": patterns,
+            "responses": [f"Response for intent {i}"]
+        })
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+
+    return vocabulary
+
+
+def brute_force_match(model: ChatbotModel, user_tokens):
+    """Score every compiled pattern in order, the way get_response used to."""
+    best_match = None
+    best_score = 0.0
+    for pattern in model.intent_index.ordered_patterns():
+        similarity = model.calculate_similarity(user_tokens, list(pattern.tokens))
+        if similarity > best_score:
+            best_score = similarity
+            best_match = pattern.intent
+    return best_match, best_score
+
+
+def benchmark_matching(messages: int = 20):
+    """Compare brute force and indexed matching on a 50k pattern intents file."""
+    print("🤖 AI ChatBot Matching Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+        vocabulary = make_synthetic_intents(intents_file)
+
+        start = time.perf_counter()
+        chatbot = ChatbotLogic(intents_file, responses_file=RESPONSES_FILE)
+        print(f"📁 Loaded {len(chatbot.intent_index)} patterns in {time.perf_counter() - start:.2f}s")
+        tfidf_chatbot = ChatbotLogic(intents_file, matcher="tfidf", responses_file=RESPONSES_FILE)
+
+        # Edit one intent and compare a full reload with an incremental one
+        with open(intents_file, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        data["intents"][0]["patterns"].append("freshly added pattern")
+        with open(intents_file, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+        start = time.perf_counter()
+        chatbot.reload_intents(incremental=True)
+        incremental_reload_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chatbot.reload_intents()
+        full_reload_time = time.perf_counter() - start
+
+        # Compiled model file: the index is read in place from the mapping
+        compiled_file = os.path.join(tmp_dir, "chatbot_model.bin")
+        chatbot.model.compile(compiled_file)
+        start = time.perf_counter()
+        compiled_model = ChatbotModel(intents_file, responses_file=RESPONSES_FILE, compiled_file=compiled_file)
+        compiled_load_time = time.perf_counter() - start
+        compiled_size = os.path.getsize(compiled_file)
+
+        rng = random.Random(7)
+        inputs = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 5))) for _ in range(messages)]
+        tokenized = [chatbot.model.preprocess_text(text) for text in inputs]
+
+        start = time.perf_counter()
+        compiled_matches = [compiled_model.find_best_match(tokens) for tokens in tokenized]
+        compiled_time = time.perf_counter() - start
+        # The mapping must be closed before the directory is removed on Windows
+        del compiled_model
+
+    start = time.perf_counter()
+    expected = [brute_force_match(chatbot.model, tokens) for tokens in tokenized]
+    brute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [chatbot.model.find_best_match(tokens) for tokens in tokenized]
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for tokens in tokenized:
+        tfidf_chatbot.model.find_best_match(tokens)
+    tfidf_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chatbot.get_responses(inputs, learn=False)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a[1] != b[1] or a[0] is not b[0])
+    # The compiled model answers like the one it was compiled from
+    mismatches += sum(1 for a, b in zip(actual, compiled_matches) if a[1] != b[1] or a[0] != b[0])
+
+    print(f"🐢 Brute force: {brute_time / messages * 1000:.1f} ms/message")
+    print(f"🚀 Indexed:     {index_time / messages * 1000:.1f} ms/message")
+    print(f"⚡ Speedup:     {brute_time / index_time:.1f}x")
+    print(f"📦 Batch API:   {batch_time / messages * 1000:.1f} ms/message")
+    print(f"📐 TF-IDF:      {tfidf_time / messages * 1000:.2f} ms/message")
+    print(f"🗺️ Compiled:    {compiled_time / messages * 1000:.1f} ms/message, "
+          f"loaded in {compiled_load_time * 1000:.1f} ms from {compiled_size / 1e6:.1f} MB")
+    print(f"🔄 Full reload:        {full_reload_time:.2f}s")
+    print(f"🔁 Incremental reload: {incremental_reload_time:.2f}s")
+    print(f"✅ Mismatches:  {mismatches}")
+
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_matching() else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the pre-forked server's memory and throughput.
+Serves a large synthetic intents file with one and with several workers,
+once with every worker inheriting the dict-based index and once with the
+model mapped from a compiled file before forking, drives each server with
+the load generator and reads every worker's memory from /proc (Linux only).
+"""
+
+import asyncio
+import os
+import random
+import signal
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmark_matching import RESPONSES_FILE, make_synthetic_intents
+from chatbot_model import ChatbotModel
+from chatbot_server import PreforkServer, listen_socket
+from load_test import get_stats, run_load
+
+WORKER_COUNTS = (1, 4)
+REQUESTS = 400
+CONNECTIONS = 16
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """
+    Rss, Pss and private dirty memory of a process in kB, from /proc/<pid>/smaps_rollup.
+    Private dirty pages are the ones the process wrote itself or copied from its parent;
+    clean pages of the mapped model file stay in the page cache for every worker.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "private_dirty": fields["Private_Dirty"]}
+
+
+def worker_pids(pid: int) -> List[int]:
+    """Child processes of pid, from /proc/<pid>/task/<pid>/children."""
+    with open(f"/proc/{pid}/task/{pid}/children") as file:
+        return [int(child) for child in file.read().split()]
+
+
+async def wait_for_server(port: int, timeout: float = 60.0):
+    """Poll /stats until the server answers."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await get_stats("127.0.0.1", port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def serve_and_measure(model: ChatbotModel, workers: int, map_model: bool, messages: List[str],
+                      session_dir: str) -> Dict[str, float]:
+    """
+    Pre-fork a server from model, load it with messages and measure its workers.
+
+    Returns:
+        Dict[str, float]: Throughput, mean worker Rss/Pss/private dirty memory and the Pss of the whole server in MB
+    """
+    sock = listen_socket("127.0.0.1", 0)
+    port = sock.getsockname()[1]
+    sock.close()
+
+    pid = os.fork()
+    if pid == 0:
+        # Server process: keep its startup line out of the report
+        try:
+            sys.stdout = open(os.devnull, 'w')
+            PreforkServer(model, workers, port=port, session_dir=session_dir, map_model=map_model).serve()
+        finally:
+            os._exit(0)
+
+    try:
+        asyncio.run(wait_for_server(port))
+        result = asyncio.run(run_load("127.0.0.1", port, CONNECTIONS, REQUESTS, messages=messages))
+        worker_memory = [memory_kb(worker) for worker in worker_pids(pid)]
+        parent_memory = memory_kb(pid)
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+    def mean_mb(field: str) -> float:
+        return sum(memory[field] for memory in worker_memory) / len(worker_memory) / 1024
+
+    return {
+        "throughput": result["throughput"],
+        "errors": result["errors"],
+        "rss": mean_mb("rss"),
+        "pss": mean_mb("pss"),
+        "private_dirty": mean_mb("private_dirty"),
+        "total_pss": (parent_memory["pss"] + sum(memory["pss"] for memory in worker_memory)) / 1024
+    }
+
+
+def benchmark_server():
+    """Compare worker memory and throughput of the dict-based and the mapped model."""
+    print("🤖 AI ChatBot Pre-fork Server Benchmark")
+    print("=" * 50)
+
+    if not os.path.exists("/proc/self/smaps_rollup") or not hasattr(os, "fork"):
+        print("⚠️ Needs os.fork() and /proc/<pid>/smaps_rollup (Linux), skipped")
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+        vocabulary = make_synthetic_intents(intents_file)
+        model = ChatbotModel(intents_file, responses_file=RESPONSES_FILE)
+        print(f"📁 {len(model.intent_index)} patterns, {os.cpu_count()} CPU cores, "
+              f"{REQUESTS} requests over {CONNECTIONS} connections per run")
+
+        rng = random.Random(7)
+        messages = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 5))) for _ in range(REQUESTS)]
+
+        errors = 0
+        for map_model, name in ((False, "Dict index"), (True, "Mapped model")):
+            for workers in WORKER_COUNTS:
+                result = serve_and_measure(model, workers, map_model, messages,
+                                           os.path.join(tmp_dir, f"sessions_{map_model}_{workers}"))
+                errors += result["errors"]
+                print(f"{'🗺️' if map_model else '📚'} {name}, {workers} worker{'s' if workers > 1 else ''}: "
+                      f"{result['throughput']:.1f} requests/s, per worker Rss {result['rss']:.0f} MB, "
+                      f"Pss {result['pss']:.0f} MB, private dirty {result['private_dirty']:.0f} MB; "
+                      f"server total Pss {result['total_pss']:.0f} MB")
+
+    if os.cpu_count() == 1:
+        print("⚠️ One CPU core: more workers cannot add throughput here")
+    print(f"✅ Errors: {errors}")
+    return errors == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_server() else 1)
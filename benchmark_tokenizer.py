@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the chatbot's tokenizers.
+Measures the import time of the model module with and without NLTK and the
+per-message preprocessing time of the regex and NLTK tokenizers, and checks
+that both produce the same tokens for the intent patterns.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from chatbot_model import ChatbotModel
+from chatbot_tokenizer import NltkTokenizer
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_MESSAGES = [
+    "Hello", "How are you?", "Tell me a joke", "I'm feeling sad today, can't stop thinking about it.",
+    "What can you do?", "Thank you so much!", "kaise ho dost", "नमस्ते! आप कैसे हैं?",
+    "I need some motivation 😊", "Bye, see you later"
+]
+
+
+def import_time(statement: str, runs: int = 5) -> float:
+    """Best wall time in seconds of running an import statement in a fresh interpreter."""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True,
+                                text=True, check=True).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def time_per_message(model: ChatbotModel, messages, repeat: int = 200) -> float:
+    """Average preprocess_text time in seconds per message."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            model.preprocess_text(message)
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+
+def benchmark_tokenizer():
+    """Compare the regex tokenizer with NLTK's word_tokenize."""
+    print("🤖 AI ChatBot Tokenizer Benchmark")
+    print("=" * 50)
+
+    intents_file = os.path.join(PROJECT_DIR, "intents.json")
+    responses_file = os.path.join(PROJECT_DIR, "responses.json")
+
+    print(f"📦 import chatbot_model:     {import_time('import chatbot_model') * 1000:.0f} ms")
+    print(f"📦 import nltk word_tokenize: {import_time('from nltk.tokenize import word_tokenize') * 1000:.0f} ms")
+
+    model = ChatbotModel(intents_file, responses_file=responses_file)
+    print("📦 NLTK imported by the regex model:", "yes" if "nltk" in sys.modules else "no")
+    regex_time = time_per_message(model, SAMPLE_MESSAGES)
+    print(f"🚀 Regex tokenizer: {regex_time * 1e6:.1f} µs/message")
+
+    try:
+        NltkTokenizer().tokenize("hello")
+    except LookupError:
+        print("⚠️ NLTK punkt data not installed (run setup_nltk.py), skipping the NLTK comparison")
+        return True
+
+    nltk_model = ChatbotModel(intents_file, responses_file=responses_file, tokenizer="nltk")
+    nltk_time = time_per_message(nltk_model, SAMPLE_MESSAGES)
+    print(f"🐢 NLTK tokenizer:  {nltk_time * 1e6:.1f} µs/message")
+    print(f"⚡ Speedup:         {nltk_time / regex_time:.1f}x")
+
+    with open(intents_file, 'r', encoding='utf-8') as file:
+        texts = [pattern for intent in json.load(file).get('intents', []) for pattern in intent.get('patterns', [])]
+    texts.extend(SAMPLE_MESSAGES)
+    mismatches = [text for text in texts if model.preprocess_text(text) != nltk_model.preprocess_text(text)]
+    for text in mismatches:
+        print(f"   {text!r}: {model.preprocess_text(text)} != {nltk_model.preprocess_text(text)}")
+    print(f"✅ Mismatches:      {len(mismatches)} of {len(texts)}")
+
+    return not mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_tokenizer() else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the desktop app's chat transcript.
+Runs the window on Qt's offscreen platform (no display needed) and measures
+window creation, the cost of appending messages and of repainting the
+transcript while scrolling.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from chatbot_logic import ChatbotLogic
+from chatbot_storage import JournalLearningStore
+from chatbot_ui import AI_ChatBot
+
+WORDS = "hello kaise ho dost tell me a joke I am feeling sad today thank you so much".split()
+
+
+def make_message(i: int) -> str:
+    """Message of varying length, so bubbles wrap differently."""
+    return ' '.join(WORDS[(i + j) % len(WORDS)] for j in range(3 + i % 40))
+
+
+def benchmark_ui(messages: int = 2000, scrolls: int = 200):
+    """Append messages to the transcript and scroll through it."""
+    print("🤖 AI ChatBot UI Benchmark")
+    print("=" * 50)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chatbot = ChatbotLogic(learning_store=JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json")))
+
+        start = time.perf_counter()
+        window = AI_ChatBot(min_response_delay=0, chatbot=chatbot)
+        window.resize(900, 700)
+        window.show()
+        app.processEvents()
+        print(f"🪟 Window created in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        chat_area = window.chat_area
+        timings = []
+        for i in range(messages):
+            start = time.perf_counter()
+            if i % 2:
+                chat_area.add_message(make_message(i), reply_to=make_message(i - 1))
+            else:
+                chat_area.add_message(make_message(i), is_user=True)
+            app.processEvents()
+            timings.append(time.perf_counter() - start)
+
+        first = timings[:200]
+        last = timings[-200:]
+        print(f"📨 Append: {sum(first) / len(first) * 1000:.2f} ms/message for the first 200, "
+              f"{sum(last) / len(last) * 1000:.2f} ms/message at {messages}")
+
+        # Repaint while scrolling back and forth within the laid out window
+        scroll_bar = chat_area.verticalScrollBar()
+        bottom = scroll_bar.maximum()
+        start = time.perf_counter()
+        for i in range(scrolls):
+            scroll_bar.setValue(bottom - (i % 20) * 40)
+            chat_area.viewport().repaint()
+        print(f"🖌️ Scroll repaint: {(time.perf_counter() - start) / scrolls * 1000:.2f} ms/frame")
+
+        window.close()
+
+
+if __name__ == "__main__":
+    benchmark_ui()
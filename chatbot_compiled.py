@@ -0,0 +1,632 @@
+import json
+import math
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence, Set, Tuple
+from chatbot_index import TOKEN_GROUPS, IntentIndex, TfidfIntentIndex, intent_hash, intent_keys
+from chatbot_phrases import PhraseMatcher, ResponseTables
+
+# Compiled model file layout: magic, format version, SHA-256 content hash and
+# section count, then one (name, type code, offset, byte length) entry per
+# section, then the sections themselves, each 8-byte aligned. Sections are
+# little-endian uint32 ("I") or float64 ("d") arrays, or UTF-8 bytes ("B").
+COMPILED_MAGIC = b"CHATBOT\0"
+COMPILED_VERSION = 2
+COMPILED_HEADER = struct.Struct("<8sI32sI")
+COMPILED_SECTION = struct.Struct("<32s4sQQ")
+SECTION_ALIGNMENT = 8
+# Marks a missing value in uint32 arrays
+NONE = 0xFFFFFFFF
+
+
+class CompiledFileWriter:
+    """
+    Collects flat arrays and writes them as a compiled model file.
+    Strings are stored as one UTF-8 blob plus an offset array, string keyed
+    tables as an open addressing hash table over them (see FlatStringMap).
+    """
+
+    def __init__(self):
+        self.sections: Dict[str, Tuple[str, bytes]] = {}
+
+    def add_array(self, name: str, typecode: str, values: Iterable):
+        """Add a uint32 ("I") or float64 ("d") array section."""
+        self.sections[name] = (typecode, array(typecode, values).tobytes())
+
+    def add_bytes(self, name: str, data: bytes):
+        """Add a raw bytes section."""
+        self.sections[name] = ("B", data)
+
+    def add_strings(self, name: str, strings: Iterable[str]):
+        """Add a list of strings as name.blob and name.offsets."""
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        self.add_bytes(f"{name}.blob", b"".join(encoded))
+        self.add_array(f"{name}.offsets", "I", offsets)
+
+    def add_string_map(self, name: str, table: Dict[str, Sequence[int]]):
+        """
+        Add a table from strings to lists of uint32, keys in the table's order.
+        The hash table has at least twice as many slots as keys, each slot
+        holding a key id plus one (0 for an empty slot).
+        """
+        keys = list(table)
+        self.add_strings(f"{name}.keys", keys)
+
+        slots = [0] * max(2, 1 << (2 * len(keys) - 1).bit_length())
+        mask = len(slots) - 1
+        for key_id, key in enumerate(keys):
+            slot = zlib.crc32(key.encode('utf-8')) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = key_id + 1
+        self.add_array(f"{name}.slots", "I", slots)
+
+        offsets = [0]
+        for values in table.values():
+            offsets.append(offsets[-1] + len(values))
+        self.add_array(f"{name}.value_offsets", "I", offsets)
+        self.add_array(f"{name}.values", "I", (value for values in table.values() for value in values))
+
+    def write(self, path: str, content_hash: bytes):
+        """
+        Write the header, section table and sections to path.
+
+        Args:
+            path (str): File to write
+            content_hash (bytes): SHA-256 of the source files
+        """
+        names = list(self.sections)
+        if any(len(name) > 32 for name in names):
+            raise ValueError("section names are at most 32 characters")
+        offset = COMPILED_HEADER.size + COMPILED_SECTION.size * len(names)
+        entries = []
+        for name in names:
+            offset += -offset % SECTION_ALIGNMENT
+            typecode, data = self.sections[name]
+            entries.append(COMPILED_SECTION.pack(name.encode('ascii'), typecode.encode('ascii'), offset, len(data)))
+            offset += len(data)
+
+        with open(path, 'wb') as file:
+            file.write(COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, content_hash, len(names)))
+            file.write(b"".join(entries))
+            for name in names:
+                file.write(b"\0" * (-file.tell() % SECTION_ALIGNMENT))
+                file.write(self.sections[name][1])
+
+
+class CompiledFile:
+    """
+    A compiled model file mapped into memory.
+    Sections are memoryviews over the mapping, so nothing is copied or
+    parsed until it is read, and processes mapping the same file share
+    its pages through the page cache. Loading runs no code from the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a compiled model file and read its section table.
+
+        Args:
+            path (str): Compiled model file
+
+        Raises:
+            ValueError: If the file is not a compatible compiled model or is damaged
+        """
+        if sys.byteorder != "little":
+            raise ValueError("compiled model files are little-endian")
+
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < COMPILED_HEADER.size:
+            raise ValueError("file too short")
+        magic, self.version, self.content_hash, count = COMPILED_HEADER.unpack_from(view)
+        if magic != COMPILED_MAGIC or self.version != COMPILED_VERSION:
+            raise ValueError("not a compatible compiled model")
+        if COMPILED_HEADER.size + COMPILED_SECTION.size * count > len(view):
+            raise ValueError("section table truncated")
+
+        self.sections: Dict[str, memoryview] = {}
+        for index in range(count):
+            name, typecode, offset, size = COMPILED_SECTION.unpack_from(
+                view, COMPILED_HEADER.size + COMPILED_SECTION.size * index)
+            typecode = typecode.rstrip(b"\0").decode('ascii')
+            if offset + size > len(view) or offset % SECTION_ALIGNMENT or typecode not in ("B", "I", "d"):
+                raise ValueError("section out of bounds")
+            self.sections[name.rstrip(b"\0").decode('ascii')] = view[offset:offset + size].cast(typecode)
+
+    def __getitem__(self, name: str) -> memoryview:
+        try:
+            return self.sections[name]
+        except KeyError:
+            raise ValueError(f"missing section {name}") from None
+
+    def strings(self, name: str) -> List[str]:
+        """Decode a list of strings written with CompiledFileWriter.add_strings."""
+        blob, offsets = self[f"{name}.blob"], self[f"{name}.offsets"]
+        _check_offsets(offsets, len(blob))
+        return [str(blob[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(len(offsets) - 1)]
+
+
+def _check_offsets(offsets: memoryview, end: int):
+    """Reject an offset array that does not cover exactly end items."""
+    if not len(offsets) or offsets[0] != 0 or offsets[-1] != end:
+        raise ValueError("inconsistent section offsets")
+
+
+class FlatStringMap:
+    """
+    Read-only table from strings to uint32 lists, looked up in place in a
+    compiled model file. Keys are numbered in file order.
+    """
+
+    def __init__(self, compiled: CompiledFile, name: str):
+        """
+        Attach to the sections written by CompiledFileWriter.add_string_map.
+
+        Args:
+            compiled (CompiledFile): Mapped compiled model file
+            name (str): Table name
+        """
+        self.keys = compiled[f"{name}.keys.blob"]
+        self.key_offsets = compiled[f"{name}.keys.offsets"]
+        self.slots = compiled[f"{name}.slots"]
+        self.value_offsets = compiled[f"{name}.value_offsets"]
+        self.values = compiled[f"{name}.values"]
+        _check_offsets(self.key_offsets, len(self.keys))
+        _check_offsets(self.value_offsets, len(self.values))
+        if len(self.value_offsets) != len(self.key_offsets) or len(self.slots) & (len(self.slots) - 1):
+            raise ValueError(f"inconsistent table {name}")
+        self._mask = len(self.slots) - 1
+
+    def __len__(self) -> int:
+        return len(self.key_offsets) - 1
+
+    def find(self, key: str) -> int:
+        """Id of a key, -1 if it is not in the table."""
+        data = key.encode('utf-8')
+        slots, keys, key_offsets = self.slots, self.keys, self.key_offsets
+        slot = zlib.crc32(data) & self._mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                return -1
+            start = key_offsets[entry - 1]
+            end = key_offsets[entry]
+            if end - start == len(data) and keys[start:end] == data:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def key(self, key_id: int) -> str:
+        """The key with the given id."""
+        return str(self.keys[self.key_offsets[key_id]:self.key_offsets[key_id + 1]], 'utf-8')
+
+    def values_of(self, key_id: int) -> memoryview:
+        """Values stored under a key id."""
+        return self.values[self.value_offsets[key_id]:self.value_offsets[key_id + 1]]
+
+    def get(self, key: str) -> Sequence[int]:
+        """Values stored under a key, empty if it is not in the table."""
+        key_id = self.find(key)
+        return self.values_of(key_id) if key_id >= 0 else ()
+
+
+def _length_char_key(length: int, char: str) -> str:
+    """Key of the (token length, character) table."""
+    return f"{length}\0{char}"
+
+
+def write_intent_index(writer: CompiledFileWriter, index: IntentIndex):
+    """
+    Flatten an intent index. Patterns are numbered in intents.json order,
+    so a pattern's number is also its rank on equal scores.
+
+    Args:
+        writer (CompiledFileWriter): File being written
+        index (IntentIndex): Compiled index (overlap or TF-IDF)
+    """
+    patterns = index.ordered_patterns()
+    number = {id(pattern): position for position, pattern in enumerate(patterns)}
+    rank = {pattern_id: number[id(pattern)] for pattern_id, pattern in index.patterns.items()}
+    intent_number = {key: position for position, key in enumerate(intent_keys(index.intents))}
+
+    writer.add_array("patterns.sizes", "I", (len(pattern.token_set) for pattern in patterns))
+    writer.add_array("patterns.intents", "I", (intent_number[pattern.intent_key] for pattern in patterns))
+
+    # Postings by pattern number, token ids are the order of this table
+    columns = {token: sorted(zip((rank[pattern_id] for pattern_id in pattern_ids), range(len(pattern_ids))))
+               for token, pattern_ids in index.postings.items()}
+    writer.add_string_map("postings", {token: [number for number, _ in column] for token, column in columns.items()})
+    token_ids = {token: token_id for token_id, token in enumerate(columns)}
+
+    vocabulary = index.vocabulary
+    writer.add_string_map("groups", {str(group_id): sorted(token_ids[token] for token in tokens)
+                                     for group_id, tokens in vocabulary.group_tokens.items()})
+    writer.add_string_map("trigrams", {trigram: sorted(token_ids[token] for token in tokens)
+                                       for trigram, tokens in vocabulary.trigrams.items()})
+    writer.add_string_map("length_chars", {_length_char_key(length, char): sorted(token_ids[token] for token in tokens)
+                                           for (length, char), tokens in vocabulary.length_chars.items()})
+
+    if isinstance(index, TfidfIntentIndex):
+        writer.add_array("tfidf.idf", "d", (index.idf[token] for token in columns))
+        writer.add_array("tfidf.unseen_idf", "d", [index.unseen_idf])
+        writer.add_array("tfidf.weights", "d", (index.columns[token][1][position]
+                                                for token, column in columns.items() for _, position in column))
+
+
+class FlatIntentIndex:
+    """
+    Read-only intent index over the flat tables of a compiled model file.
+    Finds the same candidates and scores as IntentIndex, but looks tokens up
+    in the file's hash tables instead of Python dicts and sets, so the index
+    takes no memory of its own and is shared by every process mapping the file.
+    """
+
+    # Index class compiled by updated()
+    rebuild_class = IntentIndex
+
+    def __init__(self, compiled: CompiledFile, intents: List[Dict[str, Any]],
+                 preprocess: Callable[[str], List[str]], similar: Callable[[str, str], bool]):
+        """
+        Attach to the index tables of a compiled model file.
+
+        Args:
+            compiled (CompiledFile): Mapped compiled model file
+            intents (List[Dict[str, Any]]): Intents the index was compiled from
+            preprocess (Callable[[str], List[str]]): Tokenizer used for user input too
+            similar (Callable[[str, str], bool]): Token similarity check (user token, pattern token)
+        """
+        self.intents = intents
+        self.preprocess = preprocess
+        self.similar = similar
+        self.pattern_sizes = compiled["patterns.sizes"]
+        self.pattern_intents = compiled["patterns.intents"]
+        self.postings = FlatStringMap(compiled, "postings")
+        self.group_tokens = FlatStringMap(compiled, "groups")
+        self.trigrams = FlatStringMap(compiled, "trigrams")
+        self.length_chars = FlatStringMap(compiled, "length_chars")
+        self.changes = {"added": len(intents), "changed": 0, "removed": 0}
+        if len(self.pattern_intents) != len(self.pattern_sizes) or (
+                len(self.pattern_intents) and max(self.pattern_intents) >= len(intents)):
+            raise ValueError("patterns do not match the intents")
+
+    def __len__(self) -> int:
+        return len(self.pattern_sizes)
+
+    def updated(self, intents: List[Dict[str, Any]]) -> IntentIndex:
+        """
+        Compile a regular index for a new version of the intents (the flat
+        tables cannot change), with the change counts in .changes.
+
+        Args:
+            intents (List[Dict[str, Any]]): New intent dictionaries
+
+        Returns:
+            IntentIndex: Index compiled from the new intents
+        """
+        index = self.rebuild_class(intents, self.preprocess, self.similar)
+        old_hashes = {key: intent_hash(intent) for key, intent in zip(intent_keys(self.intents), self.intents)}
+        changed = sum(1 for key, digest in index.intent_hashes.items() if old_hashes.get(key, digest) != digest)
+        index.changes = {"added": len(set(index.intent_hashes) - set(old_hashes)), "changed": changed,
+                         "removed": len(set(old_hashes) - set(index.intent_hashes))}
+        return index
+
+    def similar_token_ids(self, user_token: str) -> Set[int]:
+        """
+        Find the vocabulary tokens similar to the user token, like
+        VocabularyIndex.similar_tokens.
+
+        Args:
+            user_token (str): Preprocessed user input token
+
+        Returns:
+            Set[int]: Ids of the similar tokens in the postings table
+        """
+        postings = self.postings
+        token_id = postings.find(user_token)
+        found = {token_id} if token_id >= 0 else set()
+
+        for group_id in TOKEN_GROUPS.get(user_token, ()):
+            found.update(self.group_tokens.get(str(group_id)))
+
+        length = len(user_token)
+        if length <= 2:
+            return found
+
+        # Vocabulary tokens contained in the user token
+        for size in range(3, length + 1):
+            for i in range(length - size + 1):
+                token_id = postings.find(user_token[i:i + size])
+                if token_id >= 0:
+                    found.add(token_id)
+
+        # Vocabulary tokens containing the user token share all of its trigrams
+        trigram_lists = sorted((self.trigrams.get(user_token[i:i + 3]) for i in range(length - 2)), key=len)
+        containing = set(trigram_lists[0]).intersection(*trigram_lists[1:])
+        found.update(token_id for token_id in containing if user_token in postings.key(token_id))
+
+        # Character overlap, confirmed with the similarity check
+        char_counts = Counter(user_token)
+        for other_length in range(max(3, length - 2), length + 3):
+            common: Dict[int, int] = {}
+            for char, count in char_counts.items():
+                for token_id in self.length_chars.get(_length_char_key(other_length, char)):
+                    common[token_id] = common.get(token_id, 0) + count
+            threshold = min(length, other_length) * 0.6
+            found.update(token_id for token_id, shared in common.items()
+                         if shared >= threshold and token_id not in found
+                         and self.similar(user_token, postings.key(token_id)))
+
+        return found
+
+    def _candidate_patterns(self, user_token: str) -> Set[int]:
+        """Numbers of the patterns containing a token similar to the user token."""
+        candidates = set()
+        for token_id in self.similar_token_ids(user_token):
+            candidates.update(self.postings.values_of(token_id))
+        return candidates
+
+    def best_match(self, user_tokens: List[str]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the best matching intent for the user tokens (see IntentIndex.best_match).
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], float]: Best matching intent and its score
+        """
+        return self._best_match(user_tokens, {})
+
+    def best_matches(self, token_lists: List[List[str]]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Find the best matching intent for several messages, looking up the
+        candidate patterns of a token once for the whole batch.
+
+        Args:
+            token_lists (List[List[str]]): Preprocessed tokens of each message
+
+        Returns:
+            List[Tuple[Optional[Dict[str, Any]], float]]: Best match per message, in order
+        """
+        candidates_cache: Dict[str, Set[int]] = {}
+        return [self._best_match(user_tokens, candidates_cache) for user_tokens in token_lists]
+
+    def _best_match(self, user_tokens: List[str],
+                    candidates_cache: Dict[str, Set[int]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Score the candidate patterns of the user tokens, reusing cached candidates."""
+        if not user_tokens:
+            return None, 0.0
+
+        matched: Dict[int, int] = {}
+        shared: Dict[int, int] = {}
+        for user_token, count in Counter(user_tokens).items():
+            candidates = candidates_cache.get(user_token)
+            if candidates is None:
+                candidates = candidates_cache[user_token] = self._candidate_patterns(user_token)
+            for number in candidates:
+                matched[number] = matched.get(number, 0) + count
+            for number in self.postings.get(user_token):
+                shared[number] = shared.get(number, 0) + 1
+
+        # Pattern numbers are file order, the lowest wins on equal scores
+        best_number = None
+        best_score = 0.0
+        user_unique = len(set(user_tokens))
+        sizes = self.pattern_sizes
+        for number, matches in matched.items():
+            score = matches / (user_unique + sizes[number] - shared.get(number, 0))
+            if score > best_score or (score == best_score and best_number is not None and number < best_number):
+                best_score = score
+                best_number = number
+
+        if best_number is None:
+            return None, 0.0
+        return self.intents[self.pattern_intents[best_number]], best_score
+
+
+class FlatTfidfIntentIndex(FlatIntentIndex):
+    """
+    TF-IDF matcher over the flat tables: the postings are the columns of the
+    pattern x term matrix and tfidf.weights holds their normalized weights.
+    """
+
+    rebuild_class = TfidfIntentIndex
+
+    def __init__(self, compiled: CompiledFile, intents: List[Dict[str, Any]],
+                 preprocess: Callable[[str], List[str]], similar: Callable[[str, str], bool]):
+        super().__init__(compiled, intents, preprocess, similar)
+        self.idf = compiled["tfidf.idf"]
+        self.unseen_idf = compiled["tfidf.unseen_idf"][0]
+        self.weights = compiled["tfidf.weights"]
+        if len(self.idf) != len(self.postings) or len(self.weights) != len(self.postings.values):
+            raise ValueError("inconsistent TF-IDF tables")
+
+    def best_match(self, user_tokens: List[str]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the pattern with the highest TF-IDF cosine similarity (see TfidfIntentIndex.best_match).
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], float]: Best matching intent and its score
+        """
+        postings = self.postings
+        query = []
+        for token, count in Counter(user_tokens).items():
+            token_id = postings.find(token)
+            query.append((token_id, count * (self.idf[token_id] if token_id >= 0 else self.unseen_idf)))
+        query_norm = math.sqrt(sum(weight * weight for _, weight in query))
+        if not query_norm:
+            return None, 0.0
+
+        scores: Dict[int, float] = {}
+        offsets = postings.value_offsets
+        for token_id, weight in query:
+            if token_id < 0:
+                continue
+            weight /= query_norm
+            start, end = offsets[token_id], offsets[token_id + 1]
+            for number, pattern_weight in zip(postings.values[start:end], self.weights[start:end]):
+                scores[number] = scores.get(number, 0.0) + weight * pattern_weight
+
+        if not scores:
+            return None, 0.0
+
+        best_number = min(scores, key=lambda number: (-scores[number], number))
+        return self.intents[self.pattern_intents[best_number]], min(scores[best_number], 1.0)
+
+    def best_matches(self, token_lists: List[List[str]]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """Score several messages, one sparse matrix-vector product each."""
+        return [self.best_match(user_tokens) for user_tokens in token_lists]
+
+
+# Flat index class of each matcher
+FLAT_MATCHERS = {
+    "overlap": FlatIntentIndex,
+    "tfidf": FlatTfidfIntentIndex
+}
+
+
+def write_phrase_matcher(writer: CompiledFileWriter, matcher: PhraseMatcher):
+    """
+    Flatten an Aho-Corasick automaton: per state, its transitions sorted by
+    character code, its fail link and its output priority (NONE if none).
+    """
+    offsets = [0]
+    chars: List[int] = []
+    targets: List[int] = []
+    for transitions in matcher.goto:
+        for char, target in sorted(transitions.items()):
+            chars.append(ord(char))
+            targets.append(target)
+        offsets.append(len(chars))
+    writer.add_array("phrases.goto_offsets", "I", offsets)
+    writer.add_array("phrases.goto_chars", "I", chars)
+    writer.add_array("phrases.goto_targets", "I", targets)
+    writer.add_array("phrases.fail", "I", matcher.fail)
+    writer.add_array("phrases.output", "I", (NONE if priority is None else priority for priority in matcher.output))
+    writer.add_strings("phrases.values", matcher.values)
+
+
+class FlatPhraseMatcher:
+    """
+    PhraseMatcher automaton read in place from a compiled model file.
+    Transitions are found by binary search in the state's sorted characters.
+    """
+
+    def __init__(self, compiled: CompiledFile):
+        """
+        Attach to the automaton written by write_phrase_matcher.
+
+        Args:
+            compiled (CompiledFile): Mapped compiled model file
+        """
+        self.goto_offsets = compiled["phrases.goto_offsets"]
+        self.goto_chars = compiled["phrases.goto_chars"]
+        self.goto_targets = compiled["phrases.goto_targets"]
+        self.fail = compiled["phrases.fail"]
+        self.output = compiled["phrases.output"]
+        self.values = compiled.strings("phrases.values")
+        states = len(self.fail)
+        _check_offsets(self.goto_offsets, len(self.goto_chars))
+        if (len(self.goto_offsets) != states + 1 or len(self.output) != states
+                or len(self.goto_targets) != len(self.goto_chars)):
+            raise ValueError("inconsistent phrase automaton")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _goto(self, state: int, code: int) -> int:
+        """Next state on a character code, -1 if the state has no such transition."""
+        start, end = self.goto_offsets[state], self.goto_offsets[state + 1]
+        position = bisect_left(self.goto_chars, code, start, end)
+        if position < end and self.goto_chars[position] == code:
+            return self.goto_targets[position]
+        return -1
+
+    def find(self, text: str) -> Optional[Any]:
+        """
+        Find the value of the highest priority phrase contained in the text
+        (see PhraseMatcher.find).
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            Optional[Any]: Value of the matched phrase, or None if no phrase occurs
+        """
+        best = None
+        state = 0
+        for char in text:
+            code = ord(char)
+            next_state = self._goto(state, code)
+            while next_state < 0 and state:
+                state = self.fail[state]
+                next_state = self._goto(state, code)
+            state = max(next_state, 0)
+
+            priority = self.output[state]
+            if priority != NONE and (best is None or priority < best):
+                best = priority
+                if best == 0:
+                    break
+
+        return self.values[best] if best is not None else None
+
+
+def write_model(path: str, content_hash: bytes, intents: List[Dict[str, Any]], index: IntentIndex,
+                response_tables: ResponseTables, stop_words: Iterable[str]):
+    """
+    Write everything a ChatbotModel compiles to a compiled model file.
+
+    Args:
+        path (str): File to write
+        content_hash (bytes): SHA-256 of the source files
+        intents (List[Dict[str, Any]]): Intents, stored as JSON
+        index (IntentIndex): Compiled pattern index
+        response_tables (ResponseTables): Hinglish phrases and canned responses
+        stop_words (Iterable[str]): Stop words of the tokenizer
+    """
+    writer = CompiledFileWriter()
+    writer.add_bytes("intents.json", json.dumps(intents, ensure_ascii=False).encode('utf-8'))
+    writer.add_strings("stop_words", sorted(stop_words))
+    write_intent_index(writer, index)
+    write_phrase_matcher(writer, response_tables.hinglish_matcher)
+    for name in ("fallback_responses", "welcome_messages", "motivational_responses"):
+        writer.add_strings(name, getattr(response_tables, name))
+    writer.write(path, content_hash)
+
+
+def load_model(compiled: CompiledFile, matcher: str, preprocess: Callable[[str], List[str]],
+               similar: Callable[[str, str], bool]) -> Tuple[List[Dict[str, Any]], FlatIntentIndex,
+                                                              ResponseTables, Set[str]]:
+    """
+    Attach to the model in a mapped compiled model file. Only the intents,
+    stop words and response lists are decoded, the index and the phrase
+    automaton are read in place.
+
+    Args:
+        compiled (CompiledFile): Mapped compiled model file
+        matcher (str): Matching engine the file was compiled for
+        preprocess (Callable[[str], List[str]]): Tokenizer used for user input
+        similar (Callable[[str, str], bool]): Token similarity check
+
+    Returns:
+        Tuple: Intents, pattern index, response tables and stop words
+    """
+    intents = json.loads(str(compiled["intents.json"], 'utf-8'))
+    index = FLAT_MATCHERS[matcher](compiled, intents, preprocess, similar)
+    response_tables = ResponseTables(FlatPhraseMatcher(compiled),
+                                     *(tuple(compiled.strings(name)) for name in
+                                       ("fallback_responses", "welcome_messages", "motivational_responses")))
+    return intents, index, response_tables, set(compiled.strings("stop_words"))
@@ -0,0 +1,114 @@
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+
+class ConversationRecord:
+    """
+    One conversation turn.
+    Uses __slots__ instead of a per-turn dict, which keeps long histories small.
+    """
+
+    __slots__ = ("timestamp", "user_input", "bot_response", "feedback")
+
+    def __init__(self, timestamp: str, user_input: str, bot_response: Optional[str] = None,
+                 feedback: Optional[str] = None):
+        self.timestamp = timestamp
+        self.user_input = user_input
+        self.bot_response = bot_response
+        self.feedback = feedback
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "ConversationRecord":
+        """Build a record from a chatbot_learning.json conversation entry."""
+        return cls(entry.get("timestamp", ""), entry.get("user_input", ""),
+                   entry.get("bot_response"), entry.get("feedback"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the chatbot_learning.json conversation entry format."""
+        return {
+            "timestamp": self.timestamp,
+            "user_input": self.user_input,
+            "bot_response": self.bot_response,
+            "feedback": self.feedback
+        }
+
+    def __repr__(self) -> str:
+        return f"ConversationRecord({self.timestamp!r}, {self.user_input!r})"
+
+
+class ConversationHistory:
+    """
+    Fixed-capacity ring buffer of conversation records.
+    Appending to a full buffer overwrites the oldest record, so memory use
+    stays constant however long the chatbot runs. `total` still counts
+    every conversation ever appended, for the statistics.
+    """
+
+    def __init__(self, capacity: int = 100, entries: Iterable[Dict[str, Any]] = ()):
+        """
+        Create the buffer.
+
+        Args:
+            capacity (int): Maximum number of records kept
+            entries (Iterable[Dict[str, Any]]): Conversation entries to start with, oldest first
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+
+        self.capacity = capacity
+        self.total = 0
+        self._records: List[Optional[ConversationRecord]] = [None] * capacity
+        # Index the next record is written to
+        self._head = 0
+        self._size = 0
+
+        for entry in entries:
+            self.append(ConversationRecord.from_dict(entry))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[ConversationRecord]:
+        """Iterate from the oldest record to the newest."""
+        start = self._head - self._size
+        for i in range(start, self._head):
+            yield self._records[i % self.capacity]
+
+    def append(self, record: ConversationRecord):
+        """Add a record, overwriting the oldest one if the buffer is full."""
+        self._records[self._head] = record
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def recent(self, count: int) -> List[ConversationRecord]:
+        """
+        Get the newest records.
+
+        Args:
+            count (int): Maximum number of records
+
+        Returns:
+            List[ConversationRecord]: Records, oldest first
+        """
+        records = list(self)
+        return records[-count:] if count > 0 else []
+
+    def to_dicts(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Convert the newest records to chatbot_learning.json entries.
+
+        Args:
+            count (Optional[int]): Maximum number of entries, all records if None
+
+        Returns:
+            List[Dict[str, Any]]: Conversation entries, oldest first
+        """
+        records = list(self) if count is None else self.recent(count)
+        return [record.to_dict() for record in records]
+
+    def clear(self):
+        """Remove all records and reset the total."""
+        self._records = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+        self.total = 0
@@ -0,0 +1,536 @@
+import copy
+import hashlib
+import json
+import math
+from collections import Counter
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple, FrozenSet, Set
+
+# Common Hinglish variations, tokens in the same group are treated as similar
+VARIATION_GROUPS = {
+    'hello': ['hi', 'hey', 'namaste', 'kaise ho', 'kya haal'],
+    'hi': ['hello', 'hey', 'namaste', 'kaise ho', 'kya haal'],
+    'hey': ['hello', 'hi', 'namaste', 'kaise ho', 'kya haal'],
+    'joke': ['joke', 'funny', 'hasao', 'mazak', 'comedy'],
+    'funny': ['joke', 'funny', 'hasao', 'mazak', 'comedy'],
+    'sad': ['sad', 'depressed', 'udaas', 'dukhi', 'unhappy'],
+    'happy': ['happy', 'khush', 'mast', 'excited', 'joyful'],
+    'help': ['help', 'madad', 'sahayata', 'assist', 'support'],
+    'thanks': ['thanks', 'thank you', 'shukriya', 'dhanyawad', 'gratitude'],
+    'bye': ['bye', 'goodbye', 'alvida', 'phir milenge', 'see you']
+}
+
+# Token -> ids of the variation groups it belongs to
+TOKEN_GROUPS: Dict[str, FrozenSet[int]] = {}
+for _group_id, _words in enumerate(VARIATION_GROUPS.values()):
+    for _word in _words:
+        TOKEN_GROUPS[_word] = TOKEN_GROUPS.get(_word, frozenset()) | {_group_id}
+
+
+def tokens_similar(token1: str, token2: str) -> bool:
+    """
+    Check if two tokens are similar (for Hinglish variations).
+
+    Args:
+        token1 (str): First token (user input)
+        token2 (str): Second token (pattern)
+
+    Returns:
+        bool: True if tokens are similar
+    """
+    # Exact match
+    if token1 == token2:
+        return True
+
+    # Check if tokens are in the same variation group
+    groups1 = TOKEN_GROUPS.get(token1)
+    if groups1 and not groups1.isdisjoint(TOKEN_GROUPS.get(token2, ())):
+        return True
+
+    # Check for partial string matching (for Hinglish variations)
+    if len(token1) > 2 and len(token2) > 2:
+        # Check if one token contains the other
+        if token1 in token2 or token2 in token1:
+            return True
+
+        # Check for similar length and character overlap
+        if abs(len(token1) - len(token2)) <= 2:
+            chars2 = set(token2)
+            common_chars = sum(1 for c in token1 if c in chars2)
+            if common_chars >= min(len(token1), len(token2)) * 0.6:
+                return True
+
+    return False
+
+
+def intent_keys(intents: List[Dict[str, Any]]) -> List[str]:
+    """
+    Stable keys identifying each intent across reloads.
+    The tag is used as is, repeated tags get a "#2", "#3", ... suffix.
+
+    Args:
+        intents (List[Dict[str, Any]]): Intent dictionaries from intents.json
+
+    Returns:
+        List[str]: One key per intent, in order
+    """
+    seen: Dict[str, int] = {}
+    keys = []
+    for intent in intents:
+        tag = str(intent.get('tag', ''))
+        seen[tag] = seen.get(tag, 0) + 1
+        keys.append(tag if seen[tag] == 1 else f"{tag}#{seen[tag]}")
+    return keys
+
+
+def intent_hash(intent: Dict[str, Any]) -> str:
+    """Content hash of an intent, used to detect changed intents on reload."""
+    content = json.dumps(intent, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class CompiledPattern:
+    """
+    A single intent pattern, preprocessed once when the intents are loaded.
+    """
+
+    __slots__ = ("text", "intent", "intent_key", "position", "tokens", "token_set", "length")
+
+    def __init__(self, text: str, intent: Dict[str, Any], tokens: List[str], intent_key: str = "",
+                 position: int = 0):
+        self.text = text
+        self.intent = intent
+        self.intent_key = intent_key
+        # Position of the pattern within its intent, for file order on ties
+        self.position = position
+        self.tokens: Tuple[str, ...] = tuple(tokens)
+        # Unique tokens, used for membership checks and the union size
+        self.token_set: FrozenSet[str] = frozenset(self.tokens)
+        self.length = len(self.tokens)
+
+
+class VocabularyIndex:
+    """
+    Index over the pattern vocabulary for finding tokens similar to a user token.
+    Matches come from the variation groups, substrings of the user token and
+    a trigram index (tokens containing the user token). Character overlap
+    candidates come from length buckets keyed by character and are confirmed
+    with the similarity check, so results are exactly the tokens it accepts.
+    """
+
+    def __init__(self, tokens: Iterable[str], similar: Callable[[str, str], bool]):
+        """
+        Build the lookup tables for the vocabulary.
+
+        Args:
+            tokens (Iterable[str]): Distinct pattern tokens
+            similar (Callable[[str, str], bool]): Token similarity check (user token, pattern token)
+        """
+        self.similar = similar
+        self.tokens: Set[str] = set()
+        self.group_tokens: Dict[int, Set[str]] = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+        self.length_chars: Dict[Tuple[int, str], Set[str]] = {}
+
+        for token in tokens:
+            self.tokens.add(token)
+            for table, key in self._table_keys(token):
+                table.setdefault(key, set()).add(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _table_keys(self, token: str) -> List[Tuple[Dict[Any, Set[str]], Any]]:
+        """Every (lookup table, key) the token is listed under."""
+        entries = [(self.group_tokens, group_id) for group_id in TOKEN_GROUPS.get(token, ())]
+
+        # Substring and character overlap only apply to longer tokens
+        if len(token) > 2:
+            entries.extend((self.trigrams, token[i:i + 3]) for i in range(len(token) - 2))
+            entries.extend((self.length_chars, (len(token), char)) for char in set(token))
+        return entries
+
+    def copy(self) -> "VocabularyIndex":
+        """
+        Shallow copy for copy-on-write updates.
+        add and remove replace the inner sets instead of changing them, so
+        the copy and the original never affect each other.
+        """
+        clone = VocabularyIndex((), self.similar)
+        clone.tokens = set(self.tokens)
+        clone.group_tokens = dict(self.group_tokens)
+        clone.trigrams = dict(self.trigrams)
+        clone.length_chars = dict(self.length_chars)
+        return clone
+
+    def add(self, token: str):
+        """Register a new vocabulary token in every lookup table."""
+        self.tokens.add(token)
+        for table, key in self._table_keys(token):
+            table[key] = table.get(key, set()) | {token}
+
+    def remove(self, token: str):
+        """Drop a vocabulary token from every lookup table."""
+        self.tokens.discard(token)
+        for table, key in self._table_keys(token):
+            remaining = table.get(key, set()) - {token}
+            if remaining:
+                table[key] = remaining
+            else:
+                table.pop(key, None)
+
+    def similar_tokens(self, user_token: str) -> Set[str]:
+        """
+        Find every vocabulary token similar to the user token.
+
+        Args:
+            user_token (str): Preprocessed user input token
+
+        Returns:
+            Set[str]: Similar vocabulary tokens, including the token itself if known
+        """
+        found = {user_token} if user_token in self.tokens else set()
+
+        for group_id in TOKEN_GROUPS.get(user_token, ()):
+            found.update(self.group_tokens.get(group_id, ()))
+
+        length = len(user_token)
+        if length <= 2:
+            return found
+
+        # Vocabulary tokens contained in the user token
+        for size in range(3, length + 1):
+            for i in range(length - size + 1):
+                if user_token[i:i + size] in self.tokens:
+                    found.add(user_token[i:i + size])
+
+        # Vocabulary tokens containing the user token share all of its trigrams
+        trigram_sets = [self.trigrams.get(user_token[i:i + 3], set()) for i in range(length - 2)]
+        containing = set.intersection(*sorted(trigram_sets, key=len))
+        found.update(token for token in containing if user_token in token)
+
+        # Character overlap: count the user token's characters found in each
+        # token of similar length, then confirm the ones over the threshold
+        char_counts = Counter(user_token)
+        for other_length in range(max(3, length - 2), length + 3):
+            common: Dict[str, int] = {}
+            for char, count in char_counts.items():
+                for token in self.length_chars.get((other_length, char), ()):
+                    common[token] = common.get(token, 0) + count
+            threshold = min(length, other_length) * 0.6
+            found.update(token for token, shared in common.items()
+                         if shared >= threshold and token not in found and self.similar(user_token, token))
+
+        return found
+
+
+class IntentIndex:
+    """
+    Compiled view of the intents data.
+    Every pattern is tokenized once here instead of on every user message,
+    and an inverted index maps tokens to the patterns containing them so only
+    patterns sharing a similar token with the user input get scored.
+    An index is never changed once built: updated() returns a new index that
+    shares everything except what the changed intents touch.
+    """
+
+    def __init__(self, intents: List[Dict[str, Any]], preprocess: Callable[[str], List[str]],
+                 similar: Callable[[str, str], bool]):
+        """
+        Compile the intents into pattern entries and inverted indexes.
+
+        Args:
+            intents (List[Dict[str, Any]]): Intent dictionaries from intents.json
+            preprocess (Callable[[str], List[str]]): Tokenizer used for user input too
+            similar (Callable[[str, str], bool]): Token similarity check (user token, pattern token)
+        """
+        self.intents = intents
+        self.preprocess = preprocess
+        self.similar = similar
+        self.patterns: Dict[int, CompiledPattern] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.intent_patterns: Dict[str, List[int]] = {}
+        self.intent_hashes: Dict[str, str] = {}
+        self.intent_order: Dict[str, int] = {}
+        self.changes = {"added": 0, "changed": 0, "removed": 0}
+        self._next_id = 0
+
+        for order, (key, intent) in enumerate(zip(intent_keys(intents), intents)):
+            self.intent_order[key] = order
+            self.intent_hashes[key] = intent_hash(intent)
+            self.intent_patterns[key] = [self._compile_pattern(text, intent, key, position)
+                                         for position, text in enumerate(intent.get('patterns', []))]
+
+        for pattern_id, pattern in self.patterns.items():
+            for token in pattern.token_set:
+                self.postings.setdefault(token, []).append(pattern_id)
+
+        self.vocabulary = VocabularyIndex(self.postings, similar)
+        self.changes["added"] = len(intents)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _compile_pattern(self, text: str, intent: Dict[str, Any], key: str, position: int) -> int:
+        """Tokenize a pattern and store it under a new pattern id."""
+        pattern_id = self._next_id
+        self._next_id += 1
+        self.patterns[pattern_id] = CompiledPattern(text, intent, self.preprocess(text), key, position)
+        return pattern_id
+
+    def _rank(self, pattern_id: int) -> Tuple[int, int]:
+        """File order of a pattern, earlier patterns win on equal scores."""
+        pattern = self.patterns[pattern_id]
+        return self.intent_order[pattern.intent_key], pattern.position
+
+    def ordered_patterns(self) -> List[CompiledPattern]:
+        """All compiled patterns in intents.json order."""
+        return [self.patterns[pattern_id] for pattern_id in sorted(self.patterns, key=self._rank)]
+
+    def updated(self, intents: List[Dict[str, Any]]) -> "IntentIndex":
+        """
+        Build the index for a new version of the intents, recompiling only
+        the intents that were added, changed or removed (by tag and content hash).
+        The top-level tables are copied, but inner postings are replaced rather
+        than changed, so this index stays valid for callers still using it.
+
+        Args:
+            intents (List[Dict[str, Any]]): New intent dictionaries
+
+        Returns:
+            IntentIndex: Updated index, with the change counts in .changes
+        """
+        new_keys = intent_keys(intents)
+        new_hashes = {key: intent_hash(intent) for key, intent in zip(new_keys, intents)}
+
+        removed = [key for key in self.intent_hashes if new_hashes.get(key) != self.intent_hashes[key]]
+        added = [(key, intent) for key, intent in zip(new_keys, intents)
+                 if self.intent_hashes.get(key) != new_hashes[key]]
+
+        index = copy.copy(self)
+        index.intents = intents
+        index.patterns = dict(self.patterns)
+        index.postings = dict(self.postings)
+        index.intent_patterns = dict(self.intent_patterns)
+        index.intent_hashes = new_hashes
+        index.intent_order = {key: order for order, key in enumerate(new_keys)}
+        index.vocabulary = self.vocabulary.copy()
+
+        for key in removed:
+            index._remove_intent(key)
+        for key, intent in added:
+            index._add_intent(key, intent)
+
+        changed = len(set(removed) & set(new_hashes))
+        index.changes = {"added": len(added) - changed, "changed": changed, "removed": len(removed) - changed}
+        index._finish_update()
+        return index
+
+    def _add_intent(self, key: str, intent: Dict[str, Any]):
+        """Compile an intent's patterns and add them to the postings."""
+        pattern_ids = [self._compile_pattern(text, intent, key, position)
+                       for position, text in enumerate(intent.get('patterns', []))]
+        self.intent_patterns[key] = pattern_ids
+
+        new_postings: Dict[str, List[int]] = {}
+        for pattern_id in pattern_ids:
+            for token in self.patterns[pattern_id].token_set:
+                new_postings.setdefault(token, []).append(pattern_id)
+
+        for token, ids in new_postings.items():
+            if token not in self.postings:
+                self.vocabulary.add(token)
+            self.postings[token] = self.postings.get(token, []) + ids
+
+    def _remove_intent(self, key: str):
+        """Drop an intent's patterns from the postings."""
+        pattern_ids = set(self.intent_patterns.pop(key, ()))
+        tokens = set()
+        for pattern_id in pattern_ids:
+            tokens.update(self.patterns.pop(pattern_id).token_set)
+
+        for token in tokens:
+            remaining = [pattern_id for pattern_id in self.postings[token] if pattern_id not in pattern_ids]
+            if remaining:
+                self.postings[token] = remaining
+            else:
+                del self.postings[token]
+                self.vocabulary.remove(token)
+
+    def _finish_update(self):
+        """Hook for matchers with derived data to refresh after updated()."""
+
+    def _candidate_patterns(self, user_token: str) -> Set[int]:
+        """
+        Find the patterns containing a token similar to the user token.
+
+        Args:
+            user_token (str): Preprocessed user input token
+
+        Returns:
+            Set[int]: Ids of the patterns that can match this token
+        """
+        candidates = set()
+        for token in self.vocabulary.similar_tokens(user_token):
+            candidates.update(self.postings[token])
+        return candidates
+
+    def best_match(self, user_tokens: List[str]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the best matching intent for the user tokens.
+        Gives the same result as scoring every pattern in order, where the
+        first pattern wins on equal scores.
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], float]: Best matching intent and its score
+        """
+        return self._best_match(user_tokens, {})
+
+    def best_matches(self, token_lists: List[List[str]]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Find the best matching intent for several messages at once.
+        Candidate patterns of a token are looked up once for the whole batch.
+
+        Args:
+            token_lists (List[List[str]]): Preprocessed tokens of each message
+
+        Returns:
+            List[Tuple[Optional[Dict[str, Any]], float]]: Best match per message, in order
+        """
+        candidates_cache: Dict[str, Set[int]] = {}
+        return [self._best_match(user_tokens, candidates_cache) for user_tokens in token_lists]
+
+    def _best_match(self, user_tokens: List[str],
+                    candidates_cache: Dict[str, Set[int]]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Score the candidate patterns of the user tokens, reusing cached candidates."""
+        if not user_tokens:
+            return None, 0.0
+
+        # Matched user tokens (with repeats) and shared unique tokens per pattern
+        matched: Dict[int, int] = {}
+        shared: Dict[int, int] = {}
+
+        for user_token, count in Counter(user_tokens).items():
+            candidates = candidates_cache.get(user_token)
+            if candidates is None:
+                candidates = candidates_cache[user_token] = self._candidate_patterns(user_token)
+            for pattern_id in candidates:
+                matched[pattern_id] = matched.get(pattern_id, 0) + count
+            for pattern_id in self.postings.get(user_token, ()):
+                shared[pattern_id] = shared.get(pattern_id, 0) + 1
+
+        best_id = None
+        best_rank = None
+        best_score = 0.0
+        user_unique = len(set(user_tokens))
+
+        for pattern_id, matches in matched.items():
+            pattern = self.patterns[pattern_id]
+            score = matches / (user_unique + len(pattern.token_set) - shared.get(pattern_id, 0))
+            if score < best_score:
+                continue
+            rank = self._rank(pattern_id)
+            if score > best_score or rank < best_rank:
+                best_score = score
+                best_rank = rank
+                best_id = pattern_id
+
+        if best_id is None:
+            return None, 0.0
+        return self.patterns[best_id].intent, best_score
+
+
+class TfidfIntentIndex(IntentIndex):
+    """
+    TF-IDF matcher over the same compiled patterns.
+    The patterns form a sparse pattern x term matrix stored column by column
+    (term -> pattern ids and weights), so a user message is scored against
+    every pattern with one sparse matrix-vector product. Scores are cosine
+    similarities between 0.0 and 1.0.
+    """
+
+    def __init__(self, intents: List[Dict[str, Any]], preprocess: Callable[[str], List[str]],
+                 similar: Callable[[str, str], bool]):
+        super().__init__(intents, preprocess, similar)
+        self._build_weights()
+
+    def _finish_update(self):
+        # idf depends on every document frequency, so the weights are rebuilt
+        # from the existing tokens (no pattern is tokenized again)
+        self._build_weights()
+
+    def _build_weights(self):
+        """Compute the L2-normalized TF-IDF columns from the postings."""
+        total = len(self.patterns)
+        self.idf: Dict[str, float] = {
+            token: math.log((1 + total) / (1 + len(pattern_ids))) + 1.0
+            for token, pattern_ids in self.postings.items()
+        }
+        # Tokens missing from the intents get the idf of a zero document frequency
+        self.unseen_idf = math.log(1 + total) + 1.0
+
+        # Row norms first, then every column entry is divided by its row norm
+        norms: Dict[int, float] = {}
+        for pattern_id, pattern in self.patterns.items():
+            counts = Counter(pattern.tokens)
+            norms[pattern_id] = math.sqrt(sum((count * self.idf[token]) ** 2 for token, count in counts.items()))
+
+        self.columns: Dict[str, Tuple[List[int], List[float]]] = {}
+        for token, pattern_ids in self.postings.items():
+            idf = self.idf[token]
+            weights = [self.patterns[pattern_id].tokens.count(token) * idf / norms[pattern_id]
+                       for pattern_id in pattern_ids]
+            self.columns[token] = (pattern_ids, weights)
+
+    def best_match(self, user_tokens: List[str]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the pattern with the highest TF-IDF cosine similarity.
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], float]: Best matching intent and its score
+        """
+        # Unknown tokens still count towards the query norm
+        query = {token: count * self.idf.get(token, self.unseen_idf) for token, count in Counter(user_tokens).items()}
+        query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        if not query_norm:
+            return None, 0.0
+
+        scores: Dict[int, float] = {}
+        for token, weight in query.items():
+            if token not in self.columns:
+                continue
+            pattern_ids, weights = self.columns[token]
+            weight /= query_norm
+            for pattern_id, pattern_weight in zip(pattern_ids, weights):
+                scores[pattern_id] = scores.get(pattern_id, 0.0) + weight * pattern_weight
+
+        if not scores:
+            return None, 0.0
+
+        # Highest score wins, the earliest pattern on ties
+        best_id = min(scores, key=lambda pattern_id: (-scores[pattern_id], self._rank(pattern_id)))
+        return self.patterns[best_id].intent, min(scores[best_id], 1.0)
+
+    def best_matches(self, token_lists: List[List[str]]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Score several messages, one sparse matrix-vector product each.
+
+        Args:
+            token_lists (List[List[str]]): Preprocessed tokens of each message
+
+        Returns:
+            List[Tuple[Optional[Dict[str, Any]], float]]: Best match per message, in order
+        """
+        return [self.best_match(user_tokens) for user_tokens in token_lists]
+
+
+# Matching engines selectable through ChatbotLogic(matcher=...)
+MATCHERS = {
+    "overlap": IntentIndex,
+    "tfidf": TfidfIntentIndex
+}
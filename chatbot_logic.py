@@ -1,458 +1,468 @@
-import json
-import random
-import re
-import os
-from datetime import datetime
-from typing import List, Dict, Any
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
-# Download required NLTK data (uncomment if running for the first time)
-# nltk.download('punkt')
-# nltk.download('stopwords')
-
-class ChatbotLogic:
-    """
-    Chatbot logic class that handles intent recognition and response generation.
-    Uses NLTK for natural language processing and keyword matching.
-    Now includes learning capabilities to improve over time.
-    """
-    
-    def __init__(self, intents_file: str = "intents.json"):
-        """
-        Initialize the chatbot with intents data and learning capabilities.
-        
-        Args:
-            intents_file (str): Path to the intents JSON file
-        """
-        self.intents_file = intents_file
-        self.intents_data = self._load_intents()
-        self.learning_data_file = "chatbot_learning.json"
-        self.conversation_history = []
-        self.user_preferences = {}
-        self.response_feedback = {}
-        
-        # Load learning data
-        self.learning_data = self._load_learning_data()
-        
-        self.fallback_responses = [
-            "Arey dost, samajh nahi aaya! 😅 Thoda aur simple tarike se bolo na!",
-            "Yaar, yeh kya bola tune? 😄 Thoda aur clearly bolo!",
-            "Arey, main toh abhi learning phase mein hoon! 😊 Thoda aur simple bolo!",
-            "Interesting lag raha hai, lekin main samajh nahi paa raha! 😅 Thoda aur explain kar!",
-            "Arey dost, yeh topic toh mujhe pata nahi! 😄 Koi aur baat kar sakte hain hum!",
-            "Yaar, yeh toh meri samajh se bahar hai! 😊 Koi aur sawal puch sakta hai tu!",
-            "Arey, main toh bas simple baatein samajh sakta hoon! 😄 Thoda basic level pe bolo!",
-            "Dost, yeh toh meri knowledge se bahar hai! 😅 Koi aur topic pe baat karte hain!",
-            "Arey yaar, yeh kya bola tune? 😅 Thoda aur clearly bolo na!",
-            "Dost, main toh abhi Hinglish samajh raha hoon! 😊 Thoda simple bolo!",
-            "Yaar, yeh kya language hai? 😄 English ya Hindi mein bolo!",
-            "Arey, main toh bas basic Hinglish samajh sakta hoon! 😊 Thoda simple bolo!",
-            "Dost, yeh kya bola tune? 😅 Thoda aur clearly explain kar!",
-            "Arey yaar, main toh abhi learning kar raha hoon! 😄 Thoda simple bolo!",
-            "Dost, yeh kya bola tune? 😊 Thoda aur clearly bolo na!"
-        ]
-        
-        # Initialize NLTK components
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except LookupError:
-            # If stopwords not available, use a basic set
-            self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-    
-    def _load_learning_data(self) -> Dict[str, Any]:
-        """Load learning data from file."""
-        try:
-            if os.path.exists(self.learning_data_file):
-                with open(self.learning_data_file, 'r', encoding='utf-8') as file:
-                    return json.load(file)
-        except Exception as e:
-            print(f"Warning: Could not load learning data: {e}")
-        
-        # Return default learning data structure
-        return {
-            "conversation_history": [],
-            "user_preferences": {},
-            "response_feedback": {},
-            "learned_patterns": [],
-            "custom_responses": {},
-            "last_updated": datetime.now().isoformat()
-        }
-    
-    def _save_learning_data(self):
-        """Save learning data to file."""
-        try:
-            self.learning_data.update({
-                "conversation_history": self.conversation_history[-100:],  # Keep last 100 conversations
-                "user_preferences": self.user_preferences,
-                "response_feedback": self.response_feedback,
-                "last_updated": datetime.now().isoformat()
-            })
-            
-            with open(self.learning_data_file, 'w', encoding='utf-8') as file:
-                json.dump(self.learning_data, file, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Warning: Could not save learning data: {e}")
-    
-    def _load_intents(self) -> List[Dict[str, Any]]:
-        """
-        Load intents data from JSON file.
-        
-        Returns:
-            List[Dict[str, Any]]: List of intent dictionaries
-        """
-        try:
-            with open(self.intents_file, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                return data.get('intents', [])
-        except FileNotFoundError:
-            print(f"Warning: {self.intents_file} not found. Using default intents.")
-            return []
-        except json.JSONDecodeError:
-            print(f"Warning: Error parsing {self.intents_file}. Using default intents.")
-            return []
-    
-    def _preprocess_text(self, text: str) -> List[str]:
-        """
-        Preprocess text by tokenizing and removing stop words.
-        Now handles Hinglish (Hindi-English mixed) text better.
-        
-        Args:
-            text (str): Input text to preprocess
-            
-        Returns:
-            List[str]: List of preprocessed tokens
-        """
-        # Convert to lowercase and tokenize
-        tokens = word_tokenize(text.lower())
-        
-        # Keep both English and Hindi tokens, remove only English stop words
-        # Don't filter out Hindi words as they might be important
-        filtered_tokens = []
-        for token in tokens:
-            # Keep tokens that are either:
-            # 1. English words that are not stop words
-            # 2. Hindi words (non-English characters)
-            # 3. Mixed words (containing both English and Hindi)
-            if (token.isalpha() and token not in self.stop_words) or \
-               any(ord(char) > 127 for char in token) or \
-               (any(ord(char) > 127 for char in token) and any(ord(char) <= 127 for char in token)):
-                filtered_tokens.append(token)
-        
-        return filtered_tokens
-    
-    def _calculate_similarity(self, user_tokens: List[str], pattern_tokens: List[str]) -> float:
-        """
-        Calculate similarity between user input and intent pattern.
-        Now handles Hinglish and mixed language better.
-        
-        Args:
-            user_tokens (List[str]): Preprocessed user input tokens
-            pattern_tokens (List[str]): Preprocessed pattern tokens
-            
-        Returns:
-            float: Similarity score (0.0 to 1.0)
-        """
-        if not user_tokens or not pattern_tokens:
-            return 0.0
-        
-        # Count exact matches
-        exact_matches = sum(1 for token in user_tokens if token in pattern_tokens)
-        
-        # Count partial matches (for Hinglish variations)
-        partial_matches = 0
-        for user_token in user_tokens:
-            for pattern_token in pattern_tokens:
-                # Check if tokens are similar (partial match)
-                if self._are_tokens_similar(user_token, pattern_token):
-                    partial_matches += 1
-                    break
-        
-        # Use the better of exact or partial matches
-        best_matches = max(exact_matches, partial_matches)
-        
-        # Calculate similarity as matches over total unique tokens
-        total_unique = len(set(user_tokens + pattern_tokens))
-        if total_unique == 0:
-            return 0.0
-        
-        return best_matches / total_unique
-    
-    def _are_tokens_similar(self, token1: str, token2: str) -> bool:
-        """
-        Check if two tokens are similar (for Hinglish variations).
-        
-        Args:
-            token1 (str): First token
-            token2 (str): Second token
-            
-        Returns:
-            bool: True if tokens are similar
-        """
-        # Exact match
-        if token1 == token2:
-            return True
-        
-        # Check for common Hinglish variations
-        variations = {
-            'hello': ['hi', 'hey', 'namaste', 'kaise ho', 'kya haal'],
-            'hi': ['hello', 'hey', 'namaste', 'kaise ho', 'kya haal'],
-            'hey': ['hello', 'hi', 'namaste', 'kaise ho', 'kya haal'],
-            'joke': ['joke', 'funny', 'hasao', 'mazak', 'comedy'],
-            'funny': ['joke', 'funny', 'hasao', 'mazak', 'comedy'],
-            'sad': ['sad', 'depressed', 'udaas', 'dukhi', 'unhappy'],
-            'happy': ['happy', 'khush', 'mast', 'excited', 'joyful'],
-            'help': ['help', 'madad', 'sahayata', 'assist', 'support'],
-            'thanks': ['thanks', 'thank you', 'shukriya', 'dhanyawad', 'gratitude'],
-            'bye': ['bye', 'goodbye', 'alvida', 'phir milenge', 'see you']
-        }
-        
-        # Check if tokens are in the same variation group
-        for group, words in variations.items():
-            if token1 in words and token2 in words:
-                return True
-        
-        # Check for partial string matching (for Hinglish variations)
-        if len(token1) > 2 and len(token2) > 2:
-            # Check if one token contains the other
-            if token1 in token2 or token2 in token1:
-                return True
-            
-            # Check for similar length and character overlap
-            if abs(len(token1) - len(token2)) <= 2:
-                common_chars = sum(1 for c in token1 if c in token2)
-                if common_chars >= min(len(token1), len(token2)) * 0.6:
-                    return True
-        
-        return False
-    
-    def _learn_from_conversation(self, user_input: str, bot_response: str, feedback: str = None):
-        """
-        Learn from conversation and user feedback.
-        
-        Args:
-            user_input (str): User's message
-            bot_response (str): Bot's response
-            feedback (str): User feedback (optional)
-        """
-        # Store conversation
-        conversation = {
-            "timestamp": datetime.now().isoformat(),
-            "user_input": user_input,
-            "bot_response": bot_response,
-            "feedback": feedback
-        }
-        self.conversation_history.append(conversation)
-        
-        # Store user preferences based on conversation patterns
-        if "joke" in user_input.lower() or "funny" in user_input.lower():
-            self.user_preferences["likes_jokes"] = self.user_preferences.get("likes_jokes", 0) + 1
-        
-        if "motivation" in user_input.lower() or "sad" in user_input.lower():
-            self.user_preferences["needs_motivation"] = self.user_preferences.get("needs_motivation", 0) + 1
-        
-        # Store feedback if provided
-        if feedback:
-            self.response_feedback[user_input] = feedback
-        
-        # Save learning data periodically
-        if len(self.conversation_history) % 10 == 0:  # Save every 10 conversations
-            self._save_learning_data()
-    
-    def _get_personalized_response(self, intent_tag: str, responses: List[str]) -> str:
-        """
-        Get personalized response based on user preferences and conversation history.
-        
-        Args:
-            intent_tag (str): Intent tag
-            responses (List[str]): Available responses
-            
-        Returns:
-            str: Personalized response
-        """
-        # Check if user has specific preferences
-        if intent_tag == "joke" and self.user_preferences.get("likes_jokes", 0) > 2:
-            # User likes jokes, give more variety
-            return random.choice(responses)
-        elif intent_tag == "motivation" and self.user_preferences.get("needs_motivation", 0) > 1:
-            # User needs motivation, give encouraging responses
-            motivational_responses = [
-                "Arey dost, sun! Life mein ups and downs toh aate rehte hain! 😊 Tu strong hai, tu kar sakta hai! Main yahan hoon na! 🌟",
-                "Hey! Don't worry yaar! 😄 Tough times don't last, tough people do! Tu toh ekdum strong hai! 💪",
-                "Arey yaar, tension mat le! 😊 Har problem ka solution hota hai! Tu bas positive rah, sab theek ho jayega! ✨"
-            ]
-            return random.choice(motivational_responses)
-        
-        # Default to random response
-        return random.choice(responses)
-    
-    def get_response(self, user_input: str) -> str:
-        """
-        Get chatbot response based on user input with learning capabilities.
-        Now handles Hinglish and mixed language better.
-        
-        Args:
-            user_input (str): User's message
-            
-        Returns:
-            str: Chatbot's response
-        """
-        if not user_input.strip():
-            return "Please say something!"
-        
-        # Check if input is primarily Hinglish and provide helpful response
-        if self._is_hinglish_input(user_input):
-            # Try to understand Hinglish input better
-            response = self._handle_hinglish_input(user_input)
-            if response:
-                self._learn_from_conversation(user_input, response)
-                return response
-        
-        # Preprocess user input
-        user_tokens = self._preprocess_text(user_input)
-        
-        if not user_tokens:
-            response = random.choice(self.fallback_responses)
-            self._learn_from_conversation(user_input, response)
-            return response
-        
-        best_match = None
-        best_score = 0.0
-        
-        # Find the best matching intent
-        for intent in self.intents_data:
-            for pattern in intent.get('patterns', []):
-                pattern_tokens = self._preprocess_text(pattern)
-                similarity = self._calculate_similarity(user_tokens, pattern_tokens)
-                
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = intent
-        
-        # If we have a good match, return a personalized response
-        if best_match and best_score > 0.3:  # Threshold for acceptable match
-            responses = best_match.get('responses', [])
-            if responses:
-                response = self._get_personalized_response(best_match.get('tag', ''), responses)
-                self._learn_from_conversation(user_input, response)
-                return response
-        
-        # Return fallback response if no good match found
-        response = random.choice(self.fallback_responses)
-        self._learn_from_conversation(user_input, response)
-        return response
-    
-    def _is_hinglish_input(self, text: str) -> bool:
-        """Check if input is primarily Hinglish (Hindi-English mixed)."""
-        # Count Hindi and English characters
-        hindi_chars = sum(1 for char in text if ord(char) > 127)
-        english_chars = sum(1 for char in text if ord(char) <= 127 and char.isalpha())
-        
-        # If there are both Hindi and English characters, it's likely Hinglish
-        return hindi_chars > 0 and english_chars > 0
-    
-    def _handle_hinglish_input(self, text: str) -> str:
-        """Handle Hinglish input with better understanding."""
-        text_lower = text.lower()
-        
-        # Common Hinglish patterns and their responses
-        hinglish_patterns = {
-            'kaise ho': 'Hey dost! Main toh bilkul badhiya hoon! 😊 Tu bata, tu kaise hai?',
-            'kya haal': 'Arey yaar, main toh perfect hoon! 😄 Tu bata, kya haal hai?',
-            'sab badhiya': 'Dost, main toh ekdum mast hoon! 😊 Tu bata, sab theek?',
-            'kya kar raha': 'Arey dost, main toh bas tumse baat kar raha hoon! 😄 Tu bata, tu kya kar raha hai?',
-            'joke sunao': 'Ek joke sun! 😄 Doctor ne patient se pucha: "Aapko kya hua hai?" Patient bola: "Doctor sahab, main toh bas check-up ke liye aaya hoon!" 😂',
-            'hasao mujhe': 'Arey yaar, ek joke sun! 😊 Teacher ne pucha: "2+2 kya hota hai?" Student bola: "4!" Teacher: "Perfect!" Student: "Perfect kya hota hai?" 😄',
-            'mujhe motivate': 'Arey dost, sun! Life mein ups and downs toh aate rehte hain! 😊 Tu strong hai, tu kar sakta hai! Main yahan hoon na! 🌟',
-            'udaas hoon': 'Hey! Don\'t worry yaar! 😄 Tough times don\'t last, tough people do! Tu toh ekdum strong hai! 💪',
-            'tension hai': 'Arey yaar, tension mat le! 😊 Har problem ka solution hota hai! Tu bas positive rah, sab theek ho jayega! ✨',
-            'shukriya': 'Arey yaar, koi baat nahi! 😊 Dost dost hote hain!',
-            'dhanyawad': 'Welcome dost! Koi tension nahi! 😄',
-            'alvida': 'Bye dost! Phir milenge! 👋 Khush raho!',
-            'phir milenge': 'See you later! Miss karunga! 😊 Jaldi wapas aana!'
-        }
-        
-        # Check for Hinglish patterns
-        for pattern, response in hinglish_patterns.items():
-            if pattern in text_lower:
-                return response
-        
-        return None
-    
-    def provide_feedback(self, user_input: str, feedback: str):
-        """
-        Allow user to provide feedback on bot responses.
-        
-        Args:
-            user_input (str): Original user input
-            feedback (str): User feedback (positive/negative)
-        """
-        self.response_feedback[user_input] = feedback
-        self._save_learning_data()
-    
-    def get_conversation_stats(self) -> Dict[str, Any]:
-        """
-        Get conversation statistics and learning insights.
-        
-        Returns:
-            Dict[str, Any]: Conversation statistics
-        """
-        total_conversations = len(self.conversation_history)
-        positive_feedback = sum(1 for f in self.response_feedback.values() if "positive" in f.lower())
-        negative_feedback = sum(1 for f in self.response_feedback.values() if "negative" in f.lower())
-        
-        return {
-            "total_conversations": total_conversations,
-            "user_preferences": self.user_preferences,
-            "feedback_stats": {
-                "positive": positive_feedback,
-                "negative": negative_feedback,
-                "total_feedback": len(self.response_feedback)
-            },
-            "last_updated": self.learning_data.get("last_updated", "Never")
-        }
-    
-    def get_welcome_message(self) -> str:
-        """
-        Get a welcome message for the chatbot.
-        
-        Returns:
-            str: Welcome message
-        """
-        welcome_messages = [
-            "Hey dost! 😊 Main tumhara AI buddy hoon! Kya haal hai?",
-            "Hi yaar! 😄 Main toh bas tumse baat karne ke liye ready hoon! Kya chal raha hai?",
-            "Welcome buddy! 😊 Main toh bas tumhara dost hoon! Kya kar sakte hain hum?",
-            "Arey, aao aao! 😄 Main toh bas tumse chat karne ke liye hoon! Kya haal hai?"
-        ]
-        return random.choice(welcome_messages)
-    
-    def reload_intents(self) -> bool:
-        """
-        Reload intents from the JSON file.
-        
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        try:
-            self.intents_data = self._load_intents()
-            return True
-        except Exception as e:
-            print(f"Error reloading intents: {e}")
-            return False
-    
-    def reset_learning(self):
-        """Reset all learning data."""
-        self.conversation_history = []
-        self.user_preferences = {}
-        self.response_feedback = {}
-        self.learning_data = {
-            "conversation_history": [],
-            "user_preferences": {},
-            "response_feedback": {},
-            "learned_patterns": [],
-            "custom_responses": {},
-            "last_updated": datetime.now().isoformat()
-        }
-        self._save_learning_data()
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from chatbot_model import ChatbotModel, ModelSnapshot
+from chatbot_history import ConversationHistory, ConversationRecord
+from chatbot_metrics import ChatbotMetrics
+from chatbot_storage import (JournalLearningStore, SqliteLearningStore, BackgroundLearningWriter,
+                             default_learning_data)
+
+class ChatbotLogic:
+    """
+    Chatbot logic class that handles intent recognition and response generation.
+    Uses a regex tokenizer (or NLTK, if selected) and keyword matching.
+    Now includes learning capabilities to improve over time.
+    Safe to share between threads: matching only reads the compiled model
+    and learning updates are applied one at a time.
+    """
+    
+    def __init__(self, intents_file: str = "intents.json", matcher: str = "overlap",
+                 match_threshold: float = 0.3, similarity_cache_size: int = 100000,
+                 responses_file: str = "responses.json", background_writes: bool = True,
+                 learning_backend: str = "json", history_capacity: int = 100,
+                 model: Optional[ChatbotModel] = None, learning_store=None,
+                 async_inline_patterns: int = 2000, compiled_file: Optional[str] = None,
+                 tokenizer: str = "regex", metrics: Optional[ChatbotMetrics] = None):
+        """
+        Initialize the chatbot with intents data and learning capabilities.
+        
+        Args:
+            intents_file (str): Path to the intents JSON file
+            matcher (str): Matching engine, "overlap" (token similarity) or "tfidf"
+            match_threshold (float): Minimum score a match must exceed to be used
+            similarity_cache_size (int): Maximum number of memoized token pair comparisons
+            responses_file (str): Path to the Hinglish phrases and canned responses JSON file
+            background_writes (bool): Write learning data on a background thread instead of the caller's
+            learning_backend (str): Learning data storage, "json" (snapshot plus journal) or "sqlite"
+            history_capacity (int): Number of recent conversations kept in memory
+            model (Optional[ChatbotModel]): Compiled model shared with other sessions, the
+                intents, matcher and responses arguments are ignored when it is given
+            learning_store: Store for this session's learning data, built from
+                learning_backend and background_writes if None
+            async_inline_patterns (int): Largest intent index (in patterns) that aget_response
+                matches directly on the event loop instead of in an executor
+            compiled_file (Optional[str]): Compiled model file (see ChatbotModel.compile) to
+                load instead of the JSON files while it is up to date with them
+            tokenizer (str): Tokenizer, "regex" (built in) or "nltk" (word_tokenize, needs NLTK data)
+            metrics (Optional[ChatbotMetrics]): Records stage timings and counters of every
+                response, possibly shared with other sessions (None disables instrumentation)
+        """
+        if learning_backend not in ("json", "sqlite"):
+            raise ValueError(f"Unknown learning backend '{learning_backend}', expected one of: json, sqlite")
+        
+        # Intents, pattern index and response tables, read-only and possibly shared
+        self.model = model or ChatbotModel(intents_file, matcher, match_threshold,
+                                           similarity_cache_size, responses_file, compiled_file, tokenizer)
+        
+        # Set when the learning store is built here, None for a store passed in
+        self.learning_data_file = None
+        if learning_store is None:
+            if learning_backend == "sqlite":
+                self.learning_data_file = "chatbot_learning.db"
+                learning_store = SqliteLearningStore(self.learning_data_file)
+            else:
+                self.learning_data_file = "chatbot_learning.json"
+                learning_store = JournalLearningStore(self.learning_data_file)
+            if background_writes:
+                learning_store = BackgroundLearningWriter(learning_store)
+        self.learning_store = learning_store
+        
+        # Matching only reads the model, learning updates are serialized by this lock
+        self._learning_lock = threading.Lock()
+        self.async_inline_patterns = async_inline_patterns
+        self.metrics = metrics
+        
+        # Load learning data (snapshot plus journal) and restore what was learned
+        self.learning_data = self._load_learning_data()
+        self.conversation_history = ConversationHistory(history_capacity,
+                                                        self.learning_data.get("conversation_history", []))
+        self.user_preferences = dict(self.learning_data.get("user_preferences", {}))
+        self.response_feedback = dict(self.learning_data.get("response_feedback", {}))
+    
+    @property
+    def intent_index(self):
+        """Compiled pattern index of the shared model's current snapshot."""
+        return self.model.snapshot.intent_index
+    
+    @property
+    def intents_data(self) -> List[Dict[str, Any]]:
+        """Intents of the shared model's current snapshot."""
+        return self.model.snapshot.intents_data
+    
+    def _load_learning_data(self) -> Dict[str, Any]:
+        """Load learning data from the snapshot file and replay the journal."""
+        return self.learning_store.load()
+    
+    def _save_learning_data(self):
+        """Write a full snapshot of the learning data and clear the journal (learning lock held)."""
+        try:
+            self.learning_data.update({
+                "conversation_history": self.conversation_history.to_dicts(100),  # Keep last 100 conversations
+                "user_preferences": self.user_preferences,
+                "response_feedback": self.response_feedback,
+                "last_updated": datetime.now().isoformat()
+            })
+            
+            # The snapshot may be written on another thread, so hand over copies
+            snapshot = dict(self.learning_data)
+            snapshot["user_preferences"] = dict(self.user_preferences)
+            snapshot["response_feedback"] = dict(self.response_feedback)
+            self.learning_store.compact(snapshot)
+            if self.metrics is not None:
+                self.metrics.count("saves")
+        except Exception as e:
+            print(f"Warning: Could not save learning data: {e}")
+    
+    def _record_learning_event(self, event: Dict[str, Any], flush: bool = False):
+        """
+        Append a learning event to the journal (learning lock held).
+        
+        Args:
+            event (Dict[str, Any]): Event with a "type" and its fields
+            flush (bool): Hand the write to the OS right away
+        """
+        event["time"] = datetime.now().isoformat()
+        self.learning_data["last_updated"] = event["time"]
+        try:
+            self.learning_store.append(event, flush)
+        except Exception as e:
+            print(f"Warning: Could not save learning data: {e}")
+    
+    def _learn_from_conversation(self, user_input: str, bot_response: str, feedback: str = None):
+        """
+        Learn from conversation and user feedback.
+        
+        Args:
+            user_input (str): User's message
+            bot_response (str): Bot's response
+            feedback (str): User feedback (optional)
+        """
+        conversation = ConversationRecord(datetime.now().isoformat(), user_input, bot_response, feedback)
+        
+        # One writer at a time, so concurrent calls never lose an update
+        with self._learning_lock:
+            # Store conversation
+            self.conversation_history.append(conversation)
+            self._record_learning_event({"type": "conversation", "entry": conversation.to_dict()})
+            
+            # Store user preferences based on conversation patterns
+            if "joke" in user_input.lower() or "funny" in user_input.lower():
+                self._set_preference("likes_jokes", self.user_preferences.get("likes_jokes", 0) + 1)
+            
+            if "motivation" in user_input.lower() or "sad" in user_input.lower():
+                self._set_preference("needs_motivation", self.user_preferences.get("needs_motivation", 0) + 1)
+            
+            # Store feedback if provided (the SQLite store keeps it in the database only)
+            if feedback:
+                if not self.learning_store.queries_stats:
+                    self.response_feedback[user_input] = feedback
+                self._record_learning_event({"type": "feedback", "user_input": user_input, "feedback": feedback})
+            
+            # Fold the journal into a fresh snapshot once it has grown large
+            if self.learning_store.needs_compaction:
+                self._save_learning_data()
+    
+    def _set_preference(self, key: str, value: Any):
+        """Update a user preference and journal the new value (learning lock held)."""
+        self.user_preferences[key] = value
+        self._record_learning_event({"type": "preference", "key": key, "value": value})
+    
+    def _get_personalized_response(self, intent_tag: str, responses: List[str],
+                                   snapshot: Optional[ModelSnapshot] = None) -> str:
+        """
+        Get personalized response based on user preferences and conversation history.
+        
+        Args:
+            intent_tag (str): Intent tag
+            responses (List[str]): Available responses
+            snapshot (Optional[ModelSnapshot]): Model data of the current message, the model's current one if None
+            
+        Returns:
+            str: Personalized response
+        """
+        # Check if user has specific preferences
+        if intent_tag == "joke" and self.user_preferences.get("likes_jokes", 0) > 2:
+            # User likes jokes, give more variety
+            return random.choice(responses)
+        elif intent_tag == "motivation" and self.user_preferences.get("needs_motivation", 0) > 1:
+            # User needs motivation, give encouraging responses
+            motivational_responses = (snapshot or self.model.snapshot).response_tables.motivational_responses
+            if motivational_responses:
+                return random.choice(motivational_responses)
+        
+        # Default to random response
+        return random.choice(responses)
+    
+    def get_response(self, user_input: str) -> str:
+        """
+        Get chatbot response based on user input with learning capabilities.
+        Now handles Hinglish and mixed language better.
+        
+        Args:
+            user_input (str): User's message
+            
+        Returns:
+            str: Chatbot's response
+        """
+        return self.respond(user_input)["response"]
+    
+    async def aget_response(self, user_input: str) -> str:
+        """
+        Get chatbot response without blocking the asyncio event loop.
+        Small intent sets are matched directly on the loop, large ones (or
+        stores that write on the caller's thread) run in the default executor.
+        
+        Args:
+            user_input (str): User's message
+            
+        Returns:
+            str: Chatbot's response
+        """
+        if self._runs_inline():
+            return self.get_response(user_input)
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_response, user_input)
+    
+    def _runs_inline(self) -> bool:
+        """True if a call is cheap enough to run on the event loop."""
+        return (len(self.model.snapshot.intent_index) <= self.async_inline_patterns
+                and not self.learning_store.blocking_appends)
+    
+    def get_responses(self, user_inputs: Iterable[str], learn: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get chatbot responses for many messages at once.
+        Each distinct message is tokenized once and all of them are scored
+        against the intent index in a single batch. Responses are generated
+        and learned from in input order, just like repeated get_response calls.
+        
+        Args:
+            user_inputs (Iterable[str]): User messages
+            learn (bool): Record the conversations and preferences (default True)
+            
+        Returns:
+            List[Dict[str, Any]]: One result per message with "response", "tag" and "score"
+        """
+        user_inputs = list(user_inputs)
+        # The whole batch is answered from one version of the model
+        snapshot = self.model.snapshot
+        if self.metrics is not None:
+            started = time.perf_counter()
+        matches = self.model.match_batch(user_inputs, snapshot)
+        if self.metrics is not None:
+            self.metrics.record("batch_matching", started)
+        return [self.respond(user_input, learn, matches.get(user_input), snapshot) for user_input in user_inputs]
+    
+    def respond(self, user_input: str, learn: bool = True,
+                match: Optional[Tuple[Optional[Dict[str, Any]], float]] = None,
+                snapshot: Optional[ModelSnapshot] = None) -> Dict[str, Any]:
+        """
+        Generate the response for one message.
+        
+        Args:
+            user_input (str): User's message
+            learn (bool): Record the conversation and preferences
+            match (Optional[Tuple]): Precomputed (intent, score) from ChatbotModel.match_batch,
+                matched here if None
+            snapshot (Optional[ModelSnapshot]): Model data to answer from, the one match was
+                computed with; the model's current snapshot if None
+            
+        Returns:
+            Dict[str, Any]: Response text with the matched intent tag and score
+        """
+        if not user_input.strip():
+            return {"response": "Please say something!", "tag": None, "score": 0.0}
+        
+        # Read the model's data once, a concurrent reload swaps in a new snapshot
+        snapshot = snapshot or self.model.snapshot
+        
+        # Stages are only timed with metrics enabled, record() returns the next stage's start
+        metrics = self.metrics
+        started = stage_started = 0.0
+        if metrics is not None:
+            metrics.count("messages")
+            started = stage_started = time.perf_counter()
+        
+        # Check if input is primarily Hinglish and provide helpful response
+        is_hinglish = self.model.is_hinglish_input(user_input)
+        if metrics is not None:
+            stage_started = metrics.record("hinglish_detection", stage_started)
+        if is_hinglish:
+            # Try to understand Hinglish input better
+            response = self.model.handle_hinglish_input(user_input, snapshot)
+            if metrics is not None:
+                stage_started = metrics.record("phrase_shortcut", stage_started)
+            if response:
+                if metrics is not None:
+                    metrics.count("shortcut_hits")
+                return self._finish_response(user_input, response, None, 0.0, learn, started)
+        
+        if match is None:
+            # Preprocess user input
+            user_tokens = self.model.preprocess_text(user_input)
+            if metrics is not None:
+                stage_started = metrics.record("tokenization", stage_started)
+            match = self.model.find_best_match(user_tokens, snapshot) if user_tokens else (None, 0.0)
+            if metrics is not None:
+                stage_started = metrics.record("pattern_scoring", stage_started)
+        
+        best_match, best_score = match
+        
+        # If we have a good match, return a personalized response
+        if best_match and best_score > self.model.match_threshold:  # Threshold for acceptable match
+            responses = best_match.get('responses', [])
+            if responses:
+                response = self._get_personalized_response(best_match.get('tag', ''), responses, snapshot)
+                if metrics is not None:
+                    metrics.record("personalization", stage_started)
+                return self._finish_response(user_input, response, best_match.get('tag'), best_score, learn,
+                                             started)
+        
+        # Return fallback response if no good match found
+        response = random.choice(snapshot.response_tables.fallback_responses)
+        if metrics is not None:
+            metrics.count("fallbacks")
+        return self._finish_response(user_input, response, None, best_score, learn, started)
+    
+    def _finish_response(self, user_input: str, response: str, tag: Optional[str], score: float,
+                         learn: bool, started: float = 0.0) -> Dict[str, Any]:
+        """Learn from the exchange if enabled and build the response result (started: see respond)."""
+        metrics = self.metrics
+        if learn:
+            if metrics is not None:
+                learning_started = time.perf_counter()
+            self._learn_from_conversation(user_input, response)
+            if metrics is not None:
+                metrics.record("learning", learning_started)
+        if metrics is not None:
+            metrics.record("total", started)
+        return {"response": response, "tag": tag, "score": score}
+    
+    def provide_feedback(self, user_input: str, feedback: str):
+        """
+        Allow user to provide feedback on bot responses.
+        
+        Args:
+            user_input (str): Original user input
+            feedback (str): User feedback (positive/negative)
+        """
+        with self._learning_lock:
+            # The SQLite store keeps feedback in the database only
+            if not self.learning_store.queries_stats:
+                self.response_feedback[user_input] = feedback
+            self._record_learning_event({"type": "feedback", "user_input": user_input, "feedback": feedback},
+                                        flush=True)
+    
+    async def aprovide_feedback(self, user_input: str, feedback: str):
+        """
+        Record feedback without blocking the asyncio event loop.
+        
+        Args:
+            user_input (str): Original user input
+            feedback (str): User feedback (positive/negative)
+        """
+        if self.learning_store.blocking_appends:
+            await asyncio.get_running_loop().run_in_executor(None, self.provide_feedback, user_input, feedback)
+        else:
+            self.provide_feedback(user_input, feedback)
+    
+    def get_conversation_stats(self) -> Dict[str, Any]:
+        """
+        Get conversation statistics and learning insights.
+        
+        Returns:
+            Dict[str, Any]: Conversation statistics
+        """
+        # The SQLite store counts feedback and conversations with queries instead of loading them all
+        feedback_stats = self.learning_store.feedback_stats()
+        total_conversations = self.learning_store.conversation_count()
+        
+        with self._learning_lock:
+            if total_conversations is None:
+                total_conversations = self.conversation_history.total
+            if feedback_stats is None:
+                feedback_stats = {
+                    "positive": sum(1 for f in self.response_feedback.values() if "positive" in f.lower()),
+                    "negative": sum(1 for f in self.response_feedback.values() if "negative" in f.lower()),
+                    "total_feedback": len(self.response_feedback)
+                }
+            
+            return {
+                "total_conversations": total_conversations,
+                "user_preferences": dict(self.user_preferences),
+                "feedback_stats": feedback_stats,
+                "last_updated": self.learning_data.get("last_updated", "Never")
+            }
+    
+    def get_history_page(self, before: Optional[int] = None, limit: int = 50) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Get a page of past conversations, for showing the history a page at a time.
+        
+        Args:
+            before (Optional[int]): Only return conversations older than this position,
+                None for the newest (pass the first position of the previous page to go further back)
+            limit (int): Maximum number of conversations
+        
+        Returns:
+            List[Tuple[int, Dict[str, Any]]]: (position, conversation entry) pairs, oldest first;
+                empty once there is no older history
+        """
+        # The SQLite store pages through everything stored instead of just the recent history
+        page = self.learning_store.conversation_page(before, limit)
+        if page is not None:
+            return page
+        
+        with self._learning_lock:
+            records = list(self.conversation_history)
+            # Positions count every conversation ever recorded, the buffer holds the newest ones
+            first = self.conversation_history.total - len(records)
+        end = len(records) if before is None else max(0, min(before - first, len(records)))
+        begin = max(0, end - limit)
+        return [(first + i, records[i].to_dict()) for i in range(begin, end)]
+    
+    def get_welcome_message(self) -> str:
+        """
+        Get a welcome message for the chatbot.
+        
+        Returns:
+            str: Welcome message
+        """
+        return random.choice(self.model.snapshot.response_tables.welcome_messages)
+    
+    def reload_intents(self, incremental: bool = False) -> bool:
+        """
+        Reload intents and the response tables of the model, see ChatbotModel.reload_intents.
+        
+        Args:
+            incremental (bool): Only recompile what changed since the last load
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.model.reload_intents(incremental)
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Incrementally reload the model if intents.json or responses.json was modified.
+        
+        Returns:
+            bool: True if the files changed and were reloaded successfully
+        """
+        return self.model.reload_if_changed()
+    
+    def reset_learning(self):
+        """Reset all learning data."""
+        with self._learning_lock:
+            self.conversation_history.clear()
+            self.user_preferences = {}
+            self.response_feedback = {}
+            self.learning_data = default_learning_data()
+            self.learning_data["last_updated"] = datetime.now().isoformat()
+            self.learning_store.reset(dict(self.learning_data))
+        self.learning_store.flush()
+    
+    def close(self):
+        """Flush pending learning data to disk. Call before the application exits."""
+        with self._learning_lock:
+            self.learning_store.close()
@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, List, Tuple
+
+# Timed stages of ChatbotLogic.respond, "batch_matching" covers the tokenizing
+# and scoring done for a whole batch by ChatbotModel.match_batch
+STAGES = ("hinglish_detection", "phrase_shortcut", "tokenization", "pattern_scoring",
+          "personalization", "learning", "batch_matching", "total")
+COUNTERS = ("messages", "fallbacks", "shortcut_hits", "saves")
+
+# Histogram bucket upper bounds in seconds, from 10 µs to 1 s
+BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _empty_totals() -> Tuple[Dict[str, int], Dict[str, List[Any]]]:
+    """Zeroed counters and stage timings: stage -> [count, total seconds, max seconds, bucket counts]."""
+    return dict.fromkeys(COUNTERS, 0), {stage: [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)] for stage in STAGES}
+
+
+def _add_totals(totals: Tuple[Dict[str, int], Dict[str, List[Any]]], counters: Dict[str, int],
+                stages: Dict[str, List[Any]]):
+    """Add counters and stage timings into totals."""
+    for counter, value in counters.items():
+        totals[0][counter] = totals[0].get(counter, 0) + value
+    for stage, (count, total, maximum, buckets) in stages.items():
+        timing = totals[1][stage]
+        timing[0] += count
+        timing[1] += total
+        timing[2] = max(timing[2], maximum)
+        timing[3] = [mine + theirs for mine, theirs in zip(timing[3], buckets)]
+
+
+class ChatbotMetrics:
+    """
+    Latency histograms per response stage and event counters.
+    Pass one to ChatbotLogic (or SessionManager, to share it between
+    sessions) to enable instrumentation; without one nothing is timed.
+    Read it in-process with snapshot(), or as Prometheus text or JSON
+    with to_prometheus(), to_json() and dump(). The metrics of several
+    processes are combined with export() and merge().
+    Each thread records into its own counters and histograms, so recording
+    takes no lock; readers add up every thread's.
+    """
+
+    def __init__(self):
+        # Guards the list of per-thread totals and the totals of finished threads
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Set every counter and timing back to zero."""
+        with self._lock:
+            # Threads start new totals when the generation changes
+            self._generation = object()
+            # (thread, (counters, stages)) of every thread that recorded since the reset
+            self._threads: List[Tuple[threading.Thread, Tuple[Dict[str, int], Dict[str, List[Any]]]]] = []
+            # Totals of finished threads and merged exports
+            self._retired = _empty_totals()
+
+    def _thread_totals(self) -> Tuple[Dict[str, int], Dict[str, List[Any]]]:
+        """The calling thread's counters and stage timings, created on its first record."""
+        local = self._local
+        if getattr(local, "generation", None) is not self._generation:
+            with self._lock:
+                self._retire_finished()
+                local.generation = self._generation
+                local.totals = _empty_totals()
+                self._threads.append((threading.current_thread(), local.totals))
+        return local.totals
+
+    def _retire_finished(self):
+        """Fold the totals of finished threads into the retired ones (lock held by the caller)."""
+        running = []
+        for thread, totals in self._threads:
+            if thread.is_alive():
+                running.append((thread, totals))
+            else:
+                _add_totals(self._retired, *totals)
+        self._threads = running
+
+    def _totals(self) -> Tuple[Dict[str, int], Dict[str, List[Any]]]:
+        """Copies of the counters and stage timings added up over every thread."""
+        totals = _empty_totals()
+        with self._lock:
+            self._retire_finished()
+            _add_totals(totals, *self._retired)
+            for _, thread_totals in self._threads:
+                _add_totals(totals, *thread_totals)
+        return totals
+
+    def record(self, stage: str, started: float) -> float:
+        """
+        Record the time a stage took.
+
+        Args:
+            stage (str): One of STAGES
+            started (float): time.perf_counter() when the stage started
+
+        Returns:
+            float: time.perf_counter() now, the start of the next stage
+        """
+        now = time.perf_counter()
+        elapsed = now - started
+        timing = self._thread_totals()[1][stage]
+        timing[0] += 1
+        timing[1] += elapsed
+        if elapsed > timing[2]:
+            timing[2] = elapsed
+        timing[3][bisect_left(BUCKETS, elapsed)] += 1
+        return now
+
+    def count(self, counter: str, amount: int = 1):
+        """
+        Increase a counter.
+
+        Args:
+            counter (str): One of COUNTERS
+            amount (int): Amount to add
+        """
+        self._thread_totals()[0][counter] += amount
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Get the raw counters and stage histograms, to merge into another ChatbotMetrics.
+
+        Returns:
+            Dict[str, Any]: "counters" and, per stage, [count, total seconds, max seconds, bucket counts]
+        """
+        counters, stages = self._totals()
+        return {"counters": counters, "stages": stages}
+
+    def merge(self, exported: Dict[str, Any]):
+        """
+        Add metrics exported by another ChatbotMetrics, e.g. of another worker process.
+
+        Args:
+            exported (Dict[str, Any]): Result of export()
+        """
+        with self._lock:
+            _add_totals(self._retired, exported["counters"], exported["stages"])
+
+    @staticmethod
+    def _quantile(count: int, maximum: float, buckets: List[int], q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the maximum if that is lower)."""
+        rank = q * count
+        seen = 0
+        for bound, bucket in zip(BUCKETS, buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(bound, maximum)
+        return maximum
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current counters and stage timings.
+
+        Returns:
+            Dict[str, Any]: "counters" and, per stage, the count and total, mean,
+                maximum, median and 99th percentile milliseconds (percentiles are
+                histogram bucket bounds)
+        """
+        counters, stages = self._totals()
+        return {
+            "counters": counters,
+            "stages": {
+                stage: {
+                    "count": count,
+                    "total_ms": total * 1000,
+                    "mean_ms": total / count * 1000 if count else 0.0,
+                    "max_ms": maximum * 1000,
+                    "p50_ms": self._quantile(count, maximum, buckets, 0.5) * 1000 if count else 0.0,
+                    "p99_ms": self._quantile(count, maximum, buckets, 0.99) * 1000 if count else 0.0
+                }
+                for stage, (count, total, maximum, buckets) in stages.items()
+            }
+        }
+
+    def to_json(self) -> str:
+        """The snapshot as JSON."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Format the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: A chatbot_stage_seconds histogram labelled by stage and one
+                chatbot_<counter>_total counter per counter
+        """
+        counters, stages = self._totals()
+        lines = ["# HELP chatbot_stage_seconds Time spent in each stage of a chatbot response.",
+                 "# TYPE chatbot_stage_seconds histogram"]
+        for stage, (count, total, _, buckets) in stages.items():
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'chatbot_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'chatbot_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'chatbot_stage_seconds_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'chatbot_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        for counter, value in counters.items():
+            lines.append(f"# HELP chatbot_{counter}_total Number of {counter.replace('_', ' ')}.")
+            lines.append(f"# TYPE chatbot_{counter}_total counter")
+            lines.append(f"chatbot_{counter}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """
+        Write the metrics to a file, as JSON if the path ends in .json and
+        as Prometheus text otherwise (e.g. for node_exporter's textfile collector).
+
+        Args:
+            path (str): File to write, replaced atomically
+        """
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temp_path, path)
@@ -0,0 +1,485 @@
+import argparse
+import hashlib
+import json
+import os
+import struct
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Tuple
+from chatbot_compiled import CompiledFile, load_model, write_model
+from chatbot_index import MATCHERS, IntentIndex, tokens_similar
+from chatbot_phrases import ResponseTables
+from chatbot_tokenizer import TOKENIZERS
+
+
+class ModelSnapshot(NamedTuple):
+    """
+    Everything compiled from one version of the intents and responses files.
+    ChatbotModel replaces the whole snapshot on reload, so a caller that
+    reads model.snapshot once per message never mixes old and new data.
+    """
+
+    intents_data: List[Dict[str, Any]]
+    # IntentIndex, or a FlatIntentIndex over a compiled model file
+    intent_index: IntentIndex
+    response_tables: ResponseTables
+    # SHA-256 of the source files, see ChatbotModel._get_content_hash
+    content_hash: bytes
+
+
+class ChatbotModel:
+    """
+    Compiled, read-only chatbot model: intents, pattern index and response tables.
+    Holds nothing about any user, so a single model can be shared by every
+    ChatbotLogic session. The compiled data lives in one ModelSnapshot that
+    reloading replaces with a single assignment, the compiled objects
+    themselves are never changed after they are built.
+    """
+
+    def __init__(self, intents_file: str = "intents.json", matcher: str = "overlap",
+                 match_threshold: float = 0.3, similarity_cache_size: int = 100000,
+                 responses_file: str = "responses.json", compiled_file: Optional[str] = None,
+                 tokenizer: str = "regex"):
+        """
+        Load and compile the intents and response tables.
+        With a compiled_file (see compile()), the compiled data is loaded from it
+        instead, unless it is missing, unreadable or was built from different files.
+
+        Args:
+            intents_file (str): Path to the intents JSON file
+            matcher (str): Matching engine, "overlap" (token similarity) or "tfidf"
+            match_threshold (float): Minimum score a match must exceed to be used
+            similarity_cache_size (int): Maximum number of memoized token pair comparisons
+            responses_file (str): Path to the Hinglish phrases and canned responses JSON file
+            compiled_file (Optional[str]): Path to a compiled model file to load
+            tokenizer (str): Tokenizer, "regex" (built in) or "nltk" (word_tokenize, needs NLTK data)
+        """
+        if matcher not in MATCHERS:
+            raise ValueError(f"Unknown matcher '{matcher}', expected one of: {', '.join(MATCHERS)}")
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer '{tokenizer}', expected one of: {', '.join(TOKENIZERS)}")
+
+        self.intents_file = intents_file
+        self.responses_file = responses_file
+        self.matcher = matcher
+        self.match_threshold = match_threshold
+        self._similarity_cache = lru_cache(maxsize=similarity_cache_size)(tokens_similar)
+        # NLTK is only imported if its tokenizer is selected
+        self.tokenizer = TOKENIZERS[tokenizer]()
+
+        # Modification times at load, used by reload_if_changed
+        self._file_mtimes = self._get_file_mtimes()
+
+        # Hash of the source files, taken before reading them so a compiled
+        # file written from this model can only ever look older than the sources
+        content_hash = self._get_content_hash()
+        snapshot = self._load_compiled(compiled_file, content_hash) if compiled_file is not None else None
+        self.from_compiled = snapshot is not None
+
+        if snapshot is None:
+            # English stop words of the tokenizer
+            self.stop_words = set(self.tokenizer.stop_words)
+
+            # Hinglish shortcut phrases and canned responses, intents and the
+            # pattern index (needs the stop words), compiled once from data
+            intents_data = self._load_intents()
+            snapshot = ModelSnapshot(intents_data, self._build_intent_index(intents_data),
+                                     self._load_response_tables(), content_hash)
+
+        self.snapshot = snapshot
+
+    @property
+    def intents_data(self) -> List[Dict[str, Any]]:
+        """Intents of the current snapshot."""
+        return self.snapshot.intents_data
+
+    @property
+    def intent_index(self) -> IntentIndex:
+        """Compiled pattern index of the current snapshot."""
+        return self.snapshot.intent_index
+
+    @property
+    def response_tables(self) -> ResponseTables:
+        """Response tables of the current snapshot."""
+        return self.snapshot.response_tables
+
+    @property
+    def content_hash(self) -> bytes:
+        """Hash of the source files the current snapshot was compiled from."""
+        return self.snapshot.content_hash
+
+    def _get_content_hash(self) -> bytes:
+        """
+        SHA-256 of everything a compiled model is built from: the matcher and
+        tokenizer names and the raw bytes of the intents and responses files.
+
+        Returns:
+            bytes: 32-byte digest
+        """
+        digest = hashlib.sha256(f"{self.matcher}:{self.tokenizer.name}".encode('utf-8'))
+        for path in (self.intents_file, self.responses_file):
+            try:
+                with open(path, 'rb') as file:
+                    content = file.read()
+                digest.update(struct.pack("<Q", len(content)))
+                digest.update(content)
+            except OSError:
+                # A missing file hashes differently from an empty one
+                digest.update(b"missing")
+        return digest.digest()
+
+    def compile(self, compiled_file: str):
+        """
+        Write the compiled intents, pattern index, response tables and stop
+        words to a versioned binary file that later models can load instead
+        of parsing and tokenizing the JSON files again. The index tables and
+        the phrase automaton are stored as flat arrays, which loading maps
+        into memory and reads in place (see chatbot_compiled).
+
+        Args:
+            compiled_file (str): Path of the compiled model file to write
+        """
+        snapshot = self.snapshot
+        temp_file = compiled_file + ".tmp"
+        write_model(temp_file, snapshot.content_hash, snapshot.intents_data, snapshot.intent_index,
+                    snapshot.response_tables, self.stop_words)
+        os.replace(temp_file, compiled_file)
+
+    def map_compiled(self, compiled_file: str) -> bool:
+        """
+        Compile the current snapshot into compiled_file and switch to reading
+        it in place from there. Processes forked afterwards share the index
+        tables and the phrase automaton as read-only pages of the one file
+        mapping, which their reference counting never writes to. The file can
+        be removed once this returns, the mapping stays valid.
+
+        Args:
+            compiled_file (str): Path of the compiled model file to write and map
+
+        Returns:
+            bool: True if the model now reads from the mapped file
+        """
+        self.compile(compiled_file)
+        snapshot = self._load_compiled(compiled_file, self.snapshot.content_hash)
+        if snapshot is None:
+            return False
+        self.snapshot = snapshot
+        self.from_compiled = True
+        return True
+
+    def _load_compiled(self, compiled_file: str, content_hash: bytes) -> Optional[ModelSnapshot]:
+        """
+        Map a compiled model file and attach to the compiled data in it.
+        Loading only decodes the intents, stop words and response lists, it
+        never runs code from the file. The SHA-256 in its header tells whether
+        it was built from the current JSON files.
+
+        Args:
+            compiled_file (str): Path of the compiled model file
+            content_hash (bytes): Hash of the current source files, the file must have been built from them
+
+        Returns:
+            Optional[ModelSnapshot]: Loaded data, None if the JSON files have to be compiled instead
+        """
+        try:
+            compiled = CompiledFile(compiled_file)
+            if compiled.content_hash != content_hash:
+                print(f"Warning: {compiled_file} is out of date. Compiling from JSON.")
+                return None
+            intents_data, intent_index, response_tables, stop_words = load_model(
+                compiled, self.matcher, self.preprocess_text, self.are_tokens_similar)
+        except FileNotFoundError:
+            print(f"Warning: {compiled_file} not found. Compiling from JSON.")
+            return None
+        except ValueError as e:
+            print(f"Warning: {compiled_file} is not a compatible compiled model ({e}). Compiling from JSON.")
+            return None
+        except Exception as e:
+            print(f"Warning: Error loading {compiled_file} ({e}). Compiling from JSON.")
+            return None
+
+        self.stop_words = stop_words
+        return ModelSnapshot(intents_data, intent_index, response_tables, content_hash)
+
+    def _load_intents(self) -> List[Dict[str, Any]]:
+        """
+        Load intents data from JSON file.
+
+        Returns:
+            List[Dict[str, Any]]: List of intent dictionaries
+        """
+        try:
+            with open(self.intents_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+                return data.get('intents', [])
+        except FileNotFoundError:
+            print(f"Warning: {self.intents_file} not found. Using default intents.")
+            return []
+        except json.JSONDecodeError:
+            print(f"Warning: Error parsing {self.intents_file}. Using default intents.")
+            return []
+
+    def _load_response_tables(self) -> ResponseTables:
+        """
+        Load the Hinglish phrases and canned responses from the JSON file.
+
+        Returns:
+            ResponseTables: Compiled, immutable response tables
+        """
+        try:
+            with open(self.responses_file, 'r', encoding='utf-8') as file:
+                return ResponseTables.from_data(json.load(file))
+        except FileNotFoundError:
+            print(f"Warning: {self.responses_file} not found. Using default responses.")
+        except (json.JSONDecodeError, KeyError, TypeError):
+            print(f"Warning: Error parsing {self.responses_file}. Using default responses.")
+        return ResponseTables.from_data({})
+
+    def _build_intent_index(self, intents_data: List[Dict[str, Any]]):
+        """
+        Compile intents with the configured matching engine.
+
+        Args:
+            intents_data (List[Dict[str, Any]]): List of intent dictionaries
+
+        Returns:
+            IntentIndex: Compiled index used by find_best_match
+        """
+        return MATCHERS[self.matcher](intents_data, self.preprocess_text, self.are_tokens_similar)
+
+    def preprocess_text(self, text: str) -> List[str]:
+        """
+        Preprocess text by tokenizing and removing stop words.
+        Now handles Hinglish (Hindi-English mixed) text better.
+
+        Args:
+            text (str): Input text to preprocess
+
+        Returns:
+            List[str]: List of preprocessed tokens
+        """
+        # Convert to lowercase and tokenize
+        tokens = self.tokenizer.tokenize(text.lower())
+
+        # Keep both English and Hindi tokens, remove only English stop words
+        # Don't filter out Hindi words as they might be important
+        filtered_tokens = []
+        for token in tokens:
+            # Keep tokens that are either:
+            # 1. English words that are not stop words
+            # 2. Hindi words (non-English characters)
+            # 3. Mixed words (containing both English and Hindi)
+            # (mixed words contain non-English characters, so the second check covers them)
+            if (token.isalpha() and token not in self.stop_words) or not token.isascii():
+                filtered_tokens.append(token)
+
+        return filtered_tokens
+
+    def calculate_similarity(self, user_tokens: List[str], pattern_tokens: List[str]) -> float:
+        """
+        Calculate similarity between user input and intent pattern.
+        Now handles Hinglish and mixed language better.
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+            pattern_tokens (List[str]): Preprocessed pattern tokens
+
+        Returns:
+            float: Similarity score (0.0 to 1.0)
+        """
+        if not user_tokens or not pattern_tokens:
+            return 0.0
+
+        # Count exact matches
+        exact_matches = sum(1 for token in user_tokens if token in pattern_tokens)
+
+        # Count partial matches (for Hinglish variations)
+        partial_matches = 0
+        for user_token in user_tokens:
+            for pattern_token in pattern_tokens:
+                # Check if tokens are similar (partial match)
+                if self.are_tokens_similar(user_token, pattern_token):
+                    partial_matches += 1
+                    break
+
+        # Use the better of exact or partial matches
+        best_matches = max(exact_matches, partial_matches)
+
+        # Calculate similarity as matches over total unique tokens
+        total_unique = len(set(user_tokens + pattern_tokens))
+        if total_unique == 0:
+            return 0.0
+
+        return best_matches / total_unique
+
+    def find_best_match(self, user_tokens: List[str],
+                        snapshot: Optional[ModelSnapshot] = None) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the intent whose pattern is most similar to the user tokens.
+
+        Args:
+            user_tokens (List[str]): Preprocessed user input tokens
+            snapshot (Optional[ModelSnapshot]): Data to match against, the current snapshot if None
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], float]: Best matching intent and its score
+        """
+        # Only patterns sharing a token or a similar token with the input are scored
+        return (snapshot or self.snapshot).intent_index.best_match(user_tokens)
+
+    def match_batch(self, user_inputs: Iterable[str],
+                    snapshot: Optional[ModelSnapshot] = None) -> Dict[str, Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        Match many messages against the intent index in one pass.
+        Each distinct message is tokenized once. Empty messages and ones
+        answered by a Hinglish shortcut phrase are left out.
+
+        Args:
+            user_inputs (Iterable[str]): User messages
+            snapshot (Optional[ModelSnapshot]): Data to match against, the current snapshot if None
+
+        Returns:
+            Dict[str, Tuple[Optional[Dict[str, Any]], float]]: Best intent and score per message
+        """
+        snapshot = snapshot or self.snapshot
+
+        # Tokenize every distinct message that needs intent matching
+        tokenized = {}
+        for user_input in user_inputs:
+            if user_input in tokenized or not user_input.strip():
+                continue
+            if self.is_hinglish_input(user_input) and self.handle_hinglish_input(user_input, snapshot):
+                continue
+            tokenized[user_input] = self.preprocess_text(user_input)
+
+        return dict(zip(tokenized, snapshot.intent_index.best_matches(list(tokenized.values()))))
+
+    def are_tokens_similar(self, token1: str, token2: str) -> bool:
+        """
+        Check if two tokens are similar (for Hinglish variations).
+
+        Args:
+            token1 (str): First token
+            token2 (str): Second token
+
+        Returns:
+            bool: True if tokens are similar
+        """
+        # Results are memoized per (token1, token2) pair, see get_similarity_cache_stats
+        return self._similarity_cache(token1, token2)
+
+    def is_hinglish_input(self, text: str) -> bool:
+        """Check if input is primarily Hinglish (Hindi-English mixed)."""
+        # Count Hindi and English characters
+        hindi_chars = sum(1 for char in text if ord(char) > 127)
+        english_chars = sum(1 for char in text if ord(char) <= 127 and char.isalpha())
+
+        # If there are both Hindi and English characters, it's likely Hinglish
+        return hindi_chars > 0 and english_chars > 0
+
+    def handle_hinglish_input(self, text: str, snapshot: Optional[ModelSnapshot] = None) -> str:
+        """Handle Hinglish input with better understanding (shortcut phrases of snapshot, or the current one)."""
+        text_lower = text.lower()
+
+        # Check for Hinglish patterns in a single pass over the input
+        return (snapshot or self.snapshot).response_tables.hinglish_matcher.find(text_lower)
+
+    @property
+    def fallback_responses(self) -> Tuple[str, ...]:
+        """Fallback responses used when no intent matches (current snapshot)."""
+        return self.snapshot.response_tables.fallback_responses
+
+    def get_similarity_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics of the token similarity cache.
+
+        Returns:
+            Dict[str, Any]: Cache hits, misses, current size and maximum size
+        """
+        info = self._similarity_cache.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize
+        }
+
+    def reload_intents(self, incremental: bool = False) -> bool:
+        """
+        Reload intents and the response tables from their JSON files.
+        Everything is compiled into a new ModelSnapshot first and swapped in
+        with one assignment, so concurrent get_response calls (which read the
+        snapshot once) see either the old or the new data, never a mix.
+
+        Args:
+            incremental (bool): Only recompile intents added, changed or removed
+                since the last load (compared by tag and content hash), and only
+                reload the response tables if their file was modified
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            snapshot = self.snapshot
+            file_mtimes = self._get_file_mtimes()
+            content_hash = self._get_content_hash()
+            intents_data = self._load_intents()
+
+            if incremental:
+                intent_index = snapshot.intent_index.updated(intents_data)
+            else:
+                intent_index = self._build_intent_index(intents_data)
+
+            if incremental and file_mtimes[1] == self._file_mtimes[1]:
+                response_tables = snapshot.response_tables
+            else:
+                response_tables = self._load_response_tables()
+
+            self.snapshot = ModelSnapshot(intents_data, intent_index, response_tables, content_hash)
+            self._file_mtimes = file_mtimes
+            return True
+        except Exception as e:
+            print(f"Error reloading intents: {e}")
+            return False
+
+    def reload_if_changed(self) -> bool:
+        """
+        Incrementally reload if intents.json or responses.json was modified.
+        Cheap enough to call before every message or from a timer.
+
+        Returns:
+            bool: True if the files changed and were reloaded successfully
+        """
+        if self._get_file_mtimes() == self._file_mtimes:
+            return False
+        return self.reload_intents(incremental=True)
+
+    def _get_file_mtimes(self) -> Tuple[Optional[int], Optional[int]]:
+        """Modification times of the intents and responses files (None if missing)."""
+        mtimes = []
+        for path in (self.intents_file, self.responses_file):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+
+def main():
+    """Compile the intents and responses files from the command line."""
+    parser = argparse.ArgumentParser(description="Compile the AI ChatBot model for fast startup")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subcommands.add_parser("compile", help="Write a compiled model file")
+    compile_parser.add_argument("--intents", default="intents.json", help="Intents JSON file")
+    compile_parser.add_argument("--responses", default="responses.json", help="Responses JSON file")
+    compile_parser.add_argument("--matcher", default="overlap", help="Matching engine, overlap or tfidf")
+    compile_parser.add_argument("--tokenizer", default="regex", help="Tokenizer, regex or nltk")
+    compile_parser.add_argument("--output", default="chatbot_model.bin", help="Compiled model file to write")
+    args = parser.parse_args()
+
+    model = ChatbotModel(args.intents, args.matcher, responses_file=args.responses, tokenizer=args.tokenizer)
+    model.compile(args.output)
+    print(f"✅ Compiled {len(model.intents_data)} intents ({len(model.intent_index)} patterns) "
+          f"into {args.output}")
+
+if __name__ == "__main__":
+    main()
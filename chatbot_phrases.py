@@ -0,0 +1,140 @@
+from collections import deque
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Tuple
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a list of phrases.
+    Finds which phrases occur in a text in a single pass, however many
+    phrases there are. Phrases keep their list order as priority, so the
+    result is the same as checking `phrase in text` for each phrase in order
+    and taking the first hit.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, Any]]):
+        """
+        Build the automaton.
+
+        Args:
+            phrases (Iterable[Tuple[str, Any]]): (phrase, value) pairs, highest priority first
+        """
+        self.values: List[Any] = []
+        # State 0 is the root; goto[state] maps a character to the next state
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Best (lowest) phrase priority ending at each state, through fail links too
+        self.output: List[Optional[int]] = [None]
+
+        for phrase, value in phrases:
+            if not phrase:
+                continue
+            self._add_phrase(phrase, len(self.values))
+            self.values.append(value)
+
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _add_phrase(self, phrase: str, priority: int):
+        """Insert a phrase into the trie."""
+        state = 0
+        for char in phrase:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+            state = next_state
+
+        # A duplicate phrase keeps the priority of its first occurrence
+        if self.output[state] is None:
+            self.output[state] = priority
+
+    def _build_fail_links(self):
+        """Compute fail links breadth first and merge outputs along them."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+
+                inherited = self.output[self.fail[next_state]]
+                if inherited is not None and (self.output[next_state] is None or inherited < self.output[next_state]):
+                    self.output[next_state] = inherited
+
+    def find(self, text: str) -> Optional[Any]:
+        """
+        Find the value of the highest priority phrase contained in the text.
+
+        Args:
+            text (str): Text to search
+
+        Returns:
+            Optional[Any]: Value of the matched phrase, or None if no phrase occurs
+        """
+        best = None
+        state = 0
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            priority = output[state]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+                if best == 0:
+                    break
+
+        return self.values[best] if best is not None else None
+
+
+# Used when responses.json is missing or leaves a list empty
+DEFAULT_FALLBACK_RESPONSE = "Sorry, I didn't understand that. Could you say it another way?"
+DEFAULT_WELCOME_MESSAGE = "Hello! How can I help you today?"
+
+
+class ResponseTables(NamedTuple):
+    """
+    Immutable response data loaded from responses.json.
+    ChatbotLogic swaps the whole object on reload, so a request never sees
+    a mix of old and new tables or a half-built automaton.
+    """
+
+    hinglish_matcher: PhraseMatcher
+    fallback_responses: Tuple[str, ...]
+    welcome_messages: Tuple[str, ...]
+    motivational_responses: Tuple[str, ...]
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "ResponseTables":
+        """
+        Compile the tables from parsed responses.json data.
+
+        Args:
+            data (Dict[str, Any]): Parsed JSON with the phrase and response lists
+
+        Returns:
+            ResponseTables: Compiled tables
+        """
+        phrases = [(entry['phrase'], entry['response']) for entry in data.get('hinglish_phrases', [])]
+        return cls(
+            hinglish_matcher=PhraseMatcher(phrases),
+            # random.choice needs at least one fallback and welcome message
+            fallback_responses=tuple(data.get('fallback_responses', [])) or (DEFAULT_FALLBACK_RESPONSE,),
+            welcome_messages=tuple(data.get('welcome_messages', [])) or (DEFAULT_WELCOME_MESSAGE,),
+            motivational_responses=tuple(data.get('motivational_responses', []))
+        )
+
@@ -0,0 +1,845 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP and WebSocket server for the AI ChatBot.
+Serves every user from one shared compiled model through a SessionManager.
+Chat requests arriving within a short window are scored against the intent
+index as one batch. With --workers N the server pre-forks N processes
+that split the sessions between them and share the compiled index tables
+through one read-only file mapping, each one also listening on its own
+port so session-aware clients can skip the hop to the owning worker.
+Only the standard library is used.
+
+Endpoints (localhost by default):
+    POST /chat      {"session": "...", "message": "..."}
+    POST /feedback  {"session": "...", "message": "...", "feedback": "positive"}
+    GET  /stats     Session and batching statistics (and worker_ports with --workers)
+    GET  /metrics   Response stage timings and counters (with --metrics), ?format=prometheus for Prometheus text;
+                    summed over every worker with --workers
+    GET  /ws        WebSocket, JSON messages with a "type" of chat, feedback, stats or metrics
+"""
+
+import argparse
+import asyncio
+import base64
+import gc
+import hashlib
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from chatbot_metrics import ChatbotMetrics
+from chatbot_model import ChatbotModel
+from chatbot_session import SessionManager
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY_SIZE = 1024 * 1024
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                500: "Internal Server Error", 502: "Bad Gateway"}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent chat requests into batches.
+    The first request of a batch starts a short timer, everything submitted
+    before it fires (or until max_batch requests) is matched with a single
+    ChatbotModel.match_batch call. Batches run one at a time on a worker
+    thread, so the event loop keeps accepting requests meanwhile and a
+    session's messages are answered in the order they arrived.
+    """
+
+    def __init__(self, sessions: SessionManager, window: float = 0.002, max_batch: int = 64):
+        """
+        Initialize the batcher.
+
+        Args:
+            sessions (SessionManager): Sessions sharing the model that scores the batches
+            window (float): Seconds to wait for more requests after the first one
+            max_batch (int): Batch size that is scored without waiting for the window
+        """
+        self.sessions = sessions
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_requests = 0
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Matching holds the GIL, more than one worker would not score faster
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chatbot-batch")
+
+    async def submit(self, session_id: str, message: str) -> Dict[str, Any]:
+        """
+        Queue a chat message for the next batch.
+
+        Args:
+            session_id (str): User or connection identifier
+            message (str): User's message
+
+        Returns:
+            Dict[str, Any]: Response text with the matched intent tag and score
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((session_id, message, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    async def run(self, function: Callable, *args) -> Any:
+        """Run another session operation on the batch thread, in order with the batches."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _flush(self):
+        """Hand the pending requests to the worker thread as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+        requests = [(session_id, message) for session_id, message, _ in batch]
+        scoring = asyncio.get_running_loop().run_in_executor(self._executor, self._score, requests)
+        scoring.add_done_callback(lambda done: self._deliver(batch, done))
+
+    def _score(self, requests: List[Tuple[str, str]]) -> List[Any]:
+        """Match the whole batch at once, then respond for each session in order."""
+        metrics = self.sessions.metrics
+        if metrics is not None:
+            started = time.perf_counter()
+        # Every response of the batch comes from the model data it was matched with
+        snapshot = self.sessions.model.snapshot
+        matches = self.sessions.model.match_batch([message for _, message in requests], snapshot)
+        if metrics is not None:
+            metrics.record("batch_matching", started)
+        results = []
+        for session_id, message in requests:
+            try:
+                with self.sessions.lease(session_id) as session:
+                    results.append(session.respond(message, match=matches.get(message), snapshot=snapshot))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _deliver(batch: List[Tuple[str, str, asyncio.Future]], done: asyncio.Future):
+        """Resolve the futures of a scored batch."""
+        error = done.exception()
+        results = [error] * len(batch) if error else done.result()
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+
+        Returns:
+            Dict[str, Any]: Number of batches, requests in them and the average batch size
+        """
+        return {
+            "batches": self.batches,
+            "batched_requests": self.batched_requests,
+            "average_batch": self.batched_requests / self.batches if self.batches else 0.0
+        }
+
+    def close(self):
+        """Wait for the running batch and stop the worker thread."""
+        self._executor.shutdown(wait=True)
+
+
+def websocket_accept_key(key: str) -> str:
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key."""
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def encode_frame(payload: bytes, opcode: int = 0x1, mask: bool = False) -> bytes:
+    """
+    Build a single, unfragmented WebSocket frame.
+
+    Args:
+        payload (bytes): Frame payload
+        opcode (int): 0x1 text, 0x8 close, 0x9 ping, 0xA pong
+        mask (bool): Mask the payload, required for frames sent by clients
+
+    Returns:
+        bytes: Encoded frame
+    """
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(byte ^ key[i % 4] for i, byte in enumerate(payload))
+        header += key
+    return bytes(header) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """
+    Read one WebSocket frame.
+
+    Args:
+        reader (asyncio.StreamReader): Connection to read from
+
+    Returns:
+        Tuple[int, bytes]: Opcode and unmasked payload
+    """
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > MAX_BODY_SIZE:
+        raise ValueError("WebSocket frame too large")
+
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = bytes(byte ^ key[i % 4] for i, byte in enumerate(payload))
+    return opcode, payload
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 keep-alive client for JSON requests."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload: Dict[str, Any] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Send a request and read the JSON response.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and parsed body
+        """
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.writer.write((f"{method} {path} HTTP/1.1\r\n"
+                           f"Host: {self.host}:{self.port}\r\n"
+                           "Content-Type: application/json\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def session_shard(session_id: str, shards: int) -> int:
+    """
+    Shard (worker index) that owns a session, a stable hash of its id.
+    Clients can use it with the worker_ports from /stats to send each
+    session's requests straight to its owner.
+    """
+    return zlib.crc32(session_id.encode('utf-8')) % shards
+
+
+class ShardRouter:
+    """
+    Assigns sessions to worker processes and forwards requests between them.
+    A session always belongs to the same worker (see session_shard), so its
+    learning data lives in exactly one process. Requests that reach another
+    worker on the shared port are passed on over that worker's own port,
+    which costs an extra local round trip; clients that connect to the
+    owner's port directly never need it.
+    """
+
+    def __init__(self, index: int, ports: List[int], host: str = "127.0.0.1"):
+        """
+        Initialize the router.
+
+        Args:
+            index (int): Shard handled by this process
+            ports (List[int]): Internal port of every shard, by shard index
+            host (str): Interface the internal ports listen on
+        """
+        self.index = index
+        self.ports = ports
+        self.host = host
+        self.forwarded = 0
+        # Idle keep-alive connections to the other shards
+        self._idle: Dict[int, List[HttpClient]] = {shard: [] for shard in range(len(ports))}
+
+    def owner(self, session_id: str) -> int:
+        """Shard that owns a session."""
+        return session_shard(session_id, len(self.ports))
+
+    async def forward(self, shard: int, path: str, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Send a request to the shard that owns its session.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON payload from the owner
+        """
+        self.forwarded += 1
+        return await self.request(shard, "POST", path, data)
+
+    async def request(self, shard: int, method: str, path: str,
+                      data: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Send a request to another shard over a kept-alive connection.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON payload, 502 if the shard is unavailable
+        """
+        idle = self._idle[shard]
+        client = idle.pop() if idle else None
+        try:
+            if client is None:
+                client = HttpClient(self.host, self.ports[shard])
+                await client.connect()
+            result = await client.request(method, path, data)
+        except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+            print(f"Warning: Shard {shard} unavailable: {e}")
+            if client is not None:
+                await client.close()
+            return 502, {"error": f"Shard {shard} unavailable"}
+        idle.append(client)
+        return result
+
+    async def close(self):
+        """Close the connections to the other shards."""
+        for clients in self._idle.values():
+            for client in clients:
+                await client.close()
+            clients.clear()
+
+
+class ChatbotServer:
+    """
+    Asyncio HTTP/1.1 (keep-alive) and WebSocket front-end.
+    Chat messages go through the MicroBatcher, feedback and stats run on the
+    same worker thread so they stay in order with the responses.
+    """
+
+    def __init__(self, sessions: SessionManager, host: str = "127.0.0.1", port: int = 8765,
+                 batch_window: float = 0.002, max_batch: int = 64, router: Optional[ShardRouter] = None):
+        """
+        Initialize the server.
+
+        Args:
+            sessions (SessionManager): Sessions sharing one compiled model
+            host (str): Interface to listen on, localhost by default
+            port (int): Port to listen on, 0 picks a free one
+            batch_window (float): Seconds the batcher waits for more requests
+            max_batch (int): Maximum number of requests per batch
+            router (Optional[ShardRouter]): Session sharding between worker processes
+        """
+        self.sessions = sessions
+        self.host = host
+        self.port = port
+        self.router = router
+        self.batcher = MicroBatcher(sessions, batch_window, max_batch)
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(self, sockets: Optional[List[socket.socket]] = None):
+        """
+        Start listening. With port 0 the chosen port is stored in self.port.
+
+        Args:
+            sockets (Optional[List[socket.socket]]): Already bound sockets to serve
+                (used by pre-forked workers) instead of binding host and port
+        """
+        if sockets:
+            for sock in sockets:
+                self._servers.append(await asyncio.start_server(self._handle_connection, sock=sock))
+        else:
+            self._servers.append(await asyncio.start_server(self._handle_connection, self.host, self.port))
+        self.port = self._servers[0].sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start the server if needed and serve until cancelled."""
+        if not self._servers:
+            await self.start()
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def stop(self):
+        """Stop accepting connections and write all sessions to disk."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self.router is not None:
+            await self.router.close()
+        await self.batcher.run(self.sessions.close)
+        self.batcher.close()
+
+    async def dispatch(self, action: str, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a chat, feedback, stats or metrics request from either protocol.
+
+        Args:
+            action (str): "chat", "feedback", "stats" or "metrics"
+            data (Dict[str, Any]): Request fields
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON payload
+        """
+        if action == "stats":
+            stats = await self.batcher.run(self.sessions.get_stats)
+            stats.update(self.batcher.get_stats())
+            if self.router is not None:
+                stats.update({"worker": self.router.index, "forwarded": self.router.forwarded,
+                              "worker_ports": self.router.ports})
+            return 200, stats
+
+        if action == "metrics":
+            if self.sessions.metrics is None:
+                return 404, {"error": "Metrics are disabled, start the server with --metrics"}
+            return 200, (await self.gather_metrics()).snapshot()
+
+        session_id = data.get("session")
+        message = data.get("message")
+        if not isinstance(session_id, str) or not isinstance(message, str):
+            return 400, {"error": "'session' and 'message' must be strings"}
+
+        # Another worker process owns this session's learning data
+        if self.router is not None and action in ("chat", "feedback"):
+            owner = self.router.owner(session_id)
+            if owner != self.router.index:
+                return await self.router.forward(owner, "/" + action, data)
+
+        if action == "chat":
+            return 200, await self.batcher.submit(session_id, message)
+
+        if action == "feedback":
+            feedback = data.get("feedback")
+            if not isinstance(feedback, str):
+                return 400, {"error": "'feedback' must be a string"}
+            await self.batcher.run(self.sessions.provide_feedback, session_id, message, feedback)
+            return 200, {"ok": True}
+
+        return 404, {"error": f"Unknown request type '{action}'"}
+
+    async def gather_metrics(self) -> ChatbotMetrics:
+        """
+        Metrics of this server, summed with those of every other worker when pre-forked,
+        so every worker reports the same totals. A worker that is unavailable (or was
+        restarted, starting from zero) makes the totals drop until it is back.
+        """
+        if self.router is None:
+            return self.sessions.metrics
+        merged = ChatbotMetrics()
+        merged.merge(self.sessions.metrics.export())
+        for shard in range(len(self.router.ports)):
+            if shard != self.router.index:
+                status, exported = await self.router.request(shard, "GET", "/metrics?scope=worker")
+                if status == 200:
+                    merged.merge(exported)
+        return merged
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP requests on a connection until it closes or upgrades to WebSocket."""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._handle_websocket(reader, writer, headers)
+                    break
+
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except Exception as e:
+            print(f"Warning: Server connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Read one HTTP request, None when the client closed the connection."""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        method, path, _ = request_line.decode('latin-1').split(" ", 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_SIZE:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Map an HTTP request to a dispatch action (Prometheus metrics are returned as text)."""
+        routes = {("POST", "/chat"): "chat", ("POST", "/feedback"): "feedback", ("GET", "/stats"): "stats",
+                  ("GET", "/metrics"): "metrics"}
+        path, _, query = path.partition("?")
+        action = routes.get((method, path))
+        if action is None:
+            return 404, {"error": f"No route for {method} {path}"}
+
+        if action == "metrics" and self.sessions.metrics is not None:
+            parameters = query.split("&")
+            # Raw metrics of this worker alone, gathered by the other workers
+            if "scope=worker" in parameters:
+                return 200, self.sessions.metrics.export()
+            if "format=prometheus" in parameters:
+                return 200, (await self.gather_metrics()).to_prometheus()
+
+        try:
+            data = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return 400, {"error": "Request body must be JSON"}
+        if not isinstance(data, dict):
+            return 400, {"error": "Request body must be a JSON object"}
+
+        try:
+            return await self.dispatch(action, data)
+        except Exception as e:
+            print(f"Warning: Request failed: {e}")
+            return 500, {"error": "Internal server error"}
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+        """Write a JSON HTTP response, or a plain text one if the payload is a string."""
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = "application/json; charset=utf-8"
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+    async def _handle_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                headers: Dict[str, str]):
+        """Complete the WebSocket handshake and answer JSON messages one by one."""
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self._write_response(writer, 400, {"error": "Missing Sec-WebSocket-Key"}, False)
+            return
+
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {websocket_accept_key(key)}\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == 0x8:
+                writer.write(encode_frame(payload[:2], 0x8))
+                await writer.drain()
+                return
+            if opcode == 0x9:
+                writer.write(encode_frame(payload, 0xA))
+                await writer.drain()
+                continue
+            if opcode != 0x1:
+                continue
+
+            try:
+                data = json.loads(payload)
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                reply = {"type": "error", "status": 400, "error": "Messages must be JSON objects"}
+            else:
+                action = data.get("type", "chat")
+                try:
+                    status, reply = await self.dispatch(action, data)
+                except Exception as e:
+                    print(f"Warning: Request failed: {e}")
+                    status, reply = 500, {"error": "Internal server error"}
+                # Echo the type and optional id so clients can match replies to requests
+                reply = dict(reply, type=action, status=status)
+                if "id" in data:
+                    reply["id"] = data["id"]
+
+            writer.write(encode_frame(json.dumps(reply, ensure_ascii=False).encode('utf-8')))
+            await writer.drain()
+
+
+def run_server(server: ChatbotServer, sockets: Optional[List[socket.socket]] = None):
+    """
+    Run a server on a new event loop until Ctrl+C or SIGTERM.
+
+    Args:
+        server (ChatbotServer): Server to run
+        sockets (Optional[List[socket.socket]]): Already bound sockets, see ChatbotServer.start
+    """
+    async def serve():
+        # Stop cleanly on Ctrl+C or SIGTERM, so sessions are written to disk
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, asyncio.current_task().cancel)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+
+        await server.start(sockets)
+        if server.router is None:
+            print(f"🤖 AI ChatBot server listening on http://{server.host}:{server.port} (WebSocket: /ws)")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+def listen_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening TCP socket (port 0 picks a free one)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    return sock
+
+
+class PreforkServer:
+    """
+    Serves from several worker processes.
+    The parent compiles the model and binds the sockets, then forks the
+    workers, so intents.json is parsed and compiled once rather than once
+    per worker. Unless it was loaded from a compiled file already, the
+    model is written to a temporary compiled file and mapped from there
+    before forking (ChatbotModel.map_compiled). Its pattern index, token
+    lookup tables and phrase automaton are then flat arrays in one read-only
+    file mapping that every worker attaches to without copying: matching
+    reads them in place, and no reference count lives in those pages. Only
+    the decoded intents and response lists stay Python objects, which
+    inherited pages copy as workers touch them; gc.freeze() keeps the
+    collector's own passes from adding to that.
+
+    Sessions are sharded by id with ShardRouter. Every worker listens on its
+    own port (worker_port + index), where clients that know the session
+    routing (session_shard and /stats worker_ports, or load_test.py
+    --affine) reach the owner directly. All workers also accept on the
+    shared port, where a request for another worker's session is forwarded
+    to its owner, an extra hop for about (N-1)/N of such requests.
+    Workers that die are restarted.
+    """
+
+    def __init__(self, model: ChatbotModel, workers: int, host: str = "127.0.0.1", port: int = 8765,
+                 session_dir: str = "sessions", batch_window: float = 0.002, max_batch: int = 64,
+                 metrics: bool = False, worker_port: Optional[int] = None, map_model: bool = True):
+        """
+        Initialize the pre-fork server.
+
+        Args:
+            model (ChatbotModel): Compiled model shared by every worker
+            workers (int): Number of worker processes
+            host (str): Interface to listen on, localhost by default
+            port (int): Port to listen on
+            session_dir (str): Directory for the per-session learning files
+            batch_window (float): Seconds each worker's batcher waits for more requests
+            max_batch (int): Maximum number of requests per batch
+            metrics (bool): Collect response metrics in every worker (/metrics sums them over the workers)
+            worker_port (Optional[int]): Port of worker 0, worker i listens on worker_port + i;
+                None picks free ports (listed in /stats as worker_ports)
+            map_model (bool): Map the model from a temporary compiled file before forking,
+                so the workers share its index tables instead of each copying the pages they use
+        """
+        self.model = model
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.session_dir = session_dir
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.metrics = metrics
+        self.worker_port = worker_port
+        self.map_model = map_model
+        self._children: Dict[int, int] = {}
+        self._stopping = False
+
+    def serve(self):
+        """Fork the workers and supervise them until Ctrl+C or SIGTERM."""
+        public_socket = listen_socket(self.host, self.port)
+        worker_sockets = [listen_socket(self.host, 0 if self.worker_port is None else self.worker_port + index)
+                          for index in range(self.workers)]
+        ports = [sock.getsockname()[1] for sock in worker_sockets]
+
+        if self.map_model and not self.model.from_compiled:
+            self._map_model()
+
+        # Move everything allocated so far out of the collector's generations,
+        # so its passes do not write to the pages inherited by the workers
+        gc.collect()
+        gc.freeze()
+
+        for index in range(self.workers):
+            self._spawn(index, public_socket, worker_sockets, ports)
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        print(f"🤖 AI ChatBot server listening on http://{self.host}:{public_socket.getsockname()[1]} "
+              f"with {self.workers} workers on ports {', '.join(map(str, ports))} (WebSocket: /ws)")
+
+        while self._children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is not None and not self._stopping:
+                print(f"Warning: Worker {index} exited, restarting it")
+                self._spawn(index, public_socket, worker_sockets, ports)
+
+    def _map_model(self):
+        """
+        Move the model into a compiled file mapping that the workers share.
+        The file is removed right away: the parent's mapping keeps it alive
+        for every worker forked from it, restarted ones included.
+        """
+        fd, compiled_file = tempfile.mkstemp(prefix="chatbot_model_", suffix=".bin")
+        os.close(fd)
+        try:
+            if not self.model.map_compiled(compiled_file):
+                print("Warning: Could not map the model, every worker copies the parts of it that it uses")
+        except OSError as e:
+            print(f"Warning: Could not write the shared model file ({e}), "
+                  f"every worker copies the parts of it that it uses")
+        finally:
+            for path in (compiled_file, compiled_file + ".tmp"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _stop(self, signal_number, frame):
+        """Ask every worker to write its sessions and exit."""
+        self._stopping = True
+        for pid in self._children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, index: int, public_socket: socket.socket, worker_sockets: List[socket.socket],
+               ports: List[int]):
+        """Fork worker number index."""
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+
+        # Worker process: serve until stopped, never return into the parent's code
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            for other, sock in enumerate(worker_sockets):
+                if other != index:
+                    sock.close()
+
+            sessions = SessionManager(self.model, session_dir=self.session_dir,
+                                      metrics=ChatbotMetrics() if self.metrics else None)
+            # Forwarded requests reach the other workers over loopback when listening on every interface
+            router_host = "127.0.0.1" if self.host in ("", "0.0.0.0") else self.host
+            server = ChatbotServer(sessions, self.host, self.port, self.batch_window, self.max_batch,
+                                   router=ShardRouter(index, ports, router_host))
+            run_server(server, [public_socket, worker_sockets[index]])
+        except Exception as e:
+            print(f"Error in worker {index}: {e}")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+
+def main():
+    """Run the server from the command line."""
+    parser = argparse.ArgumentParser(description="Serve the AI ChatBot over HTTP and WebSocket")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: localhost)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--intents", default="intents.json", help="Intents JSON file")
+    parser.add_argument("--responses", default="responses.json", help="Responses JSON file")
+    parser.add_argument("--matcher", default="overlap", help="Matching engine, overlap or tfidf")
+    parser.add_argument("--tokenizer", default="regex", help="Tokenizer, regex or nltk")
+    parser.add_argument("--compiled", help="Compiled model file from 'python chatbot_model.py compile'")
+    parser.add_argument("--session-dir", default="sessions", help="Directory for per-session learning data")
+    parser.add_argument("--batch-window", type=float, default=2.0, help="Batching window in milliseconds")
+    parser.add_argument("--max-batch", type=int, default=64, help="Maximum requests per batch")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (pre-fork, POSIX only)")
+    parser.add_argument("--worker-port", type=int,
+                        help="Port of worker 0 with --workers, worker i listens on this + i (default: free ports)")
+    parser.add_argument("--metrics", action="store_true", help="Time response stages, served at /metrics")
+    args = parser.parse_args()
+
+    model = ChatbotModel(args.intents, args.matcher, responses_file=args.responses, compiled_file=args.compiled,
+                         tokenizer=args.tokenizer)
+
+    if args.workers > 1 and hasattr(os, "fork"):
+        PreforkServer(model, args.workers, args.host, args.port, args.session_dir,
+                      args.batch_window / 1000, args.max_batch, args.metrics, args.worker_port).serve()
+    else:
+        if args.workers > 1:
+            print("Warning: Multiple workers need os.fork(), serving from a single process")
+        sessions = SessionManager(model, session_dir=args.session_dir,
+                                  metrics=ChatbotMetrics() if args.metrics else None)
+        run_server(ChatbotServer(sessions, args.host, args.port, args.batch_window / 1000, args.max_batch))
+    print("\n👋 Server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from chatbot_logic import ChatbotLogic
+from chatbot_metrics import ChatbotMetrics
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore, DeferredLearningWriter
+
+
+class SessionManager:
+    """
+    Serves many users from one shared ChatbotModel.
+    Each session is a ChatbotLogic holding only that user's history,
+    preferences and feedback. Sessions are created on first use, evicted
+    least recently used first when there are too many or when they have been
+    idle too long, and written to disk lazily: when evicted, flushed or closed.
+    A session leased for a call is never evicted, and ending or closing it
+    waits until the call is done. A session id is not opened again until the
+    session's previous instance has been written, so no update is lost.
+    """
+
+    def __init__(self, model: ChatbotModel, session_dir: str = "sessions", max_sessions: int = 1000,
+                 idle_timeout: float = 1800.0, history_capacity: int = 100,
+                 clock: Callable[[], float] = time.monotonic, metrics: Optional[ChatbotMetrics] = None):
+        """
+        Initialize the session manager.
+
+        Args:
+            model (ChatbotModel): Compiled model shared by every session
+            session_dir (str): Directory for the per-session learning files
+            max_sessions (int): Maximum number of sessions kept in memory
+            idle_timeout (float): Seconds without a message before a session is evicted
+            history_capacity (int): Number of recent conversations kept per session
+            clock (Callable[[], float]): Time source in seconds, for tests
+            metrics (Optional[ChatbotMetrics]): Response metrics shared by every session, None to disable
+        """
+        self.model = model
+        self.session_dir = session_dir
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.history_capacity = history_capacity
+        self.clock = clock
+        self.metrics = metrics
+        self.evictions = 0
+        # session id -> (session, last used), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[ChatbotLogic, float]]" = OrderedDict()
+        # Number of calls using each session, and sessions to close once their last call is done
+        self._leases: Dict[ChatbotLogic, int] = {}
+        self._close_on_release: Dict[str, ChatbotLogic] = {}
+        # Ids of sessions dropped from memory and being written to disk
+        self._closing = set()
+        self._lock = threading.Lock()
+        self._closed = threading.Condition(self._lock)
+        os.makedirs(session_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def session_file(self, session_id: str) -> str:
+        """Learning file of a session (ids are hashed, so any string is a safe id)."""
+        name = hashlib.sha1(session_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.session_dir, f"{name}.json")
+
+    def get_session(self, session_id: str) -> ChatbotLogic:
+        """
+        Get a session, loading it from disk or creating it if needed.
+        The session may be evicted by another thread as soon as it is
+        returned, use lease() to call it while other threads are busy.
+
+        Args:
+            session_id (str): User or connection identifier
+
+        Returns:
+            ChatbotLogic: The session's chatbot, sharing the manager's model
+        """
+        return self._acquire(session_id, lease=False)
+
+    @contextmanager
+    def lease(self, session_id: str) -> Iterator[ChatbotLogic]:
+        """
+        Use a session for the duration of a with block.
+        It is not evicted before the block ends, however many other
+        sessions are opened meanwhile.
+
+        Args:
+            session_id (str): User or connection identifier
+
+        Yields:
+            ChatbotLogic: The session's chatbot, sharing the manager's model
+        """
+        session = self._acquire(session_id, lease=True)
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    def _acquire(self, session_id: str, lease: bool) -> ChatbotLogic:
+        """Look up or create a session and mark it used, leased if lease is set."""
+        now = self.clock()
+        with self._lock:
+            # A session being written is read back from disk once it is written.
+            # Waiting comes first, so this thread holds no unwritten session meanwhile.
+            self._closed.wait_for(lambda: session_id not in self._closing)
+            evicted = self._evict_idle(now, keep=session_id)
+            # A session ended while in use is still open, take it back
+            if session_id in self._close_on_release:
+                self._sessions[session_id] = (self._close_on_release.pop(session_id), now)
+            if session_id in self._sessions:
+                session = self._sessions[session_id][0]
+                self._sessions[session_id] = (session, now)
+                self._sessions.move_to_end(session_id)
+            else:
+                store = DeferredLearningWriter(JournalLearningStore(self.session_file(session_id),
+                                                                    history_limit=self.history_capacity))
+                session = ChatbotLogic(model=self.model, learning_store=store,
+                                       history_capacity=self.history_capacity, metrics=self.metrics)
+                self._sessions[session_id] = (session, now)
+            if lease:
+                self._leases[session] = self._leases.get(session, 0) + 1
+            evicted += self._evict_overflow(keep=session_id)
+
+        # Evicted sessions are written outside the lock
+        self._close_sessions(evicted)
+        self.evictions += len(evicted)
+        return session
+
+    def _release(self, session: ChatbotLogic):
+        """End a lease, closing the session if it was ended while in use."""
+        with self._lock:
+            leases = self._leases.pop(session) - 1
+            if leases:
+                self._leases[session] = leases
+                return
+            ended = [session_id for session_id, ended_session in self._close_on_release.items()
+                     if ended_session is session]
+            if not ended:
+                return
+            del self._close_on_release[ended[0]]
+            self._closing.add(ended[0])
+        self._close_sessions([(ended[0], session)])
+
+    def get_response(self, session_id: str, user_input: str) -> str:
+        """
+        Get the chatbot response for a user.
+
+        Args:
+            session_id (str): User or connection identifier
+            user_input (str): User's message
+
+        Returns:
+            str: Chatbot's response
+        """
+        with self.lease(session_id) as session:
+            return session.get_response(user_input)
+
+    def provide_feedback(self, session_id: str, user_input: str, feedback: str):
+        """Record a user's feedback on a response."""
+        with self.lease(session_id) as session:
+            session.provide_feedback(user_input, feedback)
+
+    def end_session(self, session_id: str) -> bool:
+        """
+        Write a session to disk and drop it from memory.
+
+        Returns:
+            bool: True if the session was open
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                return False
+            if entry[0] in self._leases:
+                self._close_on_release[session_id] = entry[0]
+                return True
+            self._closing.add(session_id)
+        self._close_sessions([(session_id, entry[0])])
+        return True
+
+    def evict_idle(self) -> int:
+        """
+        Evict every session idle for longer than idle_timeout.
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        with self._lock:
+            evicted = self._evict_idle(self.clock())
+        self._close_sessions(evicted)
+        self.evictions += len(evicted)
+        return len(evicted)
+
+    def _evict_idle(self, now: float, keep: Optional[str] = None) -> List[Tuple[str, ChatbotLogic]]:
+        """Pop idle sessions not in use, except keep, from the front of the LRU order (lock held by the caller)."""
+        evicted = []
+        for session_id, (session, last_used) in list(self._sessions.items()):
+            if now - last_used <= self.idle_timeout:
+                break
+            if session not in self._leases and session_id != keep:
+                evicted.append(self._drop(session_id))
+        return evicted
+
+    def _evict_overflow(self, keep: Optional[str] = None) -> List[Tuple[str, ChatbotLogic]]:
+        """Pop least recently used sessions not in use, except keep, beyond max_sessions (lock held by the caller)."""
+        evicted = []
+        for session_id, (session, _) in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if session not in self._leases and session_id != keep:
+                evicted.append(self._drop(session_id))
+        return evicted
+
+    def _drop(self, session_id: str) -> Tuple[str, ChatbotLogic]:
+        """Remove a session from memory and mark it as being written (lock held by the caller)."""
+        self._closing.add(session_id)
+        return session_id, self._sessions.pop(session_id)[0]
+
+    def _close_sessions(self, sessions: List[Tuple[str, ChatbotLogic]]):
+        """Write dropped sessions to disk, then let their ids be opened again."""
+        for session_id, session in sessions:
+            try:
+                session.close()
+            finally:
+                with self._lock:
+                    self._closing.discard(session_id)
+                    self._closed.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get session counts.
+
+        Returns:
+            Dict[str, Any]: Open sessions, evictions so far and the limits
+        """
+        return {
+            "sessions": len(self._sessions),
+            "evictions": self.evictions,
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout
+        }
+
+    def flush(self):
+        """Write every open session's pending learning data to disk."""
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+        for session in sessions:
+            session.learning_store.flush()
+
+    def close(self):
+        """Write and drop every session, sessions in use are closed when their calls are done."""
+        with self._lock:
+            sessions = []
+            for session_id, (session, _) in list(self._sessions.items()):
+                if session in self._leases:
+                    self._close_on_release[session_id] = self._sessions.pop(session_id)[0]
+                else:
+                    sessions.append(self._drop(session_id))
+        self._close_sessions(sessions)
@@ -0,0 +1,661 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+
+def default_learning_data() -> Dict[str, Any]:
+    """Empty learning data structure, as stored in chatbot_learning.json."""
+    return {
+        "conversation_history": [],
+        "user_preferences": {},
+        "response_feedback": {},
+        "learned_patterns": [],
+        "custom_responses": {},
+        "last_updated": datetime.now().isoformat()
+    }
+
+
+class JournalLearningStore:
+    """
+    Learning data stored as a JSON snapshot plus an append-only journal.
+    Every conversation, preference change and feedback is appended to the
+    journal as one JSON line instead of rewriting the whole snapshot. The
+    journal is fsynced in batches and folded into the snapshot once it grows
+    past compact_every events. Loading replays the journal over the snapshot.
+    """
+
+    # append() writes (and sometimes fsyncs) on the caller's thread
+    blocking_appends = True
+    # Statistics come from the in-memory learning data
+    queries_stats = False
+
+    def __init__(self, snapshot_file: str = "chatbot_learning.json", journal_file: Optional[str] = None,
+                 sync_every: int = 10, compact_every: int = 500, history_limit: int = 100):
+        """
+        Initialize the store.
+
+        Args:
+            snapshot_file (str): Path to the JSON snapshot
+            journal_file (Optional[str]): Path to the journal, defaults to the snapshot name with .journal
+            sync_every (int): Number of appended events between fsync calls
+            compact_every (int): Number of journal events before a compaction is due
+            history_limit (int): Number of conversations kept in the snapshot
+        """
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file or os.path.splitext(snapshot_file)[0] + ".journal"
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self.history_limit = history_limit
+        self.journal_events = 0
+        self._unsynced = 0
+        self._journal = None
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the snapshot and replay the journal on top of it.
+
+        Returns:
+            Dict[str, Any]: Learning data in the chatbot_learning.json format
+        """
+        data = default_learning_data()
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, 'r', encoding='utf-8') as file:
+                    data.update(json.load(file))
+        except Exception as e:
+            print(f"Warning: Could not load learning data: {e}")
+
+        self.journal_events = 0
+        try:
+            if os.path.exists(self.journal_file):
+                with open(self.journal_file, 'r', encoding='utf-8') as file:
+                    for line in file:
+                        if not line.strip():
+                            continue
+                        try:
+                            event = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A torn last line from a crash mid-write
+                            print("Warning: Skipping unreadable learning journal entry")
+                            continue
+                        self.apply_event(data, event)
+                        self.journal_events += 1
+        except Exception as e:
+            print(f"Warning: Could not replay learning journal: {e}")
+
+        return data
+
+    def apply_event(self, data: Dict[str, Any], event: Dict[str, Any]):
+        """
+        Apply a journal event to learning data.
+
+        Args:
+            data (Dict[str, Any]): Learning data to update in place
+            event (Dict[str, Any]): Journal event
+        """
+        event_type = event.get("type")
+        if event_type == "conversation":
+            data["conversation_history"].append(event["entry"])
+            del data["conversation_history"][:-self.history_limit]
+        elif event_type == "preference":
+            data["user_preferences"][event["key"]] = event["value"]
+        elif event_type == "feedback":
+            data["response_feedback"][event["user_input"]] = event["feedback"]
+
+        if "time" in event:
+            data["last_updated"] = event["time"]
+
+    def append(self, event: Dict[str, Any], flush: bool = False):
+        """
+        Append an event to the journal.
+
+        Args:
+            event (Dict[str, Any]): Event with a "type" and its fields
+            flush (bool): Hand the write to the OS right away (still fsynced in batches)
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a', encoding='utf-8', newline='\n')
+
+        self._journal.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.journal_events += 1
+        self._unsynced += 1
+
+        if self._unsynced >= self.sync_every:
+            self.flush()
+        elif flush:
+            self._journal.flush()
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once the journal holds compact_every events or more."""
+        return self.journal_events >= self.compact_every
+
+    def flush(self):
+        """Write buffered journal lines and fsync them to disk."""
+        if self._journal is not None and self._unsynced:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        self._unsynced = 0
+
+    def compact(self, data: Dict[str, Any]):
+        """
+        Write a full snapshot and empty the journal.
+        The snapshot is written to a temporary file and renamed over the old
+        one, so a crash never leaves a half-written snapshot behind.
+
+        Args:
+            data (Dict[str, Any]): Complete learning data to snapshot
+        """
+        snapshot = dict(data)
+        snapshot["conversation_history"] = list(data.get("conversation_history", []))[-self.history_limit:]
+
+        temp_file = self.snapshot_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            json.dump(snapshot, file, indent=2, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.snapshot_file)
+
+        # Everything in the journal is now part of the snapshot
+        self.close()
+        open(self.journal_file, 'w', encoding='utf-8').close()
+        self.journal_events = 0
+
+    def reset(self, data: Dict[str, Any]):
+        """Replace everything stored with the given learning data."""
+        self.compact(data)
+
+    def feedback_stats(self) -> Optional[Dict[str, int]]:
+        """Not available from the journal, the in-memory learning data is used instead."""
+        return None
+
+    def conversation_count(self) -> Optional[int]:
+        """Not available from the journal, the in-memory conversation history is counted instead."""
+        return None
+
+    def conversation_page(self, before: Optional[int] = None,
+                          limit: int = 50) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Not available from the journal, the in-memory conversation history is paged instead."""
+        return None
+
+    def close(self):
+        """Flush and close the journal file."""
+        if self._journal is not None:
+            self.flush()
+            self._journal.close()
+            self._journal = None
+
+
+class SqliteLearningStore:
+    """
+    Learning data stored in a local SQLite database.
+    Conversations, feedback and preferences live in their own tables, indexed
+    by timestamp and by normalized input. Loading only reads the preferences
+    and the most recent conversations, and feedback statistics come from
+    aggregate queries, so memory use does not grow with the stored history.
+    """
+
+    # append() writes (and sometimes commits) on the caller's thread
+    blocking_appends = True
+    # Feedback and conversations are counted by queries, not from memory
+    queries_stats = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            user_input TEXT NOT NULL,
+            normalized_input TEXT NOT NULL,
+            bot_response TEXT,
+            feedback TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_conversations_input ON conversations (normalized_input);
+        CREATE TABLE IF NOT EXISTS feedback (
+            user_input TEXT PRIMARY KEY,
+            normalized_input TEXT NOT NULL,
+            feedback TEXT NOT NULL,
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_feedback_input ON feedback (normalized_input);
+        CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback (timestamp);
+        CREATE TABLE IF NOT EXISTS preferences (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, database_file: str = "chatbot_learning.db", sync_every: int = 10, history_limit: int = 100):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            database_file (str): Path to the SQLite database
+            sync_every (int): Number of events written between commits
+            history_limit (int): Number of recent conversations returned by load()
+        """
+        self.database_file = database_file
+        self.sync_every = sync_every
+        self.history_limit = history_limit
+        self.journal_events = 0
+        self._unsynced = 0
+        # Shared with the background writer thread, so guard it with a lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database_file, check_same_thread=False)
+        self._connection.executescript(self.SCHEMA)
+        self._connection.commit()
+
+    @staticmethod
+    def normalize_input(user_input: str) -> str:
+        """Lowercase and collapse whitespace, the key used for input lookups."""
+        return " ".join(user_input.lower().split())
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the preferences and the most recent conversations.
+        Feedback stays in the database, see feedback_stats().
+
+        Returns:
+            Dict[str, Any]: Learning data in the chatbot_learning.json format
+        """
+        data = default_learning_data()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT timestamp, user_input, bot_response, feedback FROM conversations "
+                "ORDER BY id DESC LIMIT ?", (self.history_limit,)).fetchall()
+            data["conversation_history"] = [
+                {"timestamp": timestamp, "user_input": user_input, "bot_response": bot_response, "feedback": feedback}
+                for timestamp, user_input, bot_response, feedback in reversed(rows)
+            ]
+            data["user_preferences"] = {
+                key: json.loads(value)
+                for key, value in self._connection.execute("SELECT key, value FROM preferences")
+            }
+            row = self._connection.execute("SELECT value FROM metadata WHERE key = 'last_updated'").fetchone()
+            if row:
+                data["last_updated"] = row[0]
+        return data
+
+    def append(self, event: Dict[str, Any], flush: bool = False):
+        """
+        Write an event to its table.
+
+        Args:
+            event (Dict[str, Any]): Event with a "type" and its fields
+            flush (bool): Commit right away instead of with the next batch
+        """
+        with self._lock:
+            self._write_event(event)
+            self._unsynced += 1
+            if flush or self._unsynced >= self.sync_every:
+                self._commit()
+
+    def _write_event(self, event: Dict[str, Any]):
+        """Insert or update the rows for one event (lock held by the caller)."""
+        event_type = event.get("type")
+        if event_type == "conversation":
+            entry = event["entry"]
+            self._connection.execute(
+                "INSERT INTO conversations (timestamp, user_input, normalized_input, bot_response, feedback) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry.get("timestamp", ""), entry["user_input"], self.normalize_input(entry["user_input"]),
+                 entry.get("bot_response"), entry.get("feedback")))
+        elif event_type == "preference":
+            self._connection.execute(
+                "INSERT OR REPLACE INTO preferences (key, value) VALUES (?, ?)",
+                (event["key"], json.dumps(event["value"])))
+        elif event_type == "feedback":
+            self._connection.execute(
+                "INSERT OR REPLACE INTO feedback (user_input, normalized_input, feedback, timestamp) "
+                "VALUES (?, ?, ?, ?)",
+                (event["user_input"], self.normalize_input(event["user_input"]), event["feedback"], event.get("time")))
+
+        if "time" in event:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_updated', ?)", (event["time"],))
+
+    def _commit(self):
+        """Commit pending writes (lock held by the caller)."""
+        self._connection.commit()
+        self._unsynced = 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Events go straight into their tables, there is no journal to compact."""
+        return False
+
+    def compact(self, data: Dict[str, Any]):
+        """Nothing to compact, pending writes are committed."""
+        self.flush()
+
+    def reset(self, data: Dict[str, Any]):
+        """
+        Replace everything stored with the given learning data.
+
+        Args:
+            data (Dict[str, Any]): Learning data, usually empty
+        """
+        with self._lock:
+            for table in ("conversations", "feedback", "preferences", "metadata"):
+                self._connection.execute(f"DELETE FROM {table}")
+
+            events = [{"type": "conversation", "entry": entry} for entry in data.get("conversation_history", [])]
+            events += [{"type": "preference", "key": key, "value": value}
+                       for key, value in data.get("user_preferences", {}).items()]
+            events += [{"type": "feedback", "user_input": user_input, "feedback": feedback}
+                       for user_input, feedback in data.get("response_feedback", {}).items()]
+            events.append({"type": "reset", "time": data.get("last_updated", datetime.now().isoformat())})
+            for event in events:
+                self._write_event(event)
+            self._commit()
+
+    def feedback_stats(self) -> Dict[str, int]:
+        """
+        Count feedback with aggregate queries.
+
+        Returns:
+            Dict[str, int]: Positive, negative and total feedback counts
+        """
+        with self._lock:
+            positive, negative, total = self._connection.execute(
+                "SELECT COALESCE(SUM(feedback LIKE '%positive%'), 0), "
+                "COALESCE(SUM(feedback LIKE '%negative%'), 0), COUNT(*) FROM feedback").fetchone()
+        return {"positive": positive, "negative": negative, "total_feedback": total}
+
+    def conversation_page(self, before: Optional[int] = None,
+                          limit: int = 50) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Read stored conversations a page at a time, newest pages first.
+        Seeks on the primary key, so every page costs the same however
+        much history there is. Feedback given after the conversation was
+        stored is filled in from the feedback table.
+
+        Args:
+            before (Optional[int]): Only return conversations with an id below this, None for the newest
+            limit (int): Maximum number of conversations
+
+        Returns:
+            List[Tuple[int, Dict[str, Any]]]: (id, conversation entry) pairs, oldest first
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, conversations.timestamp, conversations.user_input, bot_response, "
+                "COALESCE(conversations.feedback, feedback.feedback) FROM conversations "
+                "LEFT JOIN feedback ON feedback.user_input = conversations.user_input "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before if before is not None else 2 ** 63 - 1, limit)).fetchall()
+        return [
+            (row_id, {"timestamp": timestamp, "user_input": user_input, "bot_response": bot_response,
+                      "feedback": feedback})
+            for row_id, timestamp, user_input, bot_response, feedback in reversed(rows)
+        ]
+
+    def conversation_count(self) -> int:
+        """Number of stored conversations."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    def flush(self):
+        """Commit pending writes."""
+        with self._lock:
+            if self._unsynced:
+                self._commit()
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        if self._connection is not None:
+            self.flush()
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+
+# Background writers not closed yet, finished by a single exit hook
+_open_writers: "weakref.WeakSet[BackgroundLearningWriter]" = weakref.WeakSet()
+
+
+def _close_open_writers():
+    """Write everything still queued by the open background writers at exit."""
+    for writer in list(_open_writers):
+        writer.close()
+
+
+atexit.register(_close_open_writers)
+
+
+class BackgroundLearningWriter:
+    """
+    Runs a learning store's disk writes on a background thread.
+    Callers only put events on a queue. The worker drains everything queued
+    so far and writes it as one batch with a single fsync, skipping anything
+    queued before a reset in the same batch. Pending writes are finished by
+    flush() and close() (also run at exit).
+    """
+
+    # append() only puts the event on a queue
+    blocking_appends = False
+
+    def __init__(self, store):
+        """
+        Start the writer thread.
+
+        Args:
+            store (JournalLearningStore or SqliteLearningStore): Store that performs the actual writes
+        """
+        self.store = store
+        self.journal_events = store.journal_events
+        self.queries_stats = store.queries_stats
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="learning-writer", daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    def load(self) -> Dict[str, Any]:
+        """Load learning data through the wrapped store (waits for pending writes)."""
+        self.flush()
+        data = self.store.load()
+        self.journal_events = self.store.journal_events
+        return data
+
+    def append(self, event: Dict[str, Any], flush: bool = False):
+        """Queue an event for the journal. Every batch is fsynced, so flush is implied."""
+        self.journal_events += 1
+        self._queue.put(("event", event))
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once compact_every events were queued since the last snapshot (never for SQLite)."""
+        compact_every = getattr(self.store, "compact_every", None)
+        return compact_every is not None and self.journal_events >= compact_every
+
+    def compact(self, data: Dict[str, Any]):
+        """
+        Queue a full snapshot.
+
+        Args:
+            data (Dict[str, Any]): Learning data, must not be changed by the caller afterwards
+        """
+        self.journal_events = 0
+        self._queue.put(("compact", data))
+
+    def reset(self, data: Dict[str, Any]):
+        """Queue replacing everything stored with the given learning data."""
+        self.journal_events = 0
+        self._queue.put(("reset", data))
+
+    def feedback_stats(self) -> Optional[Dict[str, int]]:
+        """Query feedback counts from the wrapped store once pending writes are done."""
+        self.flush()
+        return self.store.feedback_stats()
+
+    def conversation_count(self) -> Optional[int]:
+        """Query the number of conversations from the wrapped store once pending writes are done."""
+        self.flush()
+        return self.store.conversation_count()
+
+    def conversation_page(self, before: Optional[int] = None,
+                          limit: int = 50) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Page conversations already written by the wrapped store (see SqliteLearningStore.conversation_page)."""
+        return self.store.conversation_page(before, limit)
+
+    def flush(self):
+        """Block until everything queued so far is written and fsynced."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(("stop", None))
+            self._thread.join()
+        self.store.close()
+        _open_writers.discard(self)
+
+    def _run(self):
+        """Writer loop: take a batch of queued operations and write it."""
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = [payload for kind, payload in batch if kind == "flush"]
+            running = not any(kind == "stop" for kind, _ in batch)
+
+            # A reset replaces everything queued before it
+            writes = [(kind, payload) for kind, payload in batch if kind in ("event", "compact", "reset")]
+            last_reset = max((i for i, (kind, _) in enumerate(writes) if kind == "reset"), default=None)
+            if last_reset is not None:
+                writes = writes[last_reset:]
+
+            try:
+                for kind, payload in writes:
+                    if kind == "event":
+                        self.store.append(payload)
+                    elif kind == "compact":
+                        self.store.compact(payload)
+                    else:
+                        self.store.reset(payload)
+                self.store.flush()
+            except Exception as e:
+                print(f"Warning: Could not save learning data: {e}")
+
+            for done in waiters:
+                done.set()
+
+
+class DeferredLearningWriter:
+    """
+    Keeps a learning store's writes in memory until flush() or close().
+    Used for chat sessions: a busy session costs no disk I/O per message and
+    an idle one holds no open file, its events are written in one batch when
+    the session is flushed or evicted.
+    """
+
+    # append() only keeps the event in memory
+    blocking_appends = False
+    # Statistics come from the in-memory learning data
+    queries_stats = False
+
+    def __init__(self, store: JournalLearningStore):
+        """
+        Wrap a store.
+
+        Args:
+            store (JournalLearningStore): Store that performs the actual writes
+        """
+        self.store = store
+        self.journal_events = store.journal_events
+        self._pending = []
+        # flush() may run on another thread than the one recording events
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        """Load learning data through the wrapped store (writes pending events first)."""
+        self.flush()
+        data = self.store.load()
+        self.journal_events = self.store.journal_events
+        return data
+
+    def append(self, event: Dict[str, Any], flush: bool = False):
+        """Keep an event until the next flush. The flush argument is ignored."""
+        with self._lock:
+            self.journal_events += 1
+            self._pending.append(("event", event))
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once compact_every events were recorded since the last snapshot."""
+        return self.journal_events >= self.store.compact_every
+
+    def compact(self, data: Dict[str, Any]):
+        """Keep a full snapshot until the next flush."""
+        with self._lock:
+            self.journal_events = 0
+            self._pending.append(("compact", data))
+
+    def reset(self, data: Dict[str, Any]):
+        """Drop pending writes and keep a reset until the next flush."""
+        with self._lock:
+            self.journal_events = 0
+            self._pending = [("reset", data)]
+
+    def feedback_stats(self) -> Optional[Dict[str, int]]:
+        """Not available from the journal, the in-memory learning data is used instead."""
+        return None
+
+    def conversation_count(self) -> Optional[int]:
+        """Not available from the journal, the in-memory conversation history is counted instead."""
+        return None
+
+    def conversation_page(self, before: Optional[int] = None,
+                          limit: int = 50) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Not available from the journal, the in-memory conversation history is paged instead."""
+        return None
+
+    @property
+    def pending(self) -> int:
+        """Number of writes not handed to the store yet."""
+        return len(self._pending)
+
+    def flush(self):
+        """Write pending events to the store and release its open file."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                for kind, payload in pending:
+                    if kind == "event":
+                        self.store.append(payload)
+                    elif kind == "compact":
+                        self.store.compact(payload)
+                    else:
+                        self.store.reset(payload)
+                self.store.flush()
+            except Exception as e:
+                print(f"Warning: Could not save learning data: {e}")
+            # The journal is reopened by the next append
+            self.store.close()
+
+    def close(self):
+        """Write pending events and close the store."""
+        self.flush()
+        with self._lock:
+            self.store.close()
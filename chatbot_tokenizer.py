@@ -0,0 +1,99 @@
+import re
+from typing import List, FrozenSet
+
+# NLTK's English stop word list, built in so the default tokenizer needs no corpus download
+ENGLISH_STOP_WORDS: FrozenSet[str] = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# Punctuation word_tokenize always splits off words. Everything else (hyphens,
+# slashes, digits, Devanagari vowel signs, emoji...) stays part of the word around it.
+_SPLIT_CHARS = r",;:!?\"`()\[\]{}<>@#$%&*«»“”‘’„"
+_BOUNDARY = rf"(?:[\s{_SPLIT_CHARS}]|--|\.\.|$)"
+_CONTRACTION = r"(?:n't|'(?:s|m|d|ll|re|ve))"
+
+# Words, shortest first: a word ends before a boundary, optionally preceded
+# by a contraction and trailing periods or quotes. Contractions come out as
+# their own tokens, fused forms ("gonna") are split in two and the unicode
+# quotes are tokens by themselves, all as word_tokenize does.
+TOKEN_PATTERN = re.compile(
+    r"\b(?:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na\b))"
+    r"|[«»“”‘’„]"
+    rf"|(?!\.|--|(?<=-)-)(?:(?!--|\.\.)[^\s{_SPLIT_CHARS}])+?(?={_CONTRACTION}?[.']*{_BOUNDARY})"
+)
+
+
+class RegexTokenizer:
+    """
+    Fast tokenizer using one precompiled regular expression.
+    Splits lowercase chat text like NLTK's word_tokenize: on whitespace and
+    punctuation, with contractions ("n't", "'m", "'s", ...) and sentence-final
+    periods split off. ASCII punctuation is dropped instead of returned,
+    preprocess_text would filter it out anyway.
+    """
+
+    name = "regex"
+
+    def __init__(self):
+        self.stop_words = ENGLISH_STOP_WORDS
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Split text into word tokens.
+
+        Args:
+            text (str): Text to tokenize
+
+        Returns:
+            List[str]: Tokens in order
+        """
+        return TOKEN_PATTERN.findall(text)
+
+
+class NltkTokenizer:
+    """
+    NLTK's word_tokenize and English stop word corpus.
+    NLTK is imported when this tokenizer is created, and needs the punkt and
+    stopwords data from setup_nltk.py.
+    """
+
+    name = "nltk"
+
+    def __init__(self):
+        from nltk.tokenize import word_tokenize
+        from nltk.corpus import stopwords
+
+        self._word_tokenize = word_tokenize
+        try:
+            self.stop_words = frozenset(stopwords.words('english'))
+        except LookupError:
+            # If stopwords not available, use the built-in copy
+            self.stop_words = ENGLISH_STOP_WORDS
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Split text into word tokens with word_tokenize.
+
+        Args:
+            text (str): Text to tokenize
+
+        Returns:
+            List[str]: Tokens in order
+        """
+        return self._word_tokenize(text)
+
+
+# Tokenizers selectable through ChatbotModel(tokenizer=...)
+TOKENIZERS = {
+    "regex": RegexTokenizer,
+    "nltk": NltkTokenizer
+}
@@ -1,568 +1,1095 @@
-import sys
-import json
-from datetime import datetime
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTextEdit, QLineEdit, QPushButton, QScrollArea, QLabel,
-    QFrame, QSizePolicy, QSpacerItem
-)
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QFont, QPalette, QColor, QTextCursor, QPixmap, QIcon
-from chatbot_logic import ChatbotLogic
-
-class MessageBubble(QFrame):
-    """
-    Custom message bubble widget for chat messages.
-    Supports different styles for user and bot messages.
-    Now includes feedback buttons for bot messages.
-    """
-    
-    def __init__(self, text: str, is_user: bool = False, timestamp: str = None, parent=None, on_feedback=None):
-        super().__init__(parent)
-        self.is_user = is_user
-        self.text = text
-        self.timestamp = timestamp or datetime.now().strftime("%H:%M")
-        self.on_feedback = on_feedback
-        
-        self.setup_ui()
-        self.apply_styling()
-    
-    def setup_ui(self):
-        """Setup the message bubble UI components."""
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(12, 8, 12, 8)
-        layout.setSpacing(4)
-        
-        # Message text
-        self.text_label = QLabel(self.text)
-        self.text_label.setWordWrap(True)
-        self.text_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.text_label.setStyleSheet("color: inherit; background: transparent; border: none;")
-        
-        # Timestamp
-        self.time_label = QLabel(self.timestamp)
-        self.time_label.setAlignment(Qt.AlignRight | Qt.AlignBottom)
-        self.time_label.setStyleSheet("color: inherit; background: transparent; border: none; font-size: 10px; opacity: 0.7;")
-        
-        layout.addWidget(self.text_label)
-        layout.addWidget(self.time_label)
-        
-        # Add feedback buttons for bot messages
-        if not self.is_user and self.on_feedback:
-            self.setup_feedback_buttons(layout)
-        
-        # Set size policy
-        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Minimum)
-        self.setMaximumWidth(400)
-    
-    def setup_feedback_buttons(self, layout):
-        """Setup feedback buttons for bot messages."""
-        feedback_layout = QHBoxLayout()
-        feedback_layout.setSpacing(5)
-        
-        # Thumbs up button
-        self.thumbs_up_btn = QPushButton("👍")
-        self.thumbs_up_btn.setFixedSize(24, 24)
-        self.thumbs_up_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                font-size: 14px;
-                color: #4CAF50;
-            }
-            QPushButton:hover {
-                background-color: rgba(76, 175, 80, 0.1);
-                border-radius: 12px;
-            }
-        """)
-        self.thumbs_up_btn.clicked.connect(lambda: self.on_feedback("positive"))
-        
-        # Thumbs down button
-        self.thumbs_down_btn = QPushButton("👎")
-        self.thumbs_down_btn.setFixedSize(24, 24)
-        self.thumbs_down_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                font-size: 14px;
-                color: #F44336;
-            }
-            QPushButton:hover {
-                background-color: rgba(244, 67, 54, 0.1);
-                border-radius: 12px;
-            }
-        """)
-        self.thumbs_down_btn.clicked.connect(lambda: self.on_feedback("negative"))
-        
-        feedback_layout.addWidget(self.thumbs_up_btn)
-        feedback_layout.addWidget(self.thumbs_down_btn)
-        feedback_layout.addStretch()
-        
-        layout.addLayout(feedback_layout)
-    
-    def apply_styling(self):
-        """Apply styling based on message type (user or bot)."""
-        if self.is_user:
-            # User message styling (right-aligned, blue background)
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #0084ff;
-                    color: white;
-                    border-radius: 18px;
-                    border-top-right-radius: 4px;
-                    margin-left: 50px;
-                    margin-right: 5px;
-                }
-            """)
-            # Set layout alignment for right-aligned user messages
-            self.layout().setAlignment(Qt.AlignRight)
-        else:
-            # Bot message styling (left-aligned, light gray background)
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                    border-radius: 18px;
-                    border-top-left-radius: 4px;
-                    margin-right: 50px;
-                    margin-left: 5px;
-                }
-            """)
-            # Set layout alignment for left-aligned bot messages
-            self.layout().setAlignment(Qt.AlignLeft)
-
-class ChatArea(QWidget):
-    """
-    Scrollable chat area that displays message bubbles.
-    """
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setup_ui()
-    
-    def setup_ui(self):
-        """Setup the chat area UI."""
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
-        # Add spacer to push messages to bottom
-        self.spacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
-        layout.addItem(self.spacer)
-        
-        # Set background
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #ffffff;
-                border: none;
-            }
-        """)
-    
-    def add_message(self, text: str, is_user: bool = False, timestamp: str = None, on_feedback=None):
-        """Add a new message bubble to the chat area."""
-        # Remove spacer temporarily
-        self.layout().removeItem(self.spacer)
-        
-        # Create and add message bubble
-        bubble = MessageBubble(text, is_user, timestamp, self, on_feedback)
-        self.layout().addWidget(bubble)
-        
-        # Re-add spacer
-        self.layout().addItem(self.spacer)
-        
-        # Scroll to bottom
-        self.scroll_to_bottom()
-        
-        return bubble
-    
-    def scroll_to_bottom(self):
-        """Scroll the chat area to the bottom."""
-        # Find the parent scroll area and scroll to bottom
-        parent = self.parent()
-        while parent and not isinstance(parent, QScrollArea):
-            parent = parent.parent()
-        
-        if parent:
-            parent.verticalScrollBar().setValue(parent.verticalScrollBar().maximum())
-
-class InputArea(QWidget):
-    """
-    Input area with text field and send button.
-    """
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setup_ui()
-    
-    def setup_ui(self):
-        """Setup the input area UI."""
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(15, 10, 15, 15)
-        layout.setSpacing(10)
-        
-        # Text input field
-        self.text_input = QLineEdit()
-        self.text_input.setPlaceholderText("Type your message here...")
-        self.text_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #e1e1e1;
-                border-radius: 20px;
-                padding: 10px 15px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #0084ff;
-            }
-        """)
-        
-        # Send button
-        self.send_button = QPushButton("Send")
-        self.send_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0084ff;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #0073e6;
-            }
-            QPushButton:pressed {
-                background-color: #005bb5;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-        """)
-        
-        # Set fixed height for consistent appearance
-        self.text_input.setFixedHeight(40)
-        self.send_button.setFixedHeight(40)
-        
-        layout.addWidget(self.text_input)
-        layout.addWidget(self.send_button)
-        
-        # Set background
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #f8f9fa;
-                border-top: 1px solid #e1e1e1;
-            }
-        """)
-
-class AI_ChatBot(QMainWindow):
-    """
-    Main AI ChatBot application window with modern messenger-like interface.
-    """
-    
-    def __init__(self):
-        super().__init__()
-        self.chatbot = ChatbotLogic()
-        self.setup_ui()
-        self.setup_connections()
-        self.show_welcome_message()
-    
-    def setup_ui(self):
-        """Setup the main application UI."""
-        self.setWindowTitle("AI ChatBot - Learning Edition")
-        self.setMinimumSize(800, 600)
-        self.resize(900, 700)
-        
-        # Set window icon (optional)
-        # self.setWindowIcon(QIcon("icon.png"))
-        
-        # Setup menu bar
-        self.setup_menu_bar()
-        
-        # Central widget
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        
-        # Main layout
-        main_layout = QVBoxLayout(central_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
-        
-        # Header
-        self.setup_header(main_layout)
-        
-        # Chat area with scroll
-        self.setup_chat_area(main_layout)
-        
-        # Input area
-        self.input_area = InputArea()
-        main_layout.addWidget(self.input_area)
-        
-        # Apply main window styling
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #ffffff;
-            }
-        """)
-    
-    def setup_menu_bar(self):
-        """Setup the application menu bar with learning options."""
-        menubar = self.menuBar()
-        
-        # Learning menu
-        learning_menu = menubar.addMenu('🤖 Learning')
-        
-        # Show statistics action
-        stats_action = learning_menu.addAction('📊 Show Statistics')
-        stats_action.triggered.connect(self.show_learning_stats)
-        
-        # Reset learning action
-        reset_action = learning_menu.addAction('🔄 Reset Learning')
-        reset_action.triggered.connect(self.reset_learning)
-        
-        # Separator
-        learning_menu.addSeparator()
-        
-        # About action
-        about_action = learning_menu.addAction('ℹ️ About Learning')
-        about_action.triggered.connect(self.show_learning_info)
-    
-    def setup_header(self, parent_layout):
-        """Setup the application header."""
-        header = QWidget()
-        header.setFixedHeight(60)
-        header.setStyleSheet("""
-            QWidget {
-                background-color: #0084ff;
-                color: white;
-                border: none;
-            }
-        """)
-        
-        header_layout = QHBoxLayout(header)
-        header_layout.setContentsMargins(20, 0, 20, 0)
-        
-        # Title
-        title_label = QLabel("AI ChatBot")
-        title_label.setStyleSheet("""
-            QLabel {
-                color: white;
-                font-size: 20px;
-                font-weight: bold;
-                background: transparent;
-                border: none;
-            }
-        """)
-        
-        # Status indicator
-        status_label = QLabel("● Online")
-        status_label.setStyleSheet("""
-            QLabel {
-                color: #90EE90;
-                font-size: 12px;
-                background: transparent;
-                border: none;
-            }
-        """)
-        
-        header_layout.addWidget(title_label)
-        header_layout.addStretch()
-        header_layout.addWidget(status_label)
-        
-        parent_layout.addWidget(header)
-    
-    def setup_chat_area(self, parent_layout):
-        """Setup the scrollable chat area."""
-        # Create scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Style the scroll area
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #ffffff;
-            }
-            QScrollBar:vertical {
-                background-color: #f0f0f0;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #c0c0c0;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
-        
-        # Create chat area widget
-        self.chat_area = ChatArea()
-        self.scroll_area.setWidget(self.chat_area)
-        
-        parent_layout.addWidget(self.scroll_area)
-    
-    def setup_connections(self):
-        """Setup signal connections."""
-        # Connect send button
-        self.input_area.send_button.clicked.connect(self.send_message)
-        
-        # Connect enter key in text input
-        self.input_area.text_input.returnPressed.connect(self.send_message)
-        
-        # Connect text changed to enable/disable send button
-        self.input_area.text_input.textChanged.connect(self.on_text_changed)
-    
-    def on_text_changed(self, text):
-        """Handle text input changes."""
-        # Enable/disable send button based on text content
-        self.input_area.send_button.setEnabled(bool(text.strip()))
-    
-    def send_message(self):
-        """Send the current message."""
-        text = self.input_area.text_input.text().strip()
-        if not text:
-            return
-        
-        # Store last user message for feedback
-        self.last_user_message = text
-        
-        # Add user message to chat
-        self.add_user_message(text)
-        
-        # Clear input field
-        self.input_area.text_input.clear()
-        
-        # Get bot response
-        self.get_bot_response(text)
-    
-    def add_user_message(self, text: str):
-        """Add a user message to the chat."""
-        self.chat_area.add_message(text, is_user=True)
-    
-    def add_bot_message(self, text: str):
-        """Add a bot message to the chat."""
-        self.chat_area.add_message(text, is_user=False, on_feedback=self.handle_feedback)
-    
-    def handle_feedback(self, feedback_type: str):
-        """Handle user feedback on bot responses."""
-        if hasattr(self, 'last_user_message') and hasattr(self, 'last_bot_response'):
-            self.chatbot.provide_feedback(self.last_user_message, feedback_type)
-            print(f"Feedback recorded: {feedback_type} for response to '{self.last_user_message}'")
-    
-    def show_learning_stats(self):
-        """Show learning statistics and insights."""
-        stats = self.chatbot.get_conversation_stats()
-        
-        stats_text = f"""
-🤖 ChatBot Learning Statistics:
-
-📊 Total Conversations: {stats['total_conversations']}
-👍 Positive Feedback: {stats['feedback_stats']['positive']}
-👎 Negative Feedback: {stats['feedback_stats']['negative']}
-📝 Total Feedback: {stats['feedback_stats']['total_feedback']}
-
-👤 User Preferences:
-"""
-        
-        for pref, count in stats['user_preferences'].items():
-            if pref == "likes_jokes":
-                stats_text += f"• Loves Jokes: {count} times\n"
-            elif pref == "needs_motivation":
-                stats_text += f"• Needs Motivation: {count} times\n"
-            else:
-                stats_text += f"• {pref}: {count} times\n"
-        
-        stats_text += f"\n🕒 Last Updated: {stats['last_updated']}"
-        
-        # Show stats in a simple message box
-        from PyQt5.QtWidgets import QMessageBox
-        msg = QMessageBox()
-        msg.setWindowTitle("Learning Statistics")
-        msg.setText(stats_text)
-        msg.exec_()
-    
-    def reset_learning(self):
-        """Reset all learning data."""
-        from PyQt5.QtWidgets import QMessageBox
-        reply = QMessageBox.question(self, 'Reset Learning', 
-                                   'Are you sure you want to reset all learning data? This cannot be undone.',
-                                   QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        
-        if reply == QMessageBox.Yes:
-            self.chatbot.reset_learning()
-            QMessageBox.information(self, 'Learning Reset', 'All learning data has been reset successfully!')
-    
-    def show_learning_info(self):
-        """Show information about the learning capabilities."""
-        info_text = """
-🤖 AI ChatBot Learning Features:
-
-✨ **Conversation Memory**: Remembers all your conversations
-👤 **User Preferences**: Learns what you like (jokes, motivation, etc.)
-📊 **Feedback System**: Use 👍/👎 buttons to rate responses
-🔄 **Continuous Improvement**: Gets better with each conversation
-💾 **Persistent Learning**: Saves data between sessions
-
-🎯 **How to Use**:
-• Chat normally with the bot
-• Use 👍/👎 buttons on bot responses
-• Check statistics in Learning menu
-• Reset learning if needed
-
-The more you chat and provide feedback, the smarter the bot becomes! 🚀
-"""
-        
-        from PyQt5.QtWidgets import QMessageBox
-        msg = QMessageBox()
-        msg.setWindowTitle("About Learning Features")
-        msg.setText(info_text)
-        msg.exec_()
-    
-    def get_bot_response(self, user_message: str):
-        """Get and display bot response."""
-        # Simulate typing delay for more natural feel
-        QTimer.singleShot(500, lambda: self.display_bot_response(user_message))
-    
-    def display_bot_response(self, user_message: str):
-        """Display the bot's response."""
-        response = self.chatbot.get_response(user_message)
-        self.last_bot_response = response
-        self.add_bot_message(response)
-    
-    def show_welcome_message(self):
-        """Show welcome message when app starts."""
-        welcome_msg = self.chatbot.get_welcome_message()
-        QTimer.singleShot(100, lambda: self.add_bot_message(welcome_msg))
-    
-    def keyPressEvent(self, event):
-        """Handle key press events."""
-        if event.key() == Qt.Key_Escape:
-            self.close()
-        else:
-            super().keyPressEvent(event)
-
-def main():
-    """Main application entry point."""
-    app = QApplication(sys.argv)
-    
-    # Set application properties
-    app.setApplicationName("AI ChatBot")
-    app.setApplicationVersion("1.0")
-    app.setOrganizationName("AI ChatBot")
-    
-    # Create and show main window
-    window = AI_ChatBot()
-    window.show()
-    
-    # Start the application event loop
-    sys.exit(app.exec_())
-
-if __name__ == "__main__":
-    main()
+import sys
+import itertools
+import queue
+import time
+from collections import deque
+from datetime import datetime
+from functools import partial
+from string import Template
+from typing import List, Dict, Any, Tuple
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QLineEdit, QPushButton, QLabel, QListView, QAbstractItemView, QStyledItemDelegate
+)
+from PyQt5.QtCore import (Qt, QTimer, QThread, pyqtSignal, QAbstractListModel, QModelIndex, QRect, QSize,
+                          QPoint, QEvent)
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QColor, QPixmap, QPixmapCache
+from chatbot_logic import ChatbotLogic
+
+# Colors shared by the application stylesheet and the painted chat bubbles
+THEME = {
+    "primary": "#0084ff",
+    "primary_hover": "#0073e6",
+    "primary_pressed": "#005bb5",
+    "disabled": "#cccccc",
+    "background": "#ffffff",
+    "input_background": "#f8f9fa",
+    "border": "#e1e1e1",
+    "bot_bubble": "#f0f0f0",
+    "bot_text": "#333333",
+    "user_text": "#ffffff",
+    "online": "#90EE90",
+    "offline": "#cccccc",
+    "positive": "#4CAF50",
+    "negative": "#F44336",
+    "scroll_handle": "#c0c0c0",
+    "scroll_handle_hover": "#a0a0a0"
+}
+
+# One stylesheet for the whole application: widgets are picked out by object
+# name and dynamic property instead of each parsing a stylesheet of its own
+APP_STYLESHEET = Template("""
+    QMainWindow {
+        background-color: $background;
+    }
+    QWidget#header {
+        background-color: $primary;
+        border: none;
+    }
+    QLabel#titleLabel {
+        color: white;
+        font-size: 20px;
+        font-weight: bold;
+        background: transparent;
+    }
+    QLabel#statusLabel {
+        color: $offline;
+        font-size: 12px;
+        background: transparent;
+    }
+    QLabel#statusLabel[online="true"] {
+        color: $online;
+    }
+    QListView#chatArea {
+        background-color: $background;
+        border: none;
+    }
+    QListView#chatArea QScrollBar:vertical {
+        background-color: $bot_bubble;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QListView#chatArea QScrollBar::handle:vertical {
+        background-color: $scroll_handle;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QListView#chatArea QScrollBar::handle:vertical:hover {
+        background-color: $scroll_handle_hover;
+    }
+    QListView#chatArea QScrollBar::add-line:vertical, QListView#chatArea QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QWidget#inputArea {
+        background-color: $input_background;
+        border-top: 1px solid $border;
+    }
+    QLineEdit#messageInput {
+        border: 2px solid $border;
+        border-radius: 20px;
+        padding: 10px 15px;
+        font-size: 14px;
+        background-color: white;
+    }
+    QLineEdit#messageInput:focus {
+        border-color: $primary;
+    }
+    QPushButton#sendButton {
+        background-color: $primary;
+        color: white;
+        border: none;
+        border-radius: 20px;
+        padding: 10px 20px;
+        font-size: 14px;
+        font-weight: bold;
+    }
+    QPushButton#sendButton:hover {
+        background-color: $primary_hover;
+    }
+    QPushButton#sendButton:pressed {
+        background-color: $primary_pressed;
+    }
+    QPushButton#sendButton:disabled {
+        background-color: $disabled;
+    }
+""").substitute(THEME)
+
+def apply_theme(app: QApplication):
+    """Install the application stylesheet, once (Qt re-parses it on every set)."""
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+# Serial numbers identifying messages in the pixmap cache
+_message_serials = itertools.count()
+
+
+class ChatMessage:
+    """
+    One message of the transcript, kept small since the full conversation stays in memory.
+    """
+    
+    __slots__ = ("serial", "text", "is_user", "timestamp", "reply_to", "feedback", "layout")
+    
+    def __init__(self, text: str, is_user: bool = False, timestamp: str = None, reply_to: str = None):
+        self.serial = next(_message_serials)
+        self.text = text
+        self.is_user = is_user
+        self.timestamp = timestamp or datetime.now().strftime("%H:%M")
+        # User message a bot response answers, bot messages with one get feedback buttons
+        self.reply_to = reply_to
+        self.feedback = None
+        # (view width, bubble size, text height, row size) cached by MessageDelegate
+        self.layout = None
+
+class TranscriptModel(QAbstractListModel):
+    """
+    List model over the whole chat transcript.
+    The view only gets a window of at most max_rows consecutive messages,
+    the newest ones unless the user pages back, so Qt's layout work per
+    append or scroll is bounded however long the conversation gets.
+    Past conversations come from a history loader a page at a time when
+    paging back reaches the oldest message, and pages far above the window
+    are released again, so the history is never materialized as a whole.
+    Pages are loaded in the background, history_loaded is emitted when one
+    has been put before the first message.
+    """
+    
+    MessageRole = Qt.UserRole + 1
+    history_loaded = pyqtSignal()
+    
+    def __init__(self, max_rows: int = 200, page_size: int = 50, parent=None):
+        """
+        Create an empty transcript.
+        
+        Args:
+            max_rows (int): Maximum number of messages shown to the view at once
+            page_size (int): Number of messages added to the window when paging
+        """
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self.page_size = page_size
+        self.messages: List[ChatMessage] = []
+        # The view shows messages[start:end]
+        self.start = 0
+        self.end = 0
+        # Older history, see set_history_loader()
+        self.history_loader = None
+        self.history_cursor = None
+        self.history_exhausted = False
+        # Page being loaded, pages of an older request are ignored when they arrive
+        self.history_request = None
+        # (message count, cursor before loading) of the history pages at the start of messages, newest load first
+        self.history_pages = deque()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.end - self.start
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.messages[self.start + index.row()]
+        if role == Qt.DisplayRole:
+            return message.text
+        if role == self.MessageRole:
+            return message
+        return None
+    
+    def message(self, row: int) -> ChatMessage:
+        """Message shown in a row of the window."""
+        return self.messages[self.start + row]
+    
+    def append(self, message: ChatMessage):
+        """Add a message at the end, moving the window to the newest messages."""
+        self.messages.append(message)
+        if self.end < len(self.messages) - 1:
+            # Paged back in the history, jump to the end
+            self.beginResetModel()
+            self.end = len(self.messages)
+            self.start = max(0, self.end - self.max_rows)
+            self._release_history()
+            self.endResetModel()
+            return
+        
+        row = self.end - self.start
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.end += 1
+        self.endInsertRows()
+        self._trim(from_top=True)
+        self._release_history()
+    
+    def set_history_loader(self, loader, before=None):
+        """
+        Load past conversations on demand when paging back past the oldest message.
+        
+        Args:
+            loader: Called as loader(before, limit, done) to start loading, without waiting.
+                Once loaded, done((position, messages)) must be called on the GUI thread with
+                the position of the oldest conversation loaded and up to limit conversations
+                older than before as messages, oldest first (no messages once the history
+                is exhausted). None stops loading history.
+            before: Position the history ends before, None for the newest
+        """
+        self.history_loader = loader
+        self.history_cursor = before
+        self.history_exhausted = False
+        self.history_request = None
+        self.history_pages.clear()
+    
+    def can_page_back(self) -> bool:
+        """True if there are older messages before the window, or older history to load."""
+        return self.start > 0 or (self.history_loader is not None and not self.history_exhausted)
+    
+    def can_page_forward(self) -> bool:
+        """True if there are newer messages after the window."""
+        return self.end < len(self.messages)
+    
+    def page_back(self) -> int:
+        """
+        Add older messages at the top of the window, dropping newer ones at the bottom.
+        Near the first message the next history page starts loading, the rows
+        come with a later call once history_loaded was emitted.
+        
+        Returns:
+            int: Number of rows added at the top
+        """
+        if self.start < self.page_size:
+            self._load_history()
+        count = min(self.page_size, self.start)
+        if count:
+            self.beginInsertRows(QModelIndex(), 0, count - 1)
+            self.start -= count
+            self.endInsertRows()
+            self._trim(from_top=False)
+        return count
+    
+    def page_forward(self) -> int:
+        """
+        Add newer messages at the bottom of the window, dropping older ones at the top.
+        
+        Returns:
+            int: Number of rows dropped at the top
+        """
+        count = min(self.page_size, len(self.messages) - self.end)
+        if not count:
+            return 0
+        row = self.end - self.start
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self.end += count
+        self.endInsertRows()
+        dropped = self._trim(from_top=True)
+        self._release_history()
+        return dropped
+    
+    def _load_history(self):
+        """Start loading the next page of older history, unless it is already loading."""
+        if self.history_loader is None or self.history_exhausted or self.history_request is not None:
+            return
+        request = self.history_request = object()
+        self.history_loader(self.history_cursor, self.page_size, partial(self._history_page_loaded, request))
+    
+    def _history_page_loaded(self, request, page):
+        """Put a loaded page of older history before the first message."""
+        if request is not self.history_request:
+            return
+        self.history_request = None
+        position, older = page
+        if not older:
+            self.history_exhausted = True
+            return
+        # The window keeps its rows, only their offset into messages changes
+        self.messages[0:0] = older
+        self.start += len(older)
+        self.end += len(older)
+        self.history_pages.appendleft((len(older), self.history_cursor))
+        self.history_cursor = position
+        self.history_loaded.emit()
+    
+    def _release_history(self):
+        """Forget history pages more than max_rows above the window, they are loaded again if needed."""
+        while self.history_pages and self.start - self.history_pages[0][0] >= self.max_rows:
+            count, self.history_cursor = self.history_pages.popleft()
+            del self.messages[:count]
+            self.start -= count
+            self.end -= count
+            self.history_exhausted = False
+            # A page being loaded would go before the released ones
+            self.history_request = None
+    
+    def _trim(self, from_top: bool) -> int:
+        """Drop rows beyond max_rows from one end of the window, returning how many."""
+        excess = self.end - self.start - self.max_rows
+        if excess <= 0:
+            return 0
+        rows = self.end - self.start
+        first = 0 if from_top else rows - excess
+        self.beginRemoveRows(QModelIndex(), first, first + excess - 1)
+        if from_top:
+            self.start += excess
+        else:
+            self.end -= excess
+        self.endRemoveRows()
+        return excess
+    
+    def clear(self):
+        """Remove every message."""
+        self.beginResetModel()
+        self.messages = []
+        self.start = self.end = 0
+        self.history_request = None
+        self.history_pages.clear()
+        self.endResetModel()
+
+class MessageDelegate(QStyledItemDelegate):
+    """
+    Paints transcript messages as chat bubbles, with feedback buttons on bot responses.
+    User messages are right-aligned and blue, bot messages left-aligned and
+    light gray. Bubble sizes are computed once per message and view width,
+    and rendered bubbles are kept in QPixmapCache, so scrolling only copies pixmaps.
+    """
+    
+    # (message, "positive" or "negative")
+    feedback_given = pyqtSignal(object, str)
+    
+    MAX_BUBBLE_WIDTH = 400
+    # Margins on the far and near side of a bubble, and the padding inside it
+    FAR_MARGIN = 50
+    NEAR_MARGIN = 5
+    PADDING_X = 12
+    PADDING_Y = 8
+    SPACING = 4
+    BUTTON_SIZE = 24
+    FEEDBACK_BUTTONS = (("positive", "👍", "positive"), ("negative", "👎", "negative"))
+    
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.transcript = view.transcript
+        # View width the layouts are computed for, kept up to date by ChatArea
+        self.width = view.viewport().width()
+        
+        # Fonts, metrics and colors are created once, not per paint
+        self.text_font = QFont(view.font())
+        self.text_font.setPixelSize(14)
+        self.time_font = QFont(view.font())
+        self.time_font.setPixelSize(10)
+        self.text_metrics = QFontMetrics(self.text_font)
+        self.time_metrics = QFontMetrics(self.time_font)
+        self.colors = {name: QColor(value) for name, value in THEME.items()}
+        self.button_pixmaps = {}
+    
+    def set_width(self, width: int):
+        """Lay messages out for a new view width."""
+        self.width = width
+    
+    def bubble_layout(self, message: ChatMessage) -> Tuple[QSize, int, QSize]:
+        """
+        Sizes of a message's bubble, of its wrapped text and of its row at the current view width.
+        
+        Returns:
+            Tuple[QSize, int, QSize]: Bubble size, text height and row size hint
+        """
+        layout = message.layout
+        if layout is not None and layout[0] == self.width:
+            return layout[1], layout[2], layout[3]
+        
+        max_text_width = max(50, min(self.MAX_BUBBLE_WIDTH, self.width - self.FAR_MARGIN - self.NEAR_MARGIN)
+                             - 2 * self.PADDING_X)
+        text_rect = self.text_metrics.boundingRect(QRect(0, 0, max_text_width, 1000000),
+                                                   Qt.TextWordWrap, message.text)
+        content_width = max(text_rect.width(), self.time_metrics.horizontalAdvance(message.timestamp))
+        height = text_rect.height() + self.SPACING + self.time_metrics.height()
+        if message.reply_to is not None:
+            content_width = max(content_width, 2 * self.BUTTON_SIZE + 5)
+            height += self.SPACING + self.BUTTON_SIZE
+        size = QSize(content_width + 2 * self.PADDING_X, height + 2 * self.PADDING_Y)
+        row_size = QSize(self.width, size.height() + 2 * self.SPACING)
+        message.layout = (self.width, size, text_rect.height(), row_size)
+        return size, text_rect.height(), row_size
+    
+    def bubble_rect(self, message: ChatMessage, rect: QRect) -> QRect:
+        """Where the bubble goes inside an item's rect."""
+        size = self.bubble_layout(message)[0]
+        if message.is_user:
+            left = rect.right() - self.NEAR_MARGIN - size.width() + 1
+        else:
+            left = rect.left() + self.NEAR_MARGIN
+        return QRect(left, rect.top() + self.SPACING, size.width(), size.height())
+    
+    def button_rects(self, bubble: QRect) -> Tuple[QRect, QRect]:
+        """Thumbs up and thumbs down button areas of a bot bubble."""
+        top = bubble.bottom() - self.PADDING_Y - self.BUTTON_SIZE + 1
+        left = bubble.left() + self.PADDING_X
+        return (QRect(left, top, self.BUTTON_SIZE, self.BUTTON_SIZE),
+                QRect(left + self.BUTTON_SIZE + 5, top, self.BUTTON_SIZE, self.BUTTON_SIZE))
+    
+    def sizeHint(self, option, index) -> QSize:
+        # Called for every laid out row on each append, so it only reads the cached layout
+        return self.bubble_layout(self.transcript.message(index.row()))[2]
+    
+    def paint(self, painter, option, index):
+        message = self.transcript.message(index.row())
+        bubble = self.bubble_rect(message, option.rect)
+        painter.drawPixmap(bubble.topLeft(), self.bubble_pixmap(message))
+    
+    def bubble_pixmap(self, message: ChatMessage) -> QPixmap:
+        """Rendered bubble of a message, from QPixmapCache when available."""
+        ratio = self.view.devicePixelRatioF()
+        key = f"chat-bubble-{message.serial}-{self.width}-{message.feedback}-{ratio}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = self.render_bubble(message, ratio)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+    
+    def render_bubble(self, message: ChatMessage, ratio: float) -> QPixmap:
+        """Paint a message's bubble into a new transparent pixmap."""
+        size, text_height, _ = self.bubble_layout(message)
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        bubble = QRect(QPoint(0, 0), size)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.colors["primary"] if message.is_user else self.colors["bot_bubble"])
+        painter.drawRoundedRect(bubble, 18, 18)
+        # Square-ish corner next to the sender's side
+        corner = QRect(bubble.right() - 17, 0, 18, 18) if message.is_user else QRect(0, 0, 18, 18)
+        painter.drawRoundedRect(corner, 4, 4)
+        
+        text_color = QColor(self.colors["user_text"] if message.is_user else self.colors["bot_text"])
+        content = bubble.adjusted(self.PADDING_X, self.PADDING_Y, -self.PADDING_X, -self.PADDING_Y)
+        painter.setPen(text_color)
+        painter.setFont(self.text_font)
+        painter.drawText(QRect(content.left(), content.top(), content.width(), text_height),
+                         Qt.TextWordWrap, message.text)
+        
+        painter.setFont(self.time_font)
+        text_color.setAlphaF(0.7)
+        painter.setPen(text_color)
+        time_rect = QRect(content.left(), content.top() + text_height + self.SPACING,
+                          content.width(), self.time_metrics.height())
+        painter.drawText(time_rect, Qt.AlignRight | Qt.AlignBottom, message.timestamp)
+        
+        if message.reply_to is not None:
+            for button, (feedback, symbol, color) in zip(self.button_rects(bubble), self.FEEDBACK_BUTTONS):
+                if message.feedback == feedback:
+                    highlight = QColor(self.colors[color])
+                    highlight.setAlphaF(0.15)
+                    painter.setPen(Qt.NoPen)
+                    painter.setBrush(highlight)
+                    painter.drawEllipse(button)
+                painter.drawPixmap(button.topLeft(), self.button_pixmap(symbol, color, ratio))
+        painter.end()
+        return pixmap
+    
+    def button_pixmap(self, symbol: str, color: str, ratio: float) -> QPixmap:
+        """Feedback button glyph, rendered once per symbol and pixel ratio."""
+        key = (symbol, ratio)
+        if key not in self.button_pixmaps:
+            pixmap = QPixmap(QSize(self.BUTTON_SIZE, self.BUTTON_SIZE) * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.text_font)
+            painter.setPen(self.colors[color])
+            painter.drawText(QRect(0, 0, self.BUTTON_SIZE, self.BUTTON_SIZE), Qt.AlignCenter, symbol)
+            painter.end()
+            self.button_pixmaps[key] = pixmap
+        return self.button_pixmaps[key]
+    
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Turn clicks on the feedback buttons into feedback_given signals."""
+        message = self.transcript.message(index.row())
+        if message.reply_to is None or event.type() != QEvent.MouseButtonRelease:
+            return False
+        bubble = self.bubble_rect(message, option.rect)
+        for button, (feedback, _, _) in zip(self.button_rects(bubble), self.FEEDBACK_BUTTONS):
+            if button.contains(event.pos()):
+                message.feedback = feedback
+                self.view.update(index)
+                self.feedback_given.emit(message, feedback)
+                return True
+        return False
+
+class ChatArea(QListView):
+    """
+    Virtualized chat transcript: a list view over a TranscriptModel, painted by a MessageDelegate.
+    Only visible messages are painted and at most the model's max_rows are laid
+    out, older messages are paged in when scrolling to the top (or when a
+    history page arrives while the view is at the top).
+    """
+    
+    # (user message, "positive" or "negative")
+    feedback_given = pyqtSignal(str, str)
+    
+    def __init__(self, parent=None, max_rows: int = 200, page_size: int = 50):
+        super().__init__(parent)
+        self.transcript = TranscriptModel(max_rows, page_size, self)
+        self.delegate = MessageDelegate(self)
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the chat area UI."""
+        self.setObjectName("chatArea")
+        self.setModel(self.transcript)
+        self.setItemDelegate(self.delegate)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.Adjust)
+        self.setMouseTracking(True)
+        
+        self.delegate.feedback_given.connect(
+            lambda message, feedback: self.feedback_given.emit(message.reply_to, feedback))
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+        self.transcript.history_loaded.connect(self.on_history_loaded)
+    
+    def resizeEvent(self, event):
+        # Bubble layouts depend on the width, update it before the relayout
+        self.delegate.set_width(self.viewport().width())
+        super().resizeEvent(event)
+    
+    def add_message(self, text: str, is_user: bool = False, timestamp: str = None, reply_to: str = None):
+        """
+        Add a new message to the chat area.
+        
+        Args:
+            text (str): Message text
+            is_user (bool): True for the user's messages, False for the bot's
+            timestamp (str): Time shown under the message, now if None
+            reply_to (str): For bot responses, the user message they answer (enables feedback)
+        
+        Returns:
+            ChatMessage: The added message
+        """
+        message = ChatMessage(text, is_user, timestamp, reply_to)
+        self.transcript.append(message)
+        
+        # Scroll to bottom
+        self.scroll_to_bottom()
+        
+        return message
+    
+    def scroll_to_bottom(self):
+        """Scroll the chat area to the bottom."""
+        self.scrollToBottom()
+    
+    def on_scrolled(self, value: int):
+        """Page older or newer messages into the window at either end of the scroll range."""
+        scroll_bar = self.verticalScrollBar()
+        if value == scroll_bar.minimum() and self.transcript.can_page_back():
+            # Keep the message at the top where it is while rows are added above it
+            top = self.indexAt(QPoint(0, 0))
+            offset = self.visualRect(top).top() if top.isValid() else 0
+            added = self.transcript.page_back()
+            self.scroll_to_row(top.row() + added if top.isValid() else added, offset)
+        elif value == scroll_bar.maximum() and self.transcript.can_page_forward():
+            bottom = self.indexAt(QPoint(0, self.viewport().height() - 1))
+            offset = self.visualRect(bottom).top() if bottom.isValid() else 0
+            dropped = self.transcript.page_forward()
+            if bottom.isValid():
+                self.scroll_to_row(bottom.row() - dropped, offset)
+    
+    def on_history_loaded(self):
+        """Page in a history page that arrived while the view is at the top."""
+        scroll_bar = self.verticalScrollBar()
+        if scroll_bar.value() != scroll_bar.minimum():
+            return
+        # Everything fit in the view, keep showing the newest messages
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.on_scrolled(scroll_bar.minimum())
+        if at_bottom:
+            self.scroll_to_bottom()
+    
+    def scroll_to_row(self, row: int, offset: int):
+        """Scroll so that a row starts offset pixels below the top of the viewport."""
+        self.executeDelayedItemsLayout()
+        index = self.transcript.index(row)
+        self.scrollTo(index, QAbstractItemView.PositionAtTop)
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.value() - offset)
+    
+    def clear(self):
+        """Remove every message."""
+        self.transcript.clear()
+
+class InputArea(QWidget):
+    """
+    Input area with text field and send button.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the input area UI."""
+        # Styled by the application stylesheet (see APP_STYLESHEET)
+        self.setObjectName("inputArea")
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(15, 10, 15, 15)
+        layout.setSpacing(10)
+        
+        # Text input field
+        self.text_input = QLineEdit()
+        self.text_input.setObjectName("messageInput")
+        self.text_input.setPlaceholderText("Type your message here...")
+        
+        # Send button
+        self.send_button = QPushButton("Send")
+        self.send_button.setObjectName("sendButton")
+        
+        # Set fixed height for consistent appearance
+        self.text_input.setFixedHeight(40)
+        self.send_button.setFixedHeight(40)
+        
+        layout.addWidget(self.text_input)
+        layout.addWidget(self.send_button)
+
+class ResponseWorker(QThread):
+    """
+    Background thread that computes chatbot responses.
+    Messages are queued by the GUI thread and handled one at a time in the
+    order they were sent, so responses come back through response_ready in
+    that order too. Feedback and other calls that read or write the learning
+    data go through the same queue, keeping matching, learning, saving and
+    queries off the GUI thread.
+    """
+
+    # (request id, user message, response)
+    response_ready = pyqtSignal(int, str, str)
+    # (callback, result) of a call queued with submit_call
+    call_done = pyqtSignal(object, object)
+
+    def __init__(self, chatbot: ChatbotLogic, parent=None):
+        super().__init__(parent)
+        self.chatbot = chatbot
+        self._requests = queue.Queue()
+        self._next_id = 0
+
+    def submit(self, user_message: str) -> int:
+        """
+        Queue a message for a response.
+
+        Args:
+            user_message (str): User's message
+
+        Returns:
+            int: Request id passed back with the response
+        """
+        request_id = self._next_id
+        self._next_id += 1
+        self._requests.put(("chat", request_id, user_message))
+        return request_id
+
+    def submit_feedback(self, user_message: str, feedback_type: str):
+        """Queue feedback on the response to a message."""
+        self._requests.put(("feedback", user_message, feedback_type))
+
+    def submit_call(self, function, callback, *args):
+        """
+        Queue a call, run on the worker in order with the messages.
+
+        Args:
+            function: Called with args on the worker thread
+            callback: Receives the result through call_done (not called if the call fails)
+        """
+        self._requests.put(("call", function, args, callback))
+
+    def stop(self):
+        """Finish the queued requests and stop the thread."""
+        self._requests.put(None)
+        self.wait()
+
+    def run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            try:
+                if request[0] == "chat":
+                    _, request_id, user_message = request
+                    self.response_ready.emit(request_id, user_message, self.chatbot.get_response(user_message))
+                elif request[0] == "call":
+                    _, function, args, callback = request
+                    self.call_done.emit(callback, function(*args))
+                else:
+                    self.chatbot.provide_feedback(request[1], request[2])
+            except Exception as e:
+                print(f"Warning: Error handling {request[0]} request: {e}")
+                if request[0] == "chat":
+                    self.response_ready.emit(request[1], request[2], self.chatbot.model.fallback_responses[0])
+
+class AI_ChatBot(QMainWindow):
+    """
+    Main AI ChatBot application window with modern messenger-like interface.
+    """
+    
+    def __init__(self, min_response_delay: int = 500, chatbot: ChatbotLogic = None):
+        """
+        Create the window and start the response worker.
+
+        Args:
+            min_response_delay (int): Minimum milliseconds between sending a message and
+                showing its response, for a natural typing feel (0 shows it as soon as it is ready)
+            chatbot (ChatbotLogic): Chatbot to talk to, a default one is created if None
+        """
+        super().__init__()
+        self.chatbot = chatbot or ChatbotLogic()
+        self.min_response_delay = min_response_delay
+        
+        # Responses are computed on the worker and shown in order once their delay has passed
+        self.response_worker = ResponseWorker(self.chatbot)
+        self.pending_responses = deque()
+        self.sent_times = {}
+        self.response_timer = QTimer(self)
+        self.response_timer.setSingleShot(True)
+        
+        self.setup_ui()
+        self.setup_connections()
+        self.response_worker.start()
+        self.restore_history()
+        self.show_welcome_message()
+    
+    def setup_ui(self):
+        """Setup the main application UI."""
+        # Application stylesheet shared by every widget, installed before they are created
+        apply_theme(QApplication.instance())
+        
+        self.setWindowTitle("AI ChatBot - Learning Edition")
+        self.setMinimumSize(800, 600)
+        self.resize(900, 700)
+        
+        # Set window icon (optional)
+        # self.setWindowIcon(QIcon("icon.png"))
+        
+        # Setup menu bar
+        self.setup_menu_bar()
+        
+        # Central widget
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        # Main layout
+        main_layout = QVBoxLayout(central_widget)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(0)
+        
+        # Header
+        self.setup_header(main_layout)
+        
+        # Chat area with scroll
+        self.setup_chat_area(main_layout)
+        
+        # Input area
+        self.input_area = InputArea()
+        main_layout.addWidget(self.input_area)
+    
+    def setup_menu_bar(self):
+        """Setup the application menu bar with learning options."""
+        menubar = self.menuBar()
+        
+        # Learning menu
+        learning_menu = menubar.addMenu('🤖 Learning')
+        
+        # Show statistics action
+        stats_action = learning_menu.addAction('📊 Show Statistics')
+        stats_action.triggered.connect(self.show_learning_stats)
+        
+        # Reset learning action
+        reset_action = learning_menu.addAction('🔄 Reset Learning')
+        reset_action.triggered.connect(self.reset_learning)
+        
+        # Separator
+        learning_menu.addSeparator()
+        
+        # About action
+        about_action = learning_menu.addAction('ℹ️ About Learning')
+        about_action.triggered.connect(self.show_learning_info)
+    
+    def setup_header(self, parent_layout):
+        """Setup the application header."""
+        header = QWidget()
+        header.setObjectName("header")
+        header.setFixedHeight(60)
+        
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(20, 0, 20, 0)
+        
+        # Title
+        title_label = QLabel("AI ChatBot")
+        title_label.setObjectName("titleLabel")
+        
+        # Status indicator
+        status_label = QLabel("● Online")
+        status_label.setObjectName("statusLabel")
+        status_label.setProperty("online", True)
+        
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        header_layout.addWidget(status_label)
+        
+        parent_layout.addWidget(header)
+    
+    def setup_chat_area(self, parent_layout):
+        """Setup the virtualized chat transcript."""
+        self.chat_area = ChatArea()
+        parent_layout.addWidget(self.chat_area)
+    
+    def setup_connections(self):
+        """Setup signal connections."""
+        # Connect send button
+        self.input_area.send_button.clicked.connect(self.send_message)
+        
+        # Connect enter key in text input
+        self.input_area.text_input.returnPressed.connect(self.send_message)
+        
+        # Connect text changed to enable/disable send button
+        self.input_area.text_input.textChanged.connect(self.on_text_changed)
+        
+        # Responses from the worker thread (queued connection, delivered on the GUI thread)
+        self.response_worker.response_ready.connect(self.queue_bot_response)
+        self.response_worker.call_done.connect(self.finish_call)
+        self.response_timer.timeout.connect(self.release_bot_responses)
+        
+        # Feedback buttons on the bot's responses
+        self.chat_area.feedback_given.connect(self.handle_feedback)
+    
+    def on_text_changed(self, text):
+        """Handle text input changes."""
+        # Enable/disable send button based on text content
+        self.input_area.send_button.setEnabled(bool(text.strip()))
+    
+    def send_message(self):
+        """Send the current message."""
+        text = self.input_area.text_input.text().strip()
+        if not text:
+            return
+        
+        # Add user message to chat
+        self.add_user_message(text)
+        
+        # Clear input field
+        self.input_area.text_input.clear()
+        
+        # Get bot response
+        self.get_bot_response(text)
+    
+    def add_user_message(self, text: str):
+        """Add a user message to the chat."""
+        self.chat_area.add_message(text, is_user=True)
+    
+    def add_bot_message(self, text: str, user_message: str = None):
+        """Add a bot message to the chat, with feedback buttons if it answers user_message."""
+        self.chat_area.add_message(text, is_user=False, reply_to=user_message)
+    
+    def handle_feedback(self, user_message: str, feedback_type: str):
+        """Handle user feedback on the response to a message."""
+        self.response_worker.submit_feedback(user_message, feedback_type)
+        print(f"Feedback recorded: {feedback_type} for response to '{user_message}'")
+    
+    def finish_call(self, callback, result):
+        """Hand the result of a call queued on the response worker to its callback (GUI thread)."""
+        callback(result)
+    
+    def show_learning_stats(self):
+        """Query the learning statistics on the response worker, they are shown when ready."""
+        self.response_worker.submit_call(self.chatbot.get_conversation_stats, self.display_learning_stats)
+    
+    def display_learning_stats(self, stats: Dict[str, Any]):
+        """Show learning statistics and insights."""
+        
+        stats_text = f"""
+🤖 ChatBot Learning Statistics:
+
+📊 Total Conversations: {stats['total_conversations']}
+👍 Positive Feedback: {stats['feedback_stats']['positive']}
+👎 Negative Feedback: {stats['feedback_stats']['negative']}
+📝 Total Feedback: {stats['feedback_stats']['total_feedback']}
+
+👤 User Preferences:
+"""
+        
+        for pref, count in stats['user_preferences'].items():
+            if pref == "likes_jokes":
+                stats_text += f"• Loves Jokes: {count} times\n"
+            elif pref == "needs_motivation":
+                stats_text += f"• Needs Motivation: {count} times\n"
+            else:
+                stats_text += f"• {pref}: {count} times\n"
+        
+        stats_text += f"\n🕒 Last Updated: {stats['last_updated']}"
+        
+        # Show stats in a simple message box
+        from PyQt5.QtWidgets import QMessageBox
+        msg = QMessageBox()
+        msg.setWindowTitle("Learning Statistics")
+        msg.setText(stats_text)
+        msg.exec_()
+    
+    def reset_learning(self):
+        """Reset all learning data."""
+        from PyQt5.QtWidgets import QMessageBox
+        reply = QMessageBox.question(self, 'Reset Learning', 
+                                   'Are you sure you want to reset all learning data? This cannot be undone.',
+                                   QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        
+        if reply == QMessageBox.Yes:
+            # The history shown so far stays, there is nothing older to load anymore
+            self.chat_area.transcript.set_history_loader(None)
+            self.response_worker.submit_call(self.chatbot.reset_learning, self.learning_reset)
+    
+    def learning_reset(self, _):
+        """Confirm that the response worker has reset the learning data."""
+        from PyQt5.QtWidgets import QMessageBox
+        QMessageBox.information(self, 'Learning Reset', 'All learning data has been reset successfully!')
+    
+    def show_learning_info(self):
+        """Show information about the learning capabilities."""
+        info_text = """
+🤖 AI ChatBot Learning Features:
+
+✨ **Conversation Memory**: Remembers all your conversations
+👤 **User Preferences**: Learns what you like (jokes, motivation, etc.)
+📊 **Feedback System**: Use 👍/👎 buttons to rate responses
+🔄 **Continuous Improvement**: Gets better with each conversation
+💾 **Persistent Learning**: Saves data between sessions
+
+🎯 **How to Use**:
+• Chat normally with the bot
+• Use 👍/👎 buttons on bot responses
+• Check statistics in Learning menu
+• Reset learning if needed
+
+The more you chat and provide feedback, the smarter the bot becomes! 🚀
+"""
+        
+        from PyQt5.QtWidgets import QMessageBox
+        msg = QMessageBox()
+        msg.setWindowTitle("About Learning Features")
+        msg.setText(info_text)
+        msg.exec_()
+    
+    def get_bot_response(self, user_message: str):
+        """Queue the message on the response worker."""
+        request_id = self.response_worker.submit(user_message)
+        self.sent_times[request_id] = time.monotonic()
+    
+    def queue_bot_response(self, request_id: int, user_message: str, response: str):
+        """Hold a finished response until its minimum delay has passed."""
+        # Simulate typing delay for more natural feel
+        due = self.sent_times.pop(request_id) + self.min_response_delay / 1000
+        self.pending_responses.append((due, user_message, response))
+        self.release_bot_responses()
+    
+    def release_bot_responses(self):
+        """Display every pending response that is due, in the order the messages were sent."""
+        now = time.monotonic()
+        while self.pending_responses and self.pending_responses[0][0] <= now:
+            _, user_message, response = self.pending_responses.popleft()
+            self.display_bot_response(user_message, response)
+        
+        if self.pending_responses:
+            self.response_timer.start(max(0, int((self.pending_responses[0][0] - now) * 1000) + 1))
+    
+    def display_bot_response(self, user_message: str, response: str):
+        """Display the bot's response."""
+        self.last_user_message = user_message
+        self.last_bot_response = response
+        self.add_bot_message(response, user_message)
+    
+    def restore_history(self):
+        """Start loading the latest past conversations, older ones are loaded when scrolling up."""
+        self.chat_area.transcript.set_history_loader(self.load_history_page)
+        self.chat_area.transcript.page_back()
+    
+    def load_history_page(self, before, limit: int, done):
+        """
+        Load a page of past conversations on the response worker.
+        
+        Args:
+            before: Position to load conversations before, None for the newest
+            limit (int): Maximum number of conversations
+            done: Receives the result of history_messages on the GUI thread
+        """
+        self.response_worker.submit_call(self.history_messages, done, before, limit)
+    
+    def history_messages(self, before, limit: int) -> Tuple:
+        """
+        Turn a page of past conversations into transcript messages (runs on the response worker).
+        
+        Args:
+            before: Position to load conversations before, None for the newest
+            limit (int): Maximum number of conversations
+        
+        Returns:
+            Tuple: Position of the oldest conversation (None if there are none) and
+                the messages, oldest first
+        """
+        try:
+            page = self.chatbot.get_history_page(before, limit)
+        except Exception as e:
+            print(f"Warning: Could not load the conversation history: {e}")
+            return None, []
+        messages = []
+        for _, entry in page:
+            timestamp = self.format_history_time(entry.get("timestamp"))
+            user_input = entry.get("user_input", "")
+            messages.append(ChatMessage(user_input, True, timestamp))
+            if entry.get("bot_response"):
+                response = ChatMessage(entry["bot_response"], False, timestamp, user_input)
+                response.feedback = entry.get("feedback") or self.chatbot.response_feedback.get(user_input)
+                messages.append(response)
+        return (page[0][0] if page else None), messages
+    
+    @staticmethod
+    def format_history_time(timestamp: str) -> str:
+        """Format a stored ISO timestamp, with the date unless it is today."""
+        try:
+            sent = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            return timestamp or "--:--"
+        if sent.date() == datetime.now().date():
+            return sent.strftime("%H:%M")
+        return sent.strftime("%d %b %H:%M")
+    
+    def show_welcome_message(self):
+        """Show welcome message when app starts."""
+        welcome_msg = self.chatbot.get_welcome_message()
+        QTimer.singleShot(100, lambda: self.add_bot_message(welcome_msg))
+    
+    def keyPressEvent(self, event):
+        """Handle key press events."""
+        if event.key() == Qt.Key_Escape:
+            self.close()
+        else:
+            super().keyPressEvent(event)
+    
+    def closeEvent(self, event):
+        """Finish queued messages and flush learning data to disk before the window closes."""
+        self.response_worker.stop()
+        self.chatbot.close()
+        super().closeEvent(event)
+
+def main():
+    """Main application entry point."""
+    app = QApplication(sys.argv)
+    
+    # Set application properties
+    app.setApplicationName("AI ChatBot")
+    app.setApplicationVersion("1.0")
+    app.setOrganizationName("AI ChatBot")
+    
+    # Create and show main window
+    window = AI_ChatBot()
+    window.show()
+    
+    # Start the application event loop
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    main()
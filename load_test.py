@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Load generator for chatbot_server.py.
+Opens many concurrent connections (HTTP keep-alive or WebSocket), each one
+chatting as its own session, and reports throughput and latency percentiles.
+
+Start the server first:
+    python chatbot_server.py
+    python load_test.py --connections 32 --requests 5000
+
+With a pre-forked server (--workers N), --affine connects every session
+straight to the worker that owns it instead of the shared port.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from chatbot_server import HttpClient, encode_frame, read_frame, session_shard
+
+SAMPLE_MESSAGES = [
+    "Hello", "How are you?", "Tell me a joke", "I'm feeling sad", "What can you do?",
+    "Thank you so much", "kaise ho dost", "I need motivation", "qwerty asdf", "Bye"
+]
+
+
+class WebSocketClient:
+    """Minimal WebSocket client exchanging JSON text frames."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        self.writer.write((f"GET /ws HTTP/1.1\r\n"
+                           f"Host: {self.host}:{self.port}\r\n"
+                           "Upgrade: websocket\r\n"
+                           "Connection: Upgrade\r\n"
+                           f"Sec-WebSocket-Key: {key}\r\n"
+                           "Sec-WebSocket-Version: 13\r\n\r\n").encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if b" 101 " not in status_line:
+            raise ConnectionError(f"WebSocket handshake failed: {status_line!r}")
+        while (await self.reader.readline()).strip():
+            pass
+
+    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a JSON message and wait for the reply."""
+        self.writer.write(encode_frame(json.dumps(payload).encode('utf-8'), mask=True))
+        await self.writer.drain()
+        while True:
+            opcode, data = await read_frame(self.reader)
+            if opcode == 0x1:
+                return json.loads(data)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.write(encode_frame(b"\x03\xe8", 0x8, mask=True))
+            await self.writer.drain()
+            self.writer.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def send_requests(host: str, port: int, connections: int, requests: int, websocket: bool = False,
+                        first_session: int = 0, worker_ports: Optional[List[int]] = None,
+                        messages: Optional[List[str]] = None) -> Tuple[List[float], int]:
+    """
+    Send chat requests over concurrent connections, one session per connection.
+    With worker_ports, each connection goes to the port of the worker owning its session.
+    The messages (SAMPLE_MESSAGES by default) are sent in turn.
+
+    Returns:
+        Tuple[List[float], int]: Latency of every request in seconds and the number of errors
+    """
+    messages = messages or SAMPLE_MESSAGES
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(index: int, count: int):
+        nonlocal errors
+        session_id = f"load-{index}"
+        if worker_ports:
+            session_port = worker_ports[session_shard(session_id, len(worker_ports))]
+        else:
+            session_port = port
+        client = WebSocketClient(host, session_port) if websocket else HttpClient(host, session_port)
+        await client.connect()
+        try:
+            for i in range(count):
+                payload = {"session": session_id, "message": messages[(index + i) % len(messages)]}
+                start = time.perf_counter()
+                if websocket:
+                    reply = await client.send(dict(payload, type="chat"))
+                    ok = reply.get("status") == 200
+                else:
+                    status, reply = await client.request("POST", "/chat", payload)
+                    ok = status == 200
+                latencies.append(time.perf_counter() - start)
+                if not ok or not reply.get("response"):
+                    errors += 1
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker(first_session + i, count) for i, count in enumerate(split(requests, connections))
+                           if count))
+    return latencies, errors
+
+
+def split(total: int, parts: int) -> List[int]:
+    """Split total into parts that differ by at most one."""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles (in milliseconds) of a load test."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000
+    }
+
+
+async def run_load(host: str, port: int, connections: int = 32, requests: int = 2000,
+                   websocket: bool = False, worker_ports: Optional[List[int]] = None,
+                   messages: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Send chat requests over concurrent connections.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        connections (int): Number of concurrent connections, one session each
+        requests (int): Total number of chat requests
+        websocket (bool): Use WebSocket instead of HTTP
+        worker_ports (Optional[List[int]]): Ports of a pre-forked server's workers (from /stats),
+            to send each session to its owner instead of port
+        messages (Optional[List[str]]): Chat messages to send in turn, SAMPLE_MESSAGES by default
+
+    Returns:
+        Dict[str, Any]: Request count, errors, throughput and latency percentiles in milliseconds
+    """
+    start = time.perf_counter()
+    latencies, errors = await send_requests(host, port, connections, requests, websocket, 0, worker_ports, messages)
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def _send_requests_process(host: str, port: int, connections: int, requests: int, websocket: bool,
+                           first_session: int, worker_ports: Optional[List[int]]) -> Tuple[List[float], int]:
+    """Client process entry point for run_load_processes."""
+    return asyncio.run(send_requests(host, port, connections, requests, websocket, first_session, worker_ports))
+
+
+def run_load_processes(host: str, port: int, connections: int = 32, requests: int = 2000,
+                       websocket: bool = False, processes: int = 2,
+                       worker_ports: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Like run_load, but spread the connections over several client processes,
+    so the load generator is not the bottleneck when the server has several workers.
+    """
+    connection_counts = split(connections, processes)
+    request_counts = split(requests, processes)
+    jobs = [(host, port, connection_counts[i], request_counts[i], websocket, sum(connection_counts[:i]), worker_ports)
+            for i in range(processes) if connection_counts[i]]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(len(jobs)) as pool:
+        results = pool.starmap(_send_requests_process, jobs)
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for result_latencies, _ in results for latency in result_latencies]
+    return summarize(latencies, sum(errors for _, errors in results), elapsed)
+
+
+def print_report(result: Dict[str, Any], stats: Dict[str, Any] = None):
+    """Print load test results."""
+    print(f"📨 Requests:   {result['requests']} ({result['errors']} errors) in {result['seconds']:.2f}s")
+    print(f"🚀 Throughput: {result['throughput']:.0f} requests/s")
+    print(f"⏱️ Latency:    p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, max {result['max_ms']:.1f} ms")
+    if stats:
+        scope = f" on worker {stats['worker']}" if "worker" in stats else ""
+        print(f"📦 Batches{scope}: {stats['batches']} (average {stats['average_batch']:.1f} requests)")
+
+
+async def get_stats(host: str, port: int) -> Dict[str, Any]:
+    """Fetch /stats from the server."""
+    client = HttpClient(host, port)
+    await client.connect()
+    _, stats = await client.request("GET", "/stats")
+    await client.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running chatbot_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent connections (one session each)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total chat requests")
+    parser.add_argument("--websocket", action="store_true", help="Use WebSocket instead of HTTP")
+    parser.add_argument("--processes", type=int, default=1, help="Client processes generating the load")
+    parser.add_argument("--affine", action="store_true",
+                        help="Send each session to its worker's own port (server started with --workers)")
+    args = parser.parse_args()
+
+    print("🤖 AI ChatBot Server Load Test")
+    print("=" * 50)
+    worker_ports = None
+    if args.affine:
+        worker_ports = asyncio.run(get_stats(args.host, args.port)).get("worker_ports")
+        if not worker_ports:
+            print("Warning: The server has no worker ports, sending everything to the shared port")
+    if args.processes > 1:
+        result = run_load_processes(args.host, args.port, args.connections, args.requests, args.websocket,
+                                    args.processes, worker_ports)
+    else:
+        result = asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.websocket,
+                                      worker_ports))
+    print_report(result, asyncio.run(get_stats(args.host, args.port)))
+    sys.exit(0 if result["errors"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
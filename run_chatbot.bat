@@ -1,10 +1,10 @@
-@echo off
-echo Starting AI ChatBot...
-echo.
-echo If this is your first time running the app, you may need to:
-echo 1. Install dependencies: pip install -r requirements.txt
-echo 2. Setup NLTK data: python setup_nltk.py
-echo.
-echo Starting the application...
-python chatbot_ui.py
-pause
+@echo off
+echo Starting AI ChatBot...
+echo.
+echo If this is your first time running the app, you may need to:
+echo 1. Install dependencies: pip install -r requirements.txt
+echo 2. Setup NLTK data: python setup_nltk.py
+echo.
+echo Starting the application...
+python chatbot_ui.py
+pause
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's asyncio API.
+aget_response must give the same kind of answers as get_response, inline or in an executor.
+"""
+
+import asyncio
+import os
+import tempfile
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore, BackgroundLearningWriter
+
+async def chat(chatbot: ChatbotLogic, messages):
+    """Send all messages concurrently and give feedback on the first one."""
+    responses = await asyncio.gather(*(chatbot.aget_response(message) for message in messages))
+    await chatbot.aprovide_feedback(messages[0], "positive")
+    return responses
+
+def test_async_api():
+    """Run aget_response inline on the loop and in the executor."""
+    print("🤖 Testing AI ChatBot Asyncio API")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    messages = ["Tell me a joke", "Hello", "I'm feeling sad", ""] * 25
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for inline_patterns, background_writes in ((100000, True), (0, True), (100000, False)):
+            snapshot_file = os.path.join(tmp_dir, f"learning_{inline_patterns}_{background_writes}.json")
+            store = JournalLearningStore(snapshot_file)
+            if background_writes:
+                store = BackgroundLearningWriter(store)
+            chatbot = ChatbotLogic(model=model, learning_store=store, async_inline_patterns=inline_patterns)
+            assert chatbot._runs_inline() == (inline_patterns > 0 and background_writes)
+
+            responses = asyncio.run(chat(chatbot, messages))
+            assert responses[3] == "Please say something!"
+            assert all(responses)
+
+            stats = chatbot.get_conversation_stats()
+            assert stats["total_conversations"] == 75
+            assert stats["user_preferences"] == {"likes_jokes": 25, "needs_motivation": 25}
+            assert stats["feedback_stats"]["positive"] == 1
+            chatbot.close()
+
+    print("✅ Inline and executor responses learned from")
+
+if __name__ == "__main__":
+    test_async_api()
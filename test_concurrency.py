@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Stress test for calling the AI ChatBot from many threads at once.
+No learning update may be lost and the learning file must stay valid JSON.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore, BackgroundLearningWriter
+
+MESSAGES = ["Tell me a joke", "I'm feeling sad", "Hello", "Something funny please", "I need motivation"]
+
+def run_concurrent_chat(background_writes: bool, calls: int = 2000, threads: int = 16):
+    """Send calls messages from a thread pool and check the learned data."""
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_file = os.path.join(tmp_dir, "chatbot_learning.json")
+        # A small compact_every makes snapshots happen while other threads are writing
+        store = JournalLearningStore(snapshot_file, compact_every=50)
+        if background_writes:
+            store = BackgroundLearningWriter(store)
+        chatbot = ChatbotLogic(model=model, learning_store=store)
+
+        inputs = [MESSAGES[i % len(MESSAGES)] for i in range(calls)]
+
+        # Switch threads as often as possible to provoke races
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                responses = list(executor.map(chatbot.get_response, inputs))
+                list(executor.map(lambda i: chatbot.provide_feedback(f"message {i}", "positive"), range(200)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        jokes = sum(1 for text in inputs if "joke" in text.lower() or "funny" in text.lower())
+        motivation = sum(1 for text in inputs if "motivation" in text.lower() or "sad" in text.lower())
+
+        assert all(responses)
+        stats = chatbot.get_conversation_stats()
+        assert stats["total_conversations"] == calls
+        assert stats["user_preferences"] == {"likes_jokes": jokes, "needs_motivation": motivation}
+        assert stats["feedback_stats"]["total_feedback"] == 200
+        chatbot.close()
+
+        with open(snapshot_file, 'r', encoding='utf-8') as file:
+            json.load(file)
+        data = JournalLearningStore(snapshot_file).load()
+        assert data["user_preferences"] == {"likes_jokes": jokes, "needs_motivation": motivation}
+        assert len(data["response_feedback"]) == 200
+        assert len(data["conversation_history"]) == 100
+
+def test_concurrent_get_response():
+    """Many threads chatting with one chatbot, writes on the caller's threads."""
+    print("🤖 Testing AI ChatBot Concurrent Requests")
+    print("=" * 50)
+    run_concurrent_chat(background_writes=False)
+    print("✅ No lost updates, learning file intact")
+
+def test_concurrent_get_response_background_writer():
+    """Many threads chatting with one chatbot, writes on the background thread."""
+    print("🤖 Testing AI ChatBot Concurrent Requests (background writer)")
+    print("=" * 50)
+    run_concurrent_chat(background_writes=True)
+    print("✅ No lost updates, learning file intact")
+
+def write_version(intents_file: str, responses_file: str, version: int):
+    """Write intents and responses whose every answer names the version."""
+    with open(responses_file, 'r', encoding='utf-8') as file:
+        responses = json.load(file)
+    responses["fallback_responses"] = [f"fallback {version}"]
+    with open(responses_file, 'w', encoding='utf-8') as file:
+        json.dump(responses, file)
+    intents = {"intents": [{"tag": "greeting", "patterns": ["hello"], "responses": [f"hello {version}"]}]}
+    with open(intents_file, 'w', encoding='utf-8') as file:
+        json.dump(intents, file)
+
+def test_reload_while_responding():
+    """Reload the model over and over while a thread pool answers batches."""
+    print("🤖 Testing AI ChatBot Reload During Requests")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+        responses_file = os.path.join(tmp_dir, "responses.json")
+        with open("responses.json", 'r', encoding='utf-8') as source, \
+                open(responses_file, 'w', encoding='utf-8') as target:
+            target.write(source.read())
+        write_version(intents_file, responses_file, 0)
+        model = ChatbotModel(intents_file, responses_file=responses_file)
+        chatbot = ChatbotLogic(model=model, learning_store=JournalLearningStore(os.path.join(tmp_dir, "learning.json")))
+
+        # An old snapshot keeps answering from the data it was compiled from
+        snapshot = model.snapshot
+        write_version(intents_file, responses_file, 1)
+        assert model.reload_intents()
+        assert chatbot.respond("hello", learn=False, snapshot=snapshot)["response"] == "hello 0"
+        assert chatbot.respond("hello", learn=False)["response"] == "hello 1"
+
+        stop = threading.Event()
+
+        def reload_forever():
+            version = 2
+            while not stop.is_set():
+                write_version(intents_file, responses_file, version)
+                model.reload_intents(incremental=version % 2 == 0)
+                version += 1
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        reloader = threading.Thread(target=reload_forever)
+        reloader.start()
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                batches = list(executor.map(lambda _: chatbot.get_responses(["hello", "what is this"], learn=False),
+                                            range(1000)))
+        finally:
+            stop.set()
+            reloader.join()
+            sys.setswitchinterval(switch_interval)
+
+        # Both answers of a batch come from the same version of the model
+        versions = set()
+        for greeting, fallback in batches:
+            version = greeting["response"].split()[-1]
+            assert greeting["response"] == f"hello {version}"
+            assert fallback["response"] == f"fallback {version}"
+            versions.add(version)
+        chatbot.close()
+    print(f"✅ 1000 batches answered from {len(versions)} model versions, never a mix")
+
+if __name__ == "__main__":
+    test_concurrent_get_response()
+    test_concurrent_get_response_background_writer()
+    test_reload_while_responding()
@@ -1,61 +1,112 @@
-#!/usr/bin/env python3
-"""
-Test script to test the AI ChatBot's improved Hinglish understanding.
-This script tests various Hinglish inputs to see how well the bot understands them.
-"""
-
-from chatbot_logic import ChatbotLogic
-
-def test_hinglish_understanding():
-    """Test the chatbot's Hinglish understanding capabilities."""
-    print("🤖 Testing AI ChatBot Hinglish Understanding")
-    print("=" * 60)
-    
-    # Initialize chatbot
-    chatbot = ChatbotLogic()
-    
-    # Test cases with Hinglish input
-    test_cases = [
-        "Hello dost, kaise ho?",
-        "Kya haal hai yaar?",
-        "Joke sunao please",
-        "Mujhe hasao yaar",
-        "I'm feeling sad, mujhe motivate kar",
-        "Udaas hoon dost, kuch bolo",
-        "Tension hai yaar, help kar",
-        "Shukriya dost, bahut help kiya tune",
-        "Alvida dost, phir milenge",
-        "Kya kar raha hai tu?",
-        "Sab badhiya dost?",
-        "Kaise ho aap?",
-        "Kya haal chaal hai?",
-        "Mujhe cheer up kar",
-        "Mujhe inspire kar dost",
-        "Kuch interesting bolo",
-        "Boring lag raha hai",
-        "Time pass kar yaar",
-        "Kya chal raha hai?",
-        "Mausam kaisa hai?"
-    ]
-    
-    print("Testing various Hinglish inputs:\n")
-    
-    for i, test_input in enumerate(test_cases, 1):
-        print(f"{i:2d}. Input: {test_input}")
-        response = chatbot.get_response(test_input)
-        print(f"    Response: {response}")
-        print()
-    
-    # Test learning capabilities
-    print("Testing learning capabilities:")
-    stats = chatbot.get_conversation_stats()
-    print(f"📊 Total Conversations: {stats['total_conversations']}")
-    print(f"👤 User Preferences: {stats['user_preferences']}")
-    
-    print("\n" + "=" * 60)
-    print("✅ Hinglish understanding test completed!")
-    print("💡 The chatbot now understands Hinglish much better!")
-    print("🚀 Try chatting with it in Hinglish - it should work much better now!")
-
-if __name__ == "__main__":
-    test_hinglish_understanding()
+#!/usr/bin/env python3
+"""
+Test script to test the AI ChatBot's improved Hinglish understanding.
+This script tests various Hinglish inputs to see how well the bot understands them,
+and checks that shortcut phrases are matched in priority order.
+"""
+
+import json
+import os
+import random
+import tempfile
+
+from chatbot_logic import ChatbotLogic
+from chatbot_phrases import PhraseMatcher
+from chatbot_storage import JournalLearningStore
+
+def first_phrase_in_order(phrases, text):
+    """The substring loop the phrase matcher replaced: first listed phrase contained in the text."""
+    for phrase, value in phrases:
+        if phrase and phrase in text:
+            return value
+    return None
+
+def test_hinglish_understanding():
+    """Test the chatbot's Hinglish understanding capabilities."""
+    print("🤖 Testing AI ChatBot Hinglish Understanding")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Initialize chatbot
+        chatbot = ChatbotLogic(learning_store=JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json")))
+
+        # Test cases with Hinglish input
+        test_cases = [
+            "Hello dost, kaise ho?",
+            "Kya haal hai yaar?",
+            "Joke sunao please",
+            "Mujhe hasao yaar",
+            "I'm feeling sad, mujhe motivate kar",
+            "Udaas hoon dost, kuch bolo",
+            "Tension hai yaar, help kar",
+            "Shukriya dost, bahut help kiya tune",
+            "Alvida dost, phir milenge",
+            "Kya kar raha hai tu?",
+            "Sab badhiya dost?",
+            "Kaise ho aap?",
+            "Kya haal chaal hai?",
+            "Mujhe cheer up kar",
+            "Mujhe inspire kar dost",
+            "Kuch interesting bolo",
+            "Boring lag raha hai",
+            "Time pass kar yaar",
+            "Kya chal raha hai?",
+            "Mausam kaisa hai?"
+        ]
+
+        print("Testing various Hinglish inputs:\n")
+
+        for i, test_input in enumerate(test_cases, 1):
+            print(f"{i:2d}. Input: {test_input}")
+            response = chatbot.get_response(test_input)
+            print(f"    Response: {response}")
+            print()
+
+        # Test learning capabilities
+        print("Testing learning capabilities:")
+        stats = chatbot.get_conversation_stats()
+        print(f"📊 Total Conversations: {stats['total_conversations']}")
+        print(f"👤 User Preferences: {stats['user_preferences']}")
+
+        print("\n" + "=" * 60)
+        print("✅ Hinglish understanding test completed!")
+        print("💡 The chatbot now understands Hinglish much better!")
+        print("🚀 Try chatting with it in Hinglish - it should work much better now!")
+
+def test_phrase_priority():
+    """Overlapping phrases must resolve to the earliest listed one, like the old loop."""
+    print("🤖 Testing AI ChatBot Phrase Priority")
+    print("=" * 60)
+
+    phrases = [("kaise ho", "kaise ho"), ("ho", "ho"), ("kya", "kya")]
+    matcher = PhraseMatcher(phrases)
+    # "ho" ends inside "kaise ho", but "kaise ho" is listed first
+    assert matcher.find("arre kaise ho dost") == "kaise ho"
+    # "ho" occurs before "kya" in the text, "kya" is listed after "ho"
+    assert matcher.find("ho gaya kya") == "ho"
+    assert matcher.find("theek hai") is None
+
+    reversed_matcher = PhraseMatcher(list(reversed(phrases)))
+    assert reversed_matcher.find("arre kaise ho dost") == "ho"
+    assert reversed_matcher.find("ho gaya kya") == "kya"
+    print("✅ Earliest listed phrase wins over overlapping and earlier-ending ones")
+
+    # Random overlapping phrases over a small alphabet against the ordered substring loop
+    rng = random.Random(12)
+    for _ in range(300):
+        phrases = [("".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))), i) for i in range(8)]
+        matcher = PhraseMatcher(phrases)
+        for _ in range(10):
+            text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 12)))
+            assert matcher.find(text) == first_phrase_in_order(phrases, text), (phrases, text)
+
+    with open("responses.json", 'r', encoding='utf-8') as file:
+        phrases = [(entry['phrase'], entry['response']) for entry in json.load(file)['hinglish_phrases']]
+    matcher = PhraseMatcher(phrases)
+    for text in ["kaise ho yaar kya haal hai", "namaste ji, aap kaise hain", "bas ho gaya", "kya chal raha hai"]:
+        assert matcher.find(text) == first_phrase_in_order(phrases, text), text
+    print("✅ Same results as the ordered substring loop on random and real phrase lists")
+
+if __name__ == "__main__":
+    test_hinglish_understanding()
+    test_phrase_priority()
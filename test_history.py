@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's in-memory conversation history.
+The ring buffer must keep only the newest conversations, in order, and
+be paged back through when the store cannot page its history.
+"""
+
+import os
+import tempfile
+
+from chatbot_history import ConversationHistory, ConversationRecord
+from chatbot_logic import ChatbotLogic
+from chatbot_storage import JournalLearningStore
+
+def test_ring_buffer_history():
+    """Fill the buffer past its capacity and check what is kept."""
+    print("🤖 Testing AI ChatBot Conversation History")
+    print("=" * 50)
+
+    entries = [{"timestamp": f"t{i}", "user_input": f"message {i}", "bot_response": "ok"} for i in range(3)]
+    history = ConversationHistory(capacity=5, entries=entries)
+    assert len(history) == 3
+    assert [record.user_input for record in history] == ["message 0", "message 1", "message 2"]
+    print("✅ Loaded entries kept in order")
+
+    for i in range(3, 12):
+        history.append(ConversationRecord(f"t{i}", f"message {i}", "ok"))
+
+    assert len(history) == 5
+    assert history.total == 12
+    assert [record.user_input for record in history] == [f"message {i}" for i in range(7, 12)]
+    assert [entry["user_input"] for entry in history.to_dicts(2)] == ["message 10", "message 11"]
+    assert history.to_dicts()[0] == {"timestamp": "t7", "user_input": "message 7",
+                                     "bot_response": "ok", "feedback": None}
+    print("✅ Oldest conversations overwritten, total still counted")
+
+    history.clear()
+    assert len(history) == 0 and history.total == 0 and history.to_dicts() == []
+    print("✅ History cleared")
+
+def test_history_pages():
+    """Page back through the in-memory history of a journal-backed chatbot."""
+    print("🤖 Testing AI ChatBot History Pages")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json"))
+        chatbot = ChatbotLogic(learning_store=store, history_capacity=10)
+        for i in range(15):
+            chatbot.respond(f"message {i}")
+
+        page = chatbot.get_history_page(limit=4)
+        assert [position for position, _ in page] == [11, 12, 13, 14]
+        assert [entry["user_input"] for _, entry in page] == [f"message {i}" for i in range(11, 15)]
+        page = chatbot.get_history_page(before=page[0][0], limit=4)
+        assert [entry["user_input"] for _, entry in page] == [f"message {i}" for i in range(7, 11)]
+        page = chatbot.get_history_page(before=page[0][0], limit=4)
+        assert [position for position, _ in page] == [5, 6]
+        assert chatbot.get_history_page(before=5) == []
+        chatbot.close()
+        print("✅ Paged back to the oldest conversation kept in memory")
+
+if __name__ == "__main__":
+    test_ring_buffer_history()
+    test_history_pages()
@@ -1,90 +1,130 @@
-#!/usr/bin/env python3
-"""
-Test script to demonstrate the AI ChatBot's learning capabilities.
-This script shows how the chatbot learns from conversations and user feedback.
-"""
-
-from chatbot_logic import ChatbotLogic
-import json
-
-def test_learning_capabilities():
-    """Test the chatbot's learning features."""
-    print("🤖 Testing AI ChatBot Learning Capabilities")
-    print("=" * 50)
-    
-    # Initialize chatbot
-    chatbot = ChatbotLogic()
-    
-    # Test 1: Basic conversation
-    print("\n1️⃣ Testing basic conversation...")
-    user_input = "Hello"
-    response = chatbot.get_response(user_input)
-    print(f"User: {user_input}")
-    print(f"Bot: {response}")
-    
-    # Test 2: Joke conversation (should increase joke preference)
-    print("\n2️⃣ Testing joke preference learning...")
-    user_input = "Tell me a joke"
-    response = chatbot.get_response(user_input)
-    print(f"User: {user_input}")
-    print(f"Bot: {response}")
-    
-    # Test 3: Another joke (should further increase preference)
-    print("\n3️⃣ Testing joke preference increase...")
-    user_input = "Another joke please"
-    response = chatbot.get_response(user_input)
-    print(f"User: {user_input}")
-    print(f"Bot: {response}")
-    
-    # Test 4: Motivation conversation
-    print("\n4️⃣ Testing motivation preference learning...")
-    user_input = "I'm feeling sad"
-    response = chatbot.get_response(user_input)
-    print(f"User: {user_input}")
-    print(f"Bot: {response}")
-    
-    # Test 5: Provide feedback
-    print("\n5️⃣ Testing feedback system...")
-    chatbot.provide_feedback("Tell me a joke", "positive")
-    chatbot.provide_feedback("I'm feeling sad", "positive")
-    print("✅ Feedback provided for jokes and motivation")
-    
-    # Test 6: Show learning statistics
-    print("\n6️⃣ Learning Statistics:")
-    stats = chatbot.get_conversation_stats()
-    print(f"📊 Total Conversations: {stats['total_conversations']}")
-    print(f"👤 User Preferences: {stats['user_preferences']}")
-    print(f"📝 Feedback Stats: {stats['feedback_stats']}")
-    
-    # Test 7: Test personalized responses
-    print("\n7️⃣ Testing personalized responses...")
-    user_input = "I need motivation"
-    response = chatbot.get_response(user_input)
-    print(f"User: {user_input}")
-    print(f"Bot: {response}")
-    
-    print("\n" + "=" * 50)
-    print("✅ Learning capabilities test completed!")
-    print("💡 The chatbot now remembers your preferences and can provide personalized responses!")
-    
-    return chatbot
-
-def show_learning_file():
-    """Show the contents of the learning data file."""
-    try:
-        with open("chatbot_learning.json", "r", encoding="utf-8") as file:
-            data = json.load(file)
-            print("\n📁 Learning Data File Contents:")
-            print(json.dumps(data, indent=2, ensure_ascii=False))
-    except FileNotFoundError:
-        print("\n📁 Learning data file not found yet. It will be created after conversations.")
-
-if __name__ == "__main__":
-    # Test the learning capabilities
-    chatbot = test_learning_capabilities()
-    
-    # Show the learning data file
-    show_learning_file()
-    
-    print("\n🚀 To see the full learning interface, run: python chatbot_ui.py")
-    print("💡 Use the 👍/👎 buttons to provide feedback and watch the bot learn!")
+#!/usr/bin/env python3
+"""
+Test script to demonstrate the AI ChatBot's learning capabilities.
+This script shows how the chatbot learns from conversations and user feedback,
+and checks that batched responses learn exactly like single ones.
+"""
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore
+import json
+import os
+import random
+import tempfile
+
+BATCH_MESSAGES = ["Tell me a joke", "kya haal hai 😊", "I'm feeling sad", "", "Tell me a joke",
+                  "I need motivation", "Something funny please", "what is this", "Bye"]
+
+def test_learning_capabilities():
+    """Test the chatbot's learning features."""
+    print("🤖 Testing AI ChatBot Learning Capabilities")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Initialize chatbot
+        chatbot = ChatbotLogic(learning_store=JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json")))
+
+        # Test 1: Basic conversation
+        print("\n1️⃣ Testing basic conversation...")
+        user_input = "Hello"
+        response = chatbot.get_response(user_input)
+        print(f"User: {user_input}")
+        print(f"Bot: {response}")
+
+        # Test 2: Joke conversation (should increase joke preference)
+        print("\n2️⃣ Testing joke preference learning...")
+        user_input = "Tell me a joke"
+        response = chatbot.get_response(user_input)
+        print(f"User: {user_input}")
+        print(f"Bot: {response}")
+
+        # Test 3: Another joke (should further increase preference)
+        print("\n3️⃣ Testing joke preference increase...")
+        user_input = "Another joke please"
+        response = chatbot.get_response(user_input)
+        print(f"User: {user_input}")
+        print(f"Bot: {response}")
+
+        # Test 4: Motivation conversation
+        print("\n4️⃣ Testing motivation preference learning...")
+        user_input = "I'm feeling sad"
+        response = chatbot.get_response(user_input)
+        print(f"User: {user_input}")
+        print(f"Bot: {response}")
+
+        # Test 5: Provide feedback
+        print("\n5️⃣ Testing feedback system...")
+        chatbot.provide_feedback("Tell me a joke", "positive")
+        chatbot.provide_feedback("I'm feeling sad", "positive")
+        print("✅ Feedback provided for jokes and motivation")
+
+        # Test 6: Show learning statistics
+        print("\n6️⃣ Learning Statistics:")
+        stats = chatbot.get_conversation_stats()
+        print(f"📊 Total Conversations: {stats['total_conversations']}")
+        print(f"👤 User Preferences: {stats['user_preferences']}")
+        print(f"📝 Feedback Stats: {stats['feedback_stats']}")
+
+        # Test 7: Test personalized responses
+        print("\n7️⃣ Testing personalized responses...")
+        user_input = "I need motivation"
+        response = chatbot.get_response(user_input)
+        print(f"User: {user_input}")
+        print(f"Bot: {response}")
+
+        print("\n" + "=" * 50)
+        print("✅ Learning capabilities test completed!")
+        print("💡 The chatbot now remembers your preferences and can provide personalized responses!")
+
+        # Show the learning data written to disk
+        chatbot.close()
+        show_learning_data(os.path.join(tmp_dir, "chatbot_learning.json"))
+
+def test_batch_responses():
+    """Compare get_responses with one respond call per message."""
+    print("🤖 Testing AI ChatBot Batch Responses")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def new_chatbot(name: str) -> ChatbotLogic:
+            return ChatbotLogic(model=model, learning_store=JournalLearningStore(os.path.join(tmp_dir, name)))
+
+        # learn=False leaves the learning state untouched
+        chatbot = new_chatbot("untouched.json")
+        chatbot.get_responses(BATCH_MESSAGES * 3, learn=False)
+        assert chatbot.conversation_history.total == 0
+        assert chatbot.user_preferences == {} and chatbot.response_feedback == {}
+        assert chatbot.learning_store.journal_events == 0
+        chatbot.close()
+        assert new_chatbot("untouched.json").learning_data["conversation_history"] == []
+        print("✅ learn=False recorded nothing")
+
+        # Same responses, in order, and the same learned preferences as single calls
+        batched, single = new_chatbot("batched.json"), new_chatbot("single.json")
+        random.seed(7)
+        batch_results = batched.get_responses(BATCH_MESSAGES * 3)
+        random.seed(7)
+        single_results = [single.respond(message) for message in BATCH_MESSAGES * 3]
+        assert batch_results == single_results
+        assert batched.user_preferences == single.user_preferences == {"likes_jokes": 9, "needs_motivation": 6}
+        assert ([record.user_input for record in batched.conversation_history]
+                == [record.user_input for record in single.conversation_history])
+        batched.close()
+        single.close()
+        print(f"✅ {len(batch_results)} batched responses equal the single-call responses")
+
+def show_learning_data(learning_data_file: str):
+    """Show the learning data stored in a learning data file and its journal."""
+    data = JournalLearningStore(learning_data_file).load()
+    print("\n📁 Learning Data File Contents:")
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    # Test the learning capabilities and show the learning data file
+    test_learning_capabilities()
+    test_batch_responses()
+
+    print("\n🚀 To see the full learning interface, run: python chatbot_ui.py")
+    print("💡 Use the 👍/👎 buttons to provide feedback and watch the bot learn!")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to check the AI ChatBot's indexed intent matching.
+The inverted index must pick the same intent and score as scoring every pattern,
+the TF-IDF matcher must rank patterns by cosine similarity and the token
+similarity cache must report its hits and misses.
+"""
+
+import json
+import math
+import os
+import tempfile
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore
+from benchmark_matching import brute_force_match
+
+TFIDF_INTENTS = [
+    {"tag": "weather", "patterns": ["weather forecast today", "rain forecast"], "responses": ["Sunny!"]},
+    {"tag": "joke", "patterns": ["tell joke", "funny joke"], "responses": ["Knock knock."]},
+    {"tag": "greeting", "patterns": ["hello", "hello friend"], "responses": ["Hi!"]},
+    {"tag": "greeting_again", "patterns": ["hello"], "responses": ["Hi again!"]}
+]
+
+def test_index_matches_brute_force():
+    """Compare indexed matching with brute force scoring on intents.json."""
+    print("🤖 Testing AI ChatBot Intent Index")
+    print("=" * 50)
+
+    model = ChatbotModel()
+
+    test_cases = [pattern for intent in model.intents_data for pattern in intent.get('patterns', [])]
+    test_cases += [
+        "Hello dost, kaise ho?",
+        "tell me jokes",
+        "hey hey hello",
+        "I am feeling very sad today",
+        "whats the wether like",
+        "thank you so much",
+        "qwerty asdf",
+        ""
+    ]
+
+    for test_input in test_cases:
+        user_tokens = model.preprocess_text(test_input)
+        expected = brute_force_match(model, user_tokens)
+        actual = model.find_best_match(user_tokens)
+        assert actual[1] == expected[1], f"Score mismatch for {test_input!r}: {actual[1]} != {expected[1]}"
+        assert actual[0] is expected[0], f"Intent mismatch for {test_input!r}"
+
+    print(f"✅ {len(test_cases)} inputs matched the same intent and score")
+
+def test_tfidf_matching():
+    """Check TF-IDF scores, ranking and the match threshold on a small intents file."""
+    print("🤖 Testing AI ChatBot TF-IDF Matching")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+        with open(intents_file, 'w', encoding='utf-8') as file:
+            json.dump({"intents": TFIDF_INTENTS}, file)
+        model = ChatbotModel(intents_file, "tfidf", match_threshold=0.5)
+
+        # Cosine similarity with idf = ln((1 + patterns) / (1 + document frequency)) + 1
+        idf = lambda frequency: math.log((1 + 7) / (1 + frequency)) + 1
+        intent, score = model.find_best_match(["rain"])
+        assert intent["tag"] == "weather"
+        assert math.isclose(score, idf(1) / math.hypot(idf(1), idf(2))), score
+        print(f"✅ 'rain' scored {score:.3f}, its cosine similarity with 'rain forecast'")
+
+        # An exact pattern scores 1.0, shorter patterns outrank longer ones sharing the same terms
+        assert model.find_best_match(["rain", "forecast"]) == (TFIDF_INTENTS[0], 1.0)
+        assert model.find_best_match(["funny", "joke"])[0]["tag"] == "joke"
+        intent, score = model.find_best_match(["forecast"])
+        assert math.isclose(score, idf(2) / math.hypot(idf(1), idf(2))), score
+        assert score > idf(2) / math.sqrt(2 * idf(1) ** 2 + idf(2) ** 2)
+        # Equal scores go to the earliest pattern
+        assert model.find_best_match(["hello"]) == (TFIDF_INTENTS[2], 1.0)
+        assert model.find_best_match(["unknown"]) == (None, 0.0)
+        print("✅ Patterns ranked by cosine similarity, ties broken by file order")
+
+        chatbot = ChatbotLogic(model=model, learning_store=JournalLearningStore(os.path.join(tmp_dir, "l.json")))
+        result = chatbot.respond("rain forecast", learn=False)
+        assert result["tag"] == "weather" and result["response"] == "Sunny!"
+        result = chatbot.respond("weather tomorrow", learn=False)
+        assert result["tag"] is None and 0.0 < result["score"] <= 0.5, result
+        assert result["response"] in model.fallback_responses
+        chatbot.close()
+        print(f"✅ Score {result['score']:.3f} below the 0.5 threshold falls back")
+
+def test_similarity_cache_stats():
+    """Compare tokens twice and watch the cache counters."""
+    print("🤖 Testing AI ChatBot Similarity Cache")
+    print("=" * 50)
+
+    model = ChatbotModel(similarity_cache_size=2)
+    stats = model.get_similarity_cache_stats()
+    assert stats["max_size"] == 2
+
+    assert model.are_tokens_similar("joke", "jokes")
+    assert not model.are_tokens_similar("joke", "weather")
+    after_misses = model.get_similarity_cache_stats()
+    assert after_misses["misses"] == stats["misses"] + 2 and after_misses["hits"] == stats["hits"]
+
+    assert model.are_tokens_similar("joke", "jokes")
+    assert not model.are_tokens_similar("joke", "weather")
+    after_hits = model.get_similarity_cache_stats()
+    assert after_hits["hits"] == after_misses["hits"] + 2 and after_hits["misses"] == after_misses["misses"]
+
+    # A third pair evicts the least recently used one, which then misses again
+    model.are_tokens_similar("sad", "udaas")
+    model.are_tokens_similar("joke", "jokes")
+    final = model.get_similarity_cache_stats()
+    assert final["size"] == 2 and final["misses"] == after_hits["misses"] + 2
+    print(f"✅ {final['hits']} hits and {final['misses']} misses, {final['size']}/{final['max_size']} entries")
+
+if __name__ == "__main__":
+    test_index_matches_brute_force()
+    test_tfidf_matching()
+    test_similarity_cache_stats()
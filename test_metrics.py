@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's response instrumentation.
+Checks that every stage of a response is timed and counted, that the
+metrics can be read as a snapshot, JSON or Prometheus text or merged
+with another process's, that threads record independently and that the
+instrumentation costs little per message.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from chatbot_logic import ChatbotLogic
+from chatbot_metrics import ChatbotMetrics, STAGES, COUNTERS
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore
+
+MESSAGES = ["Tell me a joke", "kya haal hai 😊", "what is this", "Hello", "kaise ho नमस्ते"]
+# Loose bound on the slowdown of respond() with metrics enabled, only catches gross regressions
+MAX_OVERHEAD = 3.0
+
+def time_responses(chatbot: ChatbotLogic, repeat: int = 400) -> float:
+    """Average respond() time in seconds per message, without learning."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in MESSAGES:
+            chatbot.respond(message, learn=False)
+    return (time.perf_counter() - start) / (repeat * len(MESSAGES))
+
+def test_response_metrics():
+    """Respond to a few messages and read the metrics back."""
+    print("🤖 Testing AI ChatBot Response Metrics")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        metrics = ChatbotMetrics()
+        store = JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json"), compact_every=4)
+        chatbot = ChatbotLogic(model=model, learning_store=store, metrics=metrics)
+        for message in MESSAGES:
+            chatbot.get_response(message)
+        chatbot.get_responses(["Hello", "Bye"])
+
+        snapshot = metrics.snapshot()
+        counters = snapshot["counters"]
+        stages = snapshot["stages"]
+        assert set(counters) == set(COUNTERS) and set(stages) == set(STAGES)
+        assert counters["messages"] == 7
+        assert counters["shortcut_hits"] == 2
+        assert counters["fallbacks"] >= 1
+        assert counters["saves"] >= 1
+        assert stages["hinglish_detection"]["count"] == 7
+        assert stages["phrase_shortcut"]["count"] == 2
+        assert stages["tokenization"]["count"] == stages["pattern_scoring"]["count"] == 3
+        assert stages["batch_matching"]["count"] == 1
+        assert stages["learning"]["count"] == stages["total"]["count"] == 7
+        total = stages["total"]
+        assert 0 < total["p50_ms"] <= total["p99_ms"] <= total["max_ms"] <= total["total_ms"]
+        print(f"✅ {counters['messages']} messages: {counters['shortcut_hits']} shortcut hits, "
+              f"{counters['fallbacks']} fallbacks, {counters['saves']} saves")
+        print(f"✅ Total p50 {total['p50_ms']:.3f} ms, p99 {total['p99_ms']:.3f} ms")
+
+        text = metrics.to_prometheus()
+        assert 'chatbot_stage_seconds_count{stage="total"} 7' in text
+        assert 'chatbot_stage_seconds_bucket{stage="tokenization",le="+Inf"} 3' in text
+        assert "chatbot_messages_total 7" in text
+        json_file = os.path.join(tmp_dir, "metrics.json")
+        prometheus_file = os.path.join(tmp_dir, "metrics.prom")
+        metrics.dump(json_file)
+        metrics.dump(prometheus_file)
+        with open(json_file, 'r', encoding='utf-8') as file:
+            assert json.load(file)["counters"] == counters
+        with open(prometheus_file, 'r', encoding='utf-8') as file:
+            assert file.read() == text
+        print("✅ Metrics dumped as JSON and Prometheus text")
+
+        # Merging the export of another process adds up every counter and histogram
+        merged = ChatbotMetrics()
+        merged.merge(json.loads(json.dumps(metrics.export())))
+        merged.merge(metrics.export())
+        assert merged.snapshot()["counters"]["messages"] == 14
+        assert merged.snapshot()["stages"]["total"]["max_ms"] == total["max_ms"]
+        assert 'chatbot_stage_seconds_count{stage="total"} 14' in merged.to_prometheus()
+        print("✅ Exported metrics merged")
+
+        metrics.reset()
+        assert metrics.snapshot()["counters"]["messages"] == 0
+        chatbot.close()
+
+        # Instrumentation cost per message, with and without metrics
+        disabled = ChatbotLogic(model=model, learning_store=JournalLearningStore(os.path.join(tmp_dir, "a.json")))
+        enabled = ChatbotLogic(model=model, learning_store=JournalLearningStore(os.path.join(tmp_dir, "b.json")),
+                               metrics=ChatbotMetrics())
+        time_responses(disabled, 50)
+        disabled_time = min(time_responses(disabled, 200) for _ in range(5))
+        enabled_time = min(time_responses(enabled, 200) for _ in range(5))
+        assert enabled_time < disabled_time * MAX_OVERHEAD, (disabled_time, enabled_time)
+        print(f"✅ {disabled_time * 1e6:.1f} µs/message without metrics, {enabled_time * 1e6:.1f} µs with "
+              f"({enabled_time / disabled_time:.2f}x)")
+        disabled.close()
+        enabled.close()
+
+def test_metrics_threads():
+    """Record from several threads and read the totals of all of them."""
+    print("🤖 Testing AI ChatBot Metrics Threads")
+    print("=" * 50)
+
+    metrics = ChatbotMetrics()
+    barrier = threading.Barrier(4)
+
+    def record_messages():
+        for _ in range(1000):
+            metrics.count("messages")
+            metrics.record("total", time.perf_counter())
+        # Keep every thread alive until all of them have recorded
+        barrier.wait()
+
+    threads = [threading.Thread(target=record_messages) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["messages"] == 3000 and snapshot["stages"]["total"]["count"] == 3000
+    assert len(metrics._threads) == 3
+    print("✅ Totals of running threads added up")
+
+    for thread in threads:
+        thread.join()
+    metrics.count("messages")
+    assert metrics.snapshot()["counters"]["messages"] == 3001
+    assert len(metrics._threads) == 1
+    print("✅ Totals of finished threads kept")
+
+    metrics.reset()
+    metrics.count("messages")
+    assert metrics.snapshot()["counters"]["messages"] == 1
+    print("✅ Reset cleared every thread's totals")
+
+if __name__ == "__main__":
+    test_response_metrics()
+    test_metrics_threads()
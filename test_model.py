@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's compiled model file.
+Checks that a compiled model matches like the JSON one from its mapped
+flat tables, that a stale, damaged or pickled file falls back to
+compiling the JSON files, and that an incremental reload builds the
+same index as compiling from scratch.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+from chatbot_compiled import COMPILED_HEADER, COMPILED_MAGIC, FLAT_MATCHERS
+from chatbot_model import ChatbotModel
+
+SAMPLE_MESSAGES = ["Hello there", "Tell me a joke", "I'm feeling sad", "kaise ho", "qwerty asdf", "Bye"]
+RELOAD_MESSAGES = SAMPLE_MESSAGES + ["zebra crossing", "knock knock joke", "what's the weather", "thank you",
+                                     "crossing the road", "what is your name"]
+
+def index_contents(index):
+    """Patterns, postings and TF-IDF weights of an index, keyed by intent and pattern position."""
+    position = {pattern_id: (pattern.intent_key, pattern.position) for pattern_id, pattern in index.patterns.items()}
+    contents = {
+        "patterns": [(p.intent_key, p.position, p.text, p.tokens, p.intent) for p in index.ordered_patterns()],
+        "postings": {token: sorted(position[pattern_id] for pattern_id in pattern_ids)
+                     for token, pattern_ids in index.postings.items()},
+        "similar": {token: sorted(index.vocabulary.similar_tokens(token))
+                    for message in RELOAD_MESSAGES for token in index.preprocess(message)}
+    }
+    if hasattr(index, "columns"):
+        contents["idf"] = index.idf
+        contents["columns"] = {token: sorted((position[pattern_id], round(weight, 12))
+                                             for pattern_id, weight in zip(*column))
+                               for token, column in index.columns.items()}
+    return contents
+
+def test_compiled_model():
+    """Compile a model, load it back and compare the matches."""
+    print("🤖 Testing AI ChatBot Compiled Model")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+        shutil.copy("intents.json", intents_file)
+        compiled_file = os.path.join(tmp_dir, "chatbot_model.bin")
+
+        for matcher in ("overlap", "tfidf"):
+            model = ChatbotModel(intents_file, matcher)
+            model.compile(compiled_file)
+            compiled = ChatbotModel(intents_file, matcher, compiled_file=compiled_file)
+            assert compiled.from_compiled
+            assert type(compiled.intent_index) is FLAT_MATCHERS[matcher]
+            assert len(compiled.intent_index) == len(model.intent_index)
+            assert compiled.intents_data == model.intents_data
+            assert compiled.stop_words == model.stop_words
+            assert compiled.response_tables[1:] == model.response_tables[1:]
+
+            for message in RELOAD_MESSAGES:
+                intent, score = model.find_best_match(model.preprocess_text(message))
+                compiled_intent, compiled_score = compiled.find_best_match(compiled.preprocess_text(message))
+                assert compiled_intent == intent and compiled_score == score, message
+            assert compiled.match_batch(RELOAD_MESSAGES) == model.match_batch(RELOAD_MESSAGES)
+            for text in ("kya haal hai", "mujhe hasao yaar", "alvida dost", "hello"):
+                assert compiled.handle_hinglish_input(text) == model.handle_hinglish_input(text)
+            print(f"✅ {matcher} model read from the mapped compiled file matches the same intents")
+
+        # A model compiled for another matcher is not reused
+        assert not ChatbotModel(intents_file, "overlap", compiled_file=compiled_file).from_compiled
+        print("✅ Compiled file of another matcher ignored")
+
+        # Editing the intents makes the compiled file stale
+        ChatbotModel(intents_file, compiled_file=compiled_file).compile(compiled_file)
+        compiled = ChatbotModel(intents_file, compiled_file=compiled_file)
+        with open(intents_file, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        data["intents"].append({"tag": "compiled_test", "patterns": ["zebra crossing"], "responses": ["Stripes!"]})
+        with open(intents_file, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+        model = ChatbotModel(intents_file, compiled_file=compiled_file)
+        assert not model.from_compiled
+        assert model.find_best_match(model.preprocess_text("zebra crossing"))[0]["tag"] == "compiled_test"
+        print("✅ Stale compiled file fell back to the JSON files")
+
+        # A model loaded from a compiled file reloads into a regular index
+        assert compiled.from_compiled and compiled.reload_if_changed()
+        assert compiled.intent_index.changes == {"added": 1, "changed": 0, "removed": 0}
+        assert compiled.find_best_match(compiled.preprocess_text("zebra crossing"))[0]["tag"] == "compiled_test"
+        print("✅ Compiled model reloaded from the edited JSON files")
+
+        # Damaged and missing files fall back too
+        model.compile(compiled_file)
+        with open(compiled_file, 'r+b') as file:
+            file.truncate(60)
+        assert not ChatbotModel(intents_file, compiled_file=compiled_file).from_compiled
+        assert not ChatbotModel(intents_file, compiled_file=os.path.join(tmp_dir, "missing.bin")).from_compiled
+        print("✅ Damaged or missing compiled file fell back to the JSON files")
+
+        # A pickle from the first format version is never unpickled
+        marker = os.path.join(tmp_dir, "unpickled")
+        class Payload:
+            def __reduce__(self):
+                return os.mkdir, (marker,)
+        model.compile(compiled_file)
+        with open(compiled_file, 'r+b') as file:
+            content_hash = COMPILED_HEADER.unpack(file.read(COMPILED_HEADER.size))[2]
+            file.seek(0)
+            file.truncate()
+            file.write(COMPILED_MAGIC + (1).to_bytes(4, "little") + content_hash + pickle.dumps(Payload()))
+        assert not ChatbotModel(intents_file, compiled_file=compiled_file).from_compiled
+        assert not os.path.exists(marker)
+        print("✅ Pickled compiled file of the old format rejected without loading it")
+
+def test_incremental_reload():
+    """Edit, add and remove intents, then compare the reloaded index with a full rebuild."""
+    print("🤖 Testing AI ChatBot Incremental Reload")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        intents_file = os.path.join(tmp_dir, "intents.json")
+
+        for matcher in ("overlap", "tfidf"):
+            shutil.copy("intents.json", intents_file)
+            model = ChatbotModel(intents_file, matcher)
+            old_index = model.intent_index
+            old_contents = index_contents(old_index)
+
+            with open(intents_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            intents = data["intents"]
+            joke = next(intent for intent in intents if intent["tag"] == "joke")
+            joke["patterns"] = ["knock knock joke"] + joke["patterns"][1:]
+            intents.insert(2, {"tag": "zebra", "patterns": ["zebra crossing", "crossing the road"],
+                               "responses": ["Stripes!"]})
+            data["intents"] = [intent for intent in intents if intent["tag"] != "weather"]
+            with open(intents_file, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            # Make sure the modification time changes on coarse clocks too
+            stat = os.stat(intents_file)
+            os.utime(intents_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+            assert model.reload_if_changed()
+            assert not model.reload_if_changed()
+            assert model.intent_index.changes == {"added": 1, "changed": 1, "removed": 1}
+
+            rebuilt = ChatbotModel(intents_file, matcher)
+            assert index_contents(model.intent_index) == index_contents(rebuilt.intent_index)
+            for message in RELOAD_MESSAGES:
+                assert (model.find_best_match(model.preprocess_text(message)) ==
+                        rebuilt.find_best_match(rebuilt.preprocess_text(message))), message
+            assert model.find_best_match(model.preprocess_text("zebra crossing"))[0]["tag"] == "zebra"
+
+            # The index used before the reload is left as it was
+            assert index_contents(old_index) == old_contents
+            print(f"✅ {matcher} index reloaded incrementally equals a full rebuild")
+
+if __name__ == "__main__":
+    test_compiled_model()
+    test_incremental_reload()
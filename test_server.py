@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's HTTP and WebSocket server.
+Runs the server in-process on a free port and drives it with the load generator's clients,
+and a pre-forked server whose workers share the mapped compiled model.
+"""
+
+import asyncio
+import os
+import signal
+import tempfile
+
+from chatbot_metrics import ChatbotMetrics
+from chatbot_model import ChatbotModel
+from chatbot_session import SessionManager
+from chatbot_server import ChatbotServer, HttpClient, PreforkServer, ShardRouter, listen_socket, session_shard
+from load_test import WebSocketClient, get_stats, run_load
+
+async def exercise_server(session_dir: str):
+    """Chat over both protocols and check that requests were batched and timed."""
+    sessions = SessionManager(ChatbotModel(), session_dir=session_dir, metrics=ChatbotMetrics())
+    server = ChatbotServer(sessions, port=0, batch_window=0.005)
+    await server.start()
+    try:
+        client = HttpClient(server.host, server.port)
+        await client.connect()
+        status, reply = await client.request("POST", "/chat", {"session": "alice", "message": "Tell me a joke"})
+        assert status == 200 and reply["response"]
+        status, reply = await client.request("POST", "/feedback",
+                                             {"session": "alice", "message": "Tell me a joke", "feedback": "positive"})
+        assert status == 200 and reply == {"ok": True}
+        status, _ = await client.request("POST", "/chat", {"session": "alice"})
+        assert status == 400
+        status, _ = await client.request("GET", "/missing")
+        assert status == 404
+        await client.close()
+        print("✅ HTTP chat, feedback and errors")
+
+        client = WebSocketClient(server.host, server.port)
+        await client.connect()
+        reply = await client.send({"type": "chat", "session": "bob", "message": "Hello", "id": 7})
+        assert reply["status"] == 200 and reply["id"] == 7 and reply["response"]
+        reply = await client.send({"type": "stats"})
+        assert reply["sessions"] == 2
+        await client.close()
+        print("✅ WebSocket chat and stats")
+
+        for websocket in (False, True):
+            result = await run_load(server.host, server.port, connections=20, requests=200, websocket=websocket)
+            assert result["requests"] == 200 and result["errors"] == 0
+
+        assert server.batcher.batches < server.batcher.batched_requests
+        assert sessions.get_session("alice").user_preferences == {"likes_jokes": 1}
+        assert sessions.get_session("alice").response_feedback == {"Tell me a joke": "positive"}
+        print(f"✅ Load test batched {server.batcher.get_stats()['average_batch']:.1f} requests per batch")
+
+        client = HttpClient(server.host, server.port)
+        await client.connect()
+        status, reply = await client.request("GET", "/metrics")
+        assert status == 200 and reply["counters"]["messages"] == 402
+        assert reply["stages"]["batch_matching"]["count"] == server.batcher.batches
+        await client.close()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"GET /metrics?format=prometheus HTTP/1.1\r\nConnection: close\r\n\r\n")
+        text = (await reader.read()).decode('utf-8')
+        writer.close()
+        assert "text/plain" in text and "chatbot_messages_total 402" in text
+        print(f"✅ Metrics served as JSON and Prometheus text, "
+              f"p99 {reply['stages']['total']['p99_ms']:.2f} ms per response")
+    finally:
+        await server.stop()
+
+async def exercise_shards(session_dir: str):
+    """Send every request to shard 0 and check each session ends up on its owner."""
+    model = ChatbotModel()
+    sockets = [listen_socket("127.0.0.1", 0) for _ in range(2)]
+    ports = [sock.getsockname()[1] for sock in sockets]
+    servers = [ChatbotServer(SessionManager(model, session_dir=session_dir, metrics=ChatbotMetrics()),
+                             router=ShardRouter(index, ports))
+               for index in range(2)]
+    for server, sock in zip(servers, sockets):
+        await server.start([sock])
+
+    try:
+        client = HttpClient("127.0.0.1", ports[0])
+        await client.connect()
+        for i in range(20):
+            status, reply = await client.request("POST", "/chat", {"session": f"user-{i}", "message": "Tell me a joke"})
+            assert status == 200 and reply["response"]
+        await client.close()
+
+        for i in range(20):
+            owner = servers[0].router.owner(f"user-{i}")
+            assert f"user-{i}" in servers[owner].sessions
+            assert f"user-{i}" not in servers[1 - owner].sessions
+        assert servers[0].router.forwarded == len(servers[1].sessions) > 0
+        print(f"✅ {servers[0].router.forwarded} of 20 sessions forwarded to their owning shard")
+
+        # Clients that know the routing connect to the owner and are never forwarded
+        client = HttpClient("127.0.0.1", ports[0])
+        await client.connect()
+        status, stats = await client.request("GET", "/stats")
+        await client.close()
+        assert status == 200 and stats["worker_ports"] == ports
+        forwarded = [server.router.forwarded for server in servers]
+        for i in range(20, 40):
+            session_id = f"user-{i}"
+            client = HttpClient("127.0.0.1", stats["worker_ports"][session_shard(session_id, len(ports))])
+            await client.connect()
+            status, reply = await client.request("POST", "/chat", {"session": session_id, "message": "Hello"})
+            await client.close()
+            assert status == 200 and reply["response"]
+            assert session_id in servers[servers[0].router.owner(session_id)].sessions
+        assert [server.router.forwarded for server in servers] == forwarded
+        print("✅ Session-affine requests served by their owner without forwarding")
+
+        # Every shard reports the metrics summed over both
+        for port in ports:
+            client = HttpClient("127.0.0.1", port)
+            await client.connect()
+            status, metrics = await client.request("GET", "/metrics")
+            await client.close()
+            assert status == 200 and metrics["counters"]["messages"] == 40
+            assert metrics["stages"]["total"]["count"] == 40
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics?format=prometheus HTTP/1.1\r\nConnection: close\r\n\r\n")
+            text = (await reader.read()).decode('utf-8')
+            writer.close()
+            assert "chatbot_messages_total 40" in text
+        print("✅ Metrics summed over the shards on every port")
+    finally:
+        for server in servers:
+            await server.stop()
+
+async def exercise_prefork(port: int):
+    """Wait for a pre-forked server to start, then chat with every worker on its own port."""
+    for _ in range(100):
+        try:
+            stats = await get_stats("127.0.0.1", port)
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    worker_ports = stats["worker_ports"]
+    for i in range(10):
+        session_id = f"user-{i}"
+        client = HttpClient("127.0.0.1", worker_ports[session_shard(session_id, len(worker_ports))])
+        await client.connect()
+        status, reply = await client.request("POST", "/chat", {"session": session_id, "message": "Tell me a joke"})
+        await client.close()
+        assert status == 200 and reply["response"]
+    print(f"✅ Chatted with {len(worker_ports)} pre-forked workers")
+
+def test_server():
+    """Run the server test on a fresh event loop."""
+    print("🤖 Testing AI ChatBot Server")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(exercise_server(tmp_dir))
+
+def test_session_sharding():
+    """Run two shards in one process and route sessions between them."""
+    print("🤖 Testing AI ChatBot Session Sharding")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(exercise_shards(tmp_dir))
+
+def test_prefork_server():
+    """Pre-fork two workers and check that they read the model from one shared file mapping."""
+    print("🤖 Testing AI ChatBot Pre-forked Server")
+    print("=" * 50)
+
+    if not hasattr(os, "fork"):
+        print("⚠️ Pre-forking needs os.fork(), skipped")
+        return
+    model = ChatbotModel()
+    sock = listen_socket("127.0.0.1", 0)
+    port = sock.getsockname()[1]
+    sock.close()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                PreforkServer(model, 2, port=port, session_dir=tmp_dir).serve()
+            finally:
+                os._exit(0)
+        try:
+            asyncio.run(exercise_prefork(port))
+
+            # Linux lists the workers and their mappings in /proc
+            children_file = f"/proc/{pid}/task/{pid}/children"
+            if os.path.exists(children_file):
+                with open(children_file) as file:
+                    workers = file.read().split()
+                assert len(workers) == 2
+                for worker in workers:
+                    with open(f"/proc/{worker}/maps") as file:
+                        mapped = [line for line in file if "chatbot_model_" in line]
+                    assert mapped and all(line.rstrip().endswith("(deleted)") for line in mapped)
+                print("✅ Every worker maps the removed compiled model file")
+        finally:
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+    assert not model.from_compiled
+
+if __name__ == "__main__":
+    test_server()
+    test_session_sharding()
+    test_prefork_server()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's multi-user sessions.
+Sessions share one compiled model but keep their own learning data, and
+a session in use is never evicted or closed under a running call.
+"""
+
+import os
+import tempfile
+import threading
+
+from chatbot_model import ChatbotModel
+from chatbot_session import SessionManager
+
+def test_sessions_share_model():
+    """Chat in two sessions and check that their learning data stays separate."""
+    print("🤖 Testing AI ChatBot Sessions")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(model, session_dir=tmp_dir)
+
+        manager.get_response("alice", "Tell me a joke")
+        manager.get_response("alice", "Another joke please")
+        manager.get_response("bob", "I'm feeling sad")
+
+        alice = manager.get_session("alice")
+        bob = manager.get_session("bob")
+        assert alice.model is bob.model is model
+        assert alice.user_preferences == {"likes_jokes": 2}
+        assert bob.user_preferences == {"needs_motivation": 1}
+        assert len(alice.conversation_history) == 2 and len(bob.conversation_history) == 1
+        print("✅ Sessions share the model, not the learning data")
+
+        # Nothing is written until the session is flushed or evicted
+        assert os.listdir(tmp_dir) == []
+        manager.flush()
+        assert len(os.listdir(tmp_dir)) == 2
+        manager.close()
+
+        manager = SessionManager(model, session_dir=tmp_dir)
+        assert manager.get_session("alice").user_preferences == {"likes_jokes": 2}
+        manager.close()
+        print("✅ Session reloaded from disk")
+
+def test_session_eviction():
+    """Evict sessions by capacity (least recently used) and by idle time."""
+    print("🤖 Testing AI ChatBot Session Eviction")
+    print("=" * 50)
+
+    now = [0.0]
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(model, session_dir=tmp_dir, max_sessions=2, idle_timeout=60,
+                                 clock=lambda: now[0])
+
+        manager.get_response("a", "Hello")
+        manager.get_response("b", "Hello")
+        manager.get_session("a")
+        manager.get_response("c", "Hello")
+        assert "a" in manager and "c" in manager and "b" not in manager
+        assert len(os.listdir(tmp_dir)) == 1
+        print("✅ Least recently used session evicted and saved")
+
+        now[0] = 30.0
+        manager.get_session("c")
+        now[0] = 70.0
+        assert manager.evict_idle() == 1
+        assert "a" not in manager and "c" in manager
+        assert manager.get_stats()["evictions"] == 2
+        manager.close()
+        print("✅ Idle session evicted")
+
+def test_session_lease():
+    """Keep a leased session open while other sessions push it out."""
+    print("🤖 Testing AI ChatBot Session Leases")
+    print("=" * 50)
+
+    now = [0.0]
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(model, session_dir=tmp_dir, max_sessions=2, idle_timeout=60,
+                                 clock=lambda: now[0])
+        assert manager.get_session("a").learning_data_file is None
+
+        with manager.lease("a") as session:
+            # Neither capacity nor idle time evicts a session in use
+            manager.get_response("b", "Hello")
+            manager.get_response("c", "Hello")
+            assert "a" in manager and "b" not in manager
+            now[0] = 100.0
+            assert manager.evict_idle() == 1
+            assert "a" in manager and len(manager) == 1
+            assert session.get_response("Tell me a joke")
+
+            # Ending it only closes it once the call is done
+            assert manager.end_session("a")
+            assert "a" not in manager
+            assert session.get_response("Another joke please")
+            assert session.learning_store.pending
+        assert not session.learning_store.pending
+        print("✅ Session in use kept open until its lease ended")
+
+        manager.get_response("d", "Hello")
+        manager.get_response("e", "Hello")
+        manager.get_response("f", "Hello")
+        assert "d" not in manager and len(manager) == 2
+        print("✅ Released sessions evicted again")
+
+        manager.close()
+        manager = SessionManager(model, session_dir=tmp_dir)
+        assert manager.get_session("a").user_preferences == {"likes_jokes": 2}
+        manager.close()
+        print("✅ Calls made during the lease were saved")
+
+def test_session_reopen():
+    """Reopen sessions that were just ended or evicted without losing their updates."""
+    print("🤖 Testing AI ChatBot Session Reopening")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(model, session_dir=tmp_dir, max_sessions=1)
+
+        # Ended while in use: the same session is taken back
+        with manager.lease("a") as session:
+            session.get_response("Tell me a joke")
+            session.get_response("Another joke please")
+            assert manager.end_session("a")
+            reopened = manager.get_session("a")
+            assert reopened is session and reopened.user_preferences == {"likes_jokes": 2}
+            reopened.get_response("One more joke")
+        manager.close()
+        manager = SessionManager(model, session_dir=tmp_dir, max_sessions=1)
+        assert manager.get_session("a").user_preferences == {"likes_jokes": 3}
+        print("✅ Session ended while in use reopened without losing updates")
+
+        # Evicted and still being written: reopening waits for the write
+        session = manager.get_session("a")
+        writing, written = threading.Event(), threading.Event()
+        close = session.close
+
+        def slow_close():
+            writing.set()
+            written.wait(10)
+            close()
+
+        session.close = slow_close
+        evicting = threading.Thread(target=manager.get_response, args=("b", "Hello"))
+        evicting.start()
+        assert writing.wait(10)
+        reopening = threading.Thread(target=manager.get_response, args=("a", "Tell me a joke"))
+        reopening.start()
+        reopening.join(0.2)
+        assert reopening.is_alive()
+        written.set()
+        evicting.join(10)
+        reopening.join(10)
+        assert manager.get_session("a") is not session
+        assert manager.get_session("a").user_preferences == {"likes_jokes": 4}
+        manager.close()
+        manager = SessionManager(model, session_dir=tmp_dir)
+        assert manager.get_session("a").user_preferences == {"likes_jokes": 4}
+        manager.close()
+        print("✅ Evicted session reopened once it was written")
+
+if __name__ == "__main__":
+    test_sessions_share_model()
+    test_session_eviction()
+    test_session_lease()
+    test_session_reopen()
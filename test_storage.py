@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's learning data storage.
+Checks that the journal is replayed over the snapshot and survives compaction,
+and that the SQLite store keeps the same data and counts it for the chatbot.
+"""
+
+import json
+import os
+import tempfile
+
+from chatbot_logic import ChatbotLogic
+from chatbot_model import ChatbotModel
+from chatbot_storage import JournalLearningStore, SqliteLearningStore, BackgroundLearningWriter
+
+def test_journal_replay_and_compaction():
+    """Append events, reload them, compact and reload again."""
+    print("🤖 Testing AI ChatBot Learning Journal")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_file = os.path.join(tmp_dir, "chatbot_learning.json")
+        store = JournalLearningStore(snapshot_file, sync_every=3, history_limit=5)
+
+        for i in range(8):
+            store.append({"type": "conversation", "entry": {"user_input": f"message {i}"}})
+        store.append({"type": "preference", "key": "likes_jokes", "value": 2})
+        store.append({"type": "feedback", "user_input": "Tell me a joke", "feedback": "positive"})
+        store.close()
+
+        data = JournalLearningStore(snapshot_file, history_limit=5).load()
+        assert [c["user_input"] for c in data["conversation_history"]] == [f"message {i}" for i in range(3, 8)]
+        assert data["user_preferences"] == {"likes_jokes": 2}
+        assert data["response_feedback"] == {"Tell me a joke": "positive"}
+        print("✅ Journal replayed over an empty snapshot")
+
+        # A torn last line (crash mid-write) is skipped
+        with open(store.journal_file, 'a', encoding='utf-8') as file:
+            file.write('{"type": "prefer')
+
+        store = JournalLearningStore(snapshot_file, history_limit=5)
+        data = store.load()
+        assert data["user_preferences"] == {"likes_jokes": 2}
+        print("✅ Torn journal entry ignored")
+
+        store.compact(data)
+        assert os.path.getsize(store.journal_file) == 0
+        with open(snapshot_file, 'r', encoding='utf-8') as file:
+            assert json.load(file)["response_feedback"] == {"Tell me a joke": "positive"}
+
+        store.append({"type": "preference", "key": "likes_jokes", "value": 3})
+        store.close()
+        data = JournalLearningStore(snapshot_file, history_limit=5).load()
+        assert data["user_preferences"] == {"likes_jokes": 3}
+        assert len(data["conversation_history"]) == 5
+        print("✅ Snapshot plus journal restored after compaction")
+
+def test_background_writer():
+    """Queue events and snapshots on the writer thread and read them back."""
+    print("🤖 Testing AI ChatBot Background Learning Writer")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_file = os.path.join(tmp_dir, "chatbot_learning.json")
+        writer = BackgroundLearningWriter(JournalLearningStore(snapshot_file))
+
+        for i in range(200):
+            writer.append({"type": "preference", "key": "count", "value": i})
+        writer.compact({"user_preferences": {"count": 199}, "conversation_history": []})
+        writer.append({"type": "feedback", "user_input": "hello", "feedback": "positive"})
+        writer.flush()
+
+        with open(snapshot_file, 'r', encoding='utf-8') as file:
+            assert json.load(file)["user_preferences"] == {"count": 199}
+        print("✅ flush() waited for the queued snapshot")
+
+        writer.append({"type": "preference", "key": "count", "value": 200})
+        writer.close()
+
+        data = JournalLearningStore(snapshot_file).load()
+        assert data["user_preferences"] == {"count": 200}
+        assert data["response_feedback"] == {"hello": "positive"}
+        print("✅ close() wrote the remaining events")
+
+def test_sqlite_store():
+    """Write events to the SQLite store, reload them and query feedback counts."""
+    print("🤖 Testing AI ChatBot SQLite Learning Store")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_file = os.path.join(tmp_dir, "chatbot_learning.db")
+        store = BackgroundLearningWriter(SqliteLearningStore(database_file, history_limit=5))
+
+        for i in range(8):
+            store.append({"type": "conversation", "entry": {"timestamp": f"2024-01-01T00:00:0{i}",
+                                                            "user_input": f"Message  {i}"}})
+        store.append({"type": "preference", "key": "likes_jokes", "value": 2})
+        store.append({"type": "feedback", "user_input": "Tell me a joke", "feedback": "positive"})
+        store.append({"type": "feedback", "user_input": "Tell me a joke", "feedback": "negative"})
+        store.append({"type": "feedback", "user_input": "hello", "feedback": "positive"})
+
+        assert store.feedback_stats() == {"positive": 1, "negative": 1, "total_feedback": 2}
+        assert not store.needs_compaction
+        store.close()
+        print("✅ Feedback counted by query")
+
+        store = SqliteLearningStore(database_file, history_limit=5)
+        data = store.load()
+        assert [c["user_input"] for c in data["conversation_history"]] == [f"Message  {i}" for i in range(3, 8)]
+        assert data["user_preferences"] == {"likes_jokes": 2}
+        assert store.conversation_count() == 8
+        assert store.normalize_input(" Message  3 ") == "message 3"
+        print("✅ Recent conversations and preferences reloaded")
+
+        page = store.conversation_page(limit=3)
+        assert [entry["user_input"] for _, entry in page] == [f"Message  {i}" for i in range(5, 8)]
+        page = store.conversation_page(before=page[0][0], limit=3)
+        assert [entry["user_input"] for _, entry in page] == [f"Message  {i}" for i in range(2, 5)]
+        assert len(store.conversation_page(before=page[0][0], limit=3)) == 2
+        assert store.conversation_page(before=1) == []
+        print("✅ Conversation history paged back by id")
+
+        store.reset({"user_preferences": {"likes_jokes": 1}})
+        data = store.load()
+        assert data["conversation_history"] == []
+        assert data["user_preferences"] == {"likes_jokes": 1}
+        assert store.feedback_stats()["total_feedback"] == 0
+        store.close()
+        print("✅ Reset cleared the database")
+
+def test_sqlite_chatbot_stats():
+    """Conversation statistics of a SQLite-backed chatbot come from the database."""
+    print("🤖 Testing AI ChatBot SQLite Statistics")
+    print("=" * 50)
+
+    model = ChatbotModel()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_file = os.path.join(tmp_dir, "chatbot_learning.db")
+        chatbot = ChatbotLogic(model=model, history_capacity=5,
+                               learning_store=BackgroundLearningWriter(SqliteLearningStore(database_file)))
+        for i in range(8):
+            chatbot.get_response(f"Tell me a joke {i}")
+        chatbot.provide_feedback("Tell me a joke 0", "positive")
+        chatbot.provide_feedback("Tell me a joke 1", "negative")
+
+        stats = chatbot.get_conversation_stats()
+        assert stats["total_conversations"] == 8
+        assert stats["feedback_stats"] == {"positive": 1, "negative": 1, "total_feedback": 2}
+        assert chatbot.response_feedback == {}
+        chatbot.close()
+
+        # Only the recent history is loaded again, the counts still cover everything
+        chatbot = ChatbotLogic(model=model, history_capacity=5,
+                               learning_store=SqliteLearningStore(database_file, history_limit=5))
+        assert len(chatbot.conversation_history) == 5
+        stats = chatbot.get_conversation_stats()
+        assert stats["total_conversations"] == 8
+        assert stats["feedback_stats"]["total_feedback"] == 2
+        feedback = {entry["user_input"]: entry["feedback"] for _, entry in chatbot.get_history_page()}
+        assert len(feedback) == 8 and feedback["Tell me a joke 0"] == "positive"
+        chatbot.close()
+        print("✅ Conversations and feedback counted by the database")
+
+if __name__ == "__main__":
+    test_journal_replay_and_compaction()
+    test_background_writer()
+    test_sqlite_store()
+    test_sqlite_chatbot_stats()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot's built-in tokenizer.
+Checks the word_tokenize-style splitting and that NLTK is not imported
+unless its tokenizer is selected.
+"""
+
+import os
+import subprocess
+import sys
+
+from chatbot_model import ChatbotModel
+from chatbot_tokenizer import RegexTokenizer, ENGLISH_STOP_WORDS
+
+def test_regex_tokenizer():
+    """Split chat messages the way word_tokenize does."""
+    print("🤖 Testing AI ChatBot Regex Tokenizer")
+    print("=" * 50)
+
+    tokenizer = RegexTokenizer()
+    cases = {
+        "hello, how are you?": ["hello", "how", "are", "you"],
+        "i can't stop. really!": ["i", "ca", "n't", "stop", "really"],
+        "it's you're i'm": ["it", "'s", "you", "'re", "i", "'m"],
+        "well-known e.g. wait...what": ["well-known", "e.g", "wait", "what"],
+        "know--really (yes) [no]": ["know", "really", "yes", "no"],
+        "gonna cannot": ["gon", "na", "can", "not"],
+        "i wanna": ["i", "wan", "na"],
+        "wanna go?": ["wan", "na", "go"],
+        "नमस्ते! आप कैसे हैं?": ["नमस्ते", "आप", "कैसे", "हैं"],
+        "hello😊 there “smart”": ["hello😊", "there", "“", "smart", "”"],
+    }
+    for text, expected in cases.items():
+        assert tokenizer.tokenize(text) == expected, (text, tokenizer.tokenize(text))
+    print(f"✅ {len(cases)} messages split like word_tokenize")
+
+    model = ChatbotModel()
+    assert model.stop_words == set(ENGLISH_STOP_WORDS)
+    assert model.preprocess_text("I don't feel happy, yaar 😊") == ["feel", "happy", "yaar", "😊"]
+    assert model.preprocess_text("Kya haal hai? नमस्ते") == ["kya", "haal", "hai", "नमस्ते"]
+    print("✅ Stop words dropped, Hinglish and Hindi tokens kept")
+
+    try:
+        ChatbotModel(tokenizer="spacy")
+        assert False, "unknown tokenizer accepted"
+    except ValueError:
+        print("✅ Unknown tokenizer rejected")
+
+def test_nltk_not_imported():
+    """The default model must not import NLTK."""
+    code = "import sys, chatbot_logic; chatbot_logic.ChatbotModel(); print('nltk' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert output.strip().endswith("False"), output
+    print("✅ NLTK not imported by the default tokenizer")
+
+if __name__ == "__main__":
+    test_regex_tokenizer()
+    test_nltk_not_imported()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI ChatBot desktop window, run without a display.
+Checks that responses, statistics and resets are computed off the GUI
+thread and shown in order after the minimum response delay, that the
+transcript stays fast however
+many messages it holds and that past conversations are restored lazily.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt, QThread
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtTest import QTest
+
+from chatbot_logic import ChatbotLogic
+from chatbot_storage import JournalLearningStore, SqliteLearningStore
+from chatbot_ui import AI_ChatBot, ChatArea, TranscriptModel
+
+MESSAGES = ["Hello", "Tell me a joke", "I'm feeling sad", "kaise ho", "Bye"]
+
+class SlowChatbot(ChatbotLogic):
+    """Chatbot whose responses take a while, like with a large intents file."""
+
+    def get_response(self, user_input: str) -> str:
+        time.sleep(0.05)
+        return super().get_response(user_input)
+
+class SlowStoreChatbot(ChatbotLogic):
+    """Chatbot whose learning store is slow to query and reset, recording the threads used."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = []
+
+    def get_conversation_stats(self):
+        self.threads.append(QThread.currentThread())
+        time.sleep(0.2)
+        return super().get_conversation_stats()
+
+    def reset_learning(self):
+        self.threads.append(QThread.currentThread())
+        time.sleep(0.2)
+        super().reset_learning()
+
+def wait_until(condition, timeout: float = 5.0):
+    """Run the Qt event loop until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QTest.qWait(10)
+    return condition()
+
+def test_response_worker():
+    """Send several messages at once and watch the responses arrive."""
+    print("🤖 Testing AI ChatBot Response Worker")
+    print("=" * 50)
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json"))
+        window = AI_ChatBot(min_response_delay=300, chatbot=SlowChatbot(learning_store=store))
+
+        shown = []
+        display_bot_response = window.display_bot_response
+        def record(user_message, response):
+            shown.append((user_message, time.monotonic()))
+            display_bot_response(user_message, response)
+        window.display_bot_response = record
+
+        start = time.monotonic()
+        for message in MESSAGES:
+            window.input_area.text_input.setText(message)
+            window.send_message()
+        send_time = time.monotonic() - start
+        assert send_time < 0.05 * len(MESSAGES), send_time
+        print(f"✅ {len(MESSAGES)} messages sent in {send_time * 1000:.1f} ms without waiting for responses")
+
+        assert wait_until(lambda: len(shown) == len(MESSAGES))
+        assert [message for message, _ in shown] == MESSAGES
+        print("✅ Responses shown in the order the messages were sent")
+
+        assert shown[0][1] - start >= 0.3
+        print(f"✅ First response shown after {(shown[0][1] - start) * 1000:.0f} ms (minimum 300 ms)")
+
+        # Click the thumbs up button of the last response
+        chat_area = window.chat_area
+        chat_area.resize(600, 400)
+        chat_area.scroll_to_bottom()
+        last_row = chat_area.transcript.index(chat_area.transcript.rowCount() - 1)
+        bubble = chat_area.delegate.bubble_rect(last_row.data(TranscriptModel.MessageRole), chat_area.visualRect(last_row))
+        QTest.mouseClick(chat_area.viewport(), Qt.LeftButton, pos=chat_area.delegate.button_rects(bubble)[0].center())
+        assert last_row.data(TranscriptModel.MessageRole).feedback == "positive"
+        window.close()
+        assert window.response_worker.isFinished()
+        assert store.load()["response_feedback"] == {MESSAGES[-1]: "positive"}
+        print("✅ Feedback handled by the worker before the window closed")
+
+def test_learning_menu():
+    """Open the statistics and reset the learning data without blocking the GUI thread."""
+    print("🤖 Testing AI ChatBot Learning Menu")
+    print("=" * 50)
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = JournalLearningStore(os.path.join(tmp_dir, "chatbot_learning.json"))
+        chatbot = SlowStoreChatbot(learning_store=store)
+        chatbot.get_response("Tell me a joke")
+        window = AI_ChatBot(min_response_delay=0, chatbot=chatbot)
+
+        shown = []
+        window.display_learning_stats = lambda stats: shown.append((stats, threading.current_thread()))
+        start = time.monotonic()
+        window.show_learning_stats()
+        assert time.monotonic() - start < 0.1
+        assert wait_until(lambda: shown)
+        stats, thread = shown[0]
+        assert stats["total_conversations"] == 1 and stats["user_preferences"] == {"likes_jokes": 1}
+        assert chatbot.threads == [window.response_worker] and thread is threading.main_thread()
+        print("✅ Statistics queried on the worker and shown on the GUI thread")
+
+        question, information = QMessageBox.question, QMessageBox.information
+        confirmed = []
+        QMessageBox.question = staticmethod(lambda *args: QMessageBox.Yes)
+        QMessageBox.information = staticmethod(lambda *args: confirmed.append(threading.current_thread()))
+        try:
+            start = time.monotonic()
+            window.reset_learning()
+            assert time.monotonic() - start < 0.1
+            assert wait_until(lambda: confirmed)
+        finally:
+            QMessageBox.question, QMessageBox.information = question, information
+        assert chatbot.threads[1] is window.response_worker and confirmed[0] is threading.main_thread()
+        assert chatbot.get_conversation_stats()["total_conversations"] == 0
+        window.close()
+        print("✅ Learning data reset on the worker, confirmed on the GUI thread")
+
+def scroll_to_top(chat_area: ChatArea, times: int):
+    """Scroll to the top repeatedly, giving history pages time to arrive."""
+    scroll_bar = chat_area.verticalScrollBar()
+    for _ in range(times):
+        scroll_bar.setValue(scroll_bar.minimum())
+        QTest.qWait(20)
+
+def test_virtualized_transcript():
+    """Append thousands of messages and page back through them."""
+    print("🤖 Testing AI ChatBot Virtualized Transcript")
+    print("=" * 50)
+
+    app = QApplication.instance() or QApplication([])
+    chat_area = ChatArea(max_rows=100, page_size=25)
+    chat_area.resize(500, 400)
+    chat_area.show()
+
+    def append_time(count: int) -> float:
+        start = time.perf_counter()
+        for i in range(count):
+            chat_area.add_message(f"Message {chat_area.transcript.end} " + "word " * (i % 30), is_user=i % 2 == 0)
+            app.processEvents()
+        return (time.perf_counter() - start) / count
+
+    early = append_time(200)
+    append_time(3000)
+    late = append_time(200)
+    assert chat_area.transcript.rowCount() == 100
+    assert len(chat_area.transcript.messages) == 3400
+    print(f"✅ Append cost {early * 1000:.2f} ms at 200 messages, {late * 1000:.2f} ms at 3400")
+
+    # Scrolling to the top pages older messages in, keeping the window bounded
+    scroll_bar = chat_area.verticalScrollBar()
+    for _ in range(20):
+        scroll_bar.setValue(scroll_bar.minimum())
+        app.processEvents()
+    assert chat_area.transcript.start == 3400 - 100 - 20 * 25
+    assert chat_area.transcript.rowCount() == 100
+    top = chat_area.indexAt(chat_area.viewport().rect().topLeft())
+    assert top.data().startswith(f"Message {chat_area.transcript.start + top.row()} ")
+    print(f"✅ Paged back to message {chat_area.transcript.start} with 100 rows laid out")
+
+    # A new message jumps back to the end
+    chat_area.add_message("Newest")
+    app.processEvents()
+    assert chat_area.transcript.end == 3401 and chat_area.transcript.rowCount() == 100
+    assert chat_area.indexAt(chat_area.viewport().rect().bottomLeft()).data() == "Newest"
+    print("✅ New message shown at the end after paging back")
+
+def test_history_restore():
+    """Open the window over a large stored history and scroll up through it."""
+    print("🤖 Testing AI ChatBot History Restore")
+    print("=" * 50)
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        startup_times = {}
+        for count in (100, 20000):
+            store = SqliteLearningStore(os.path.join(tmp_dir, f"history_{count}.db"))
+            store.reset({"conversation_history": [
+                {"timestamp": "2024-01-01T12:00:00", "user_input": f"Question {i}", "bot_response": f"Answer {i}"}
+                for i in range(count)
+            ]})
+
+            start = time.perf_counter()
+            window = AI_ChatBot(min_response_delay=0, chatbot=ChatbotLogic(learning_store=store))
+            transcript = window.chat_area.transcript
+            assert wait_until(lambda: transcript.history_pages)
+            startup_times[count] = time.perf_counter() - start
+
+            # Only the newest page is loaded at startup
+            loaded = transcript.history_pages[0][0]
+            assert loaded == 2 * min(count, transcript.page_size) and len(transcript.history_pages) == 1
+            assert transcript.messages[loaded - 1].text == f"Answer {count - 1}"
+            assert transcript.messages[loaded - 1].reply_to == f"Question {count - 1}"
+            window.close()
+        print(f"✅ Startup in {startup_times[100] * 1000:.1f} ms with 100 conversations stored, "
+              f"{startup_times[20000] * 1000:.1f} ms with 20000")
+
+        # Scrolling up pages in older conversations, keeping rows and messages bounded
+        store = SqliteLearningStore(os.path.join(tmp_dir, "history_20000.db"))
+        chatbot = ChatbotLogic(learning_store=store)
+        threads = []
+        get_history_page = chatbot.get_history_page
+        def record_thread(before, limit):
+            threads.append(QThread.currentThread())
+            return get_history_page(before, limit)
+        chatbot.get_history_page = record_thread
+        window = AI_ChatBot(min_response_delay=0, chatbot=chatbot)
+        chat_area = window.chat_area
+        transcript = chat_area.transcript
+        chat_area.resize(500, 400)
+        window.show()
+        assert wait_until(lambda: transcript.rowCount())
+        scroll_to_top(chat_area, 40)
+        assert transcript.rowCount() <= transcript.max_rows
+        top = transcript.message(0)
+        assert int(top.text.split()[1]) < 20000 - 4 * transcript.page_size, top.text
+        assert transcript.history_pages
+        assert len(threads) > 4 and all(thread is window.response_worker for thread in threads)
+        print(f"✅ Scrolled back to '{top.text}' with {transcript.rowCount()} rows laid out, "
+              f"{len(threads)} pages queried on the worker")
+
+        # Sending a message jumps to the end and releases the history far above the window
+        window.input_area.text_input.setText("Hello")
+        window.send_message()
+        assert wait_until(lambda: transcript.message(transcript.rowCount() - 1).reply_to == "Hello")
+        assert len(transcript.messages) <= 3 * transcript.max_rows, len(transcript.messages)
+        print(f"✅ {len(transcript.messages)} messages kept in memory after jumping to the end")
+
+        # Scrolling up again loads the released history back
+        scroll_to_top(chat_area, 40)
+        assert int(transcript.message(0).text.split()[1]) < 20000 - 4 * transcript.page_size
+        window.close()
+        print("✅ Released history loaded again when scrolling back")
+
+if __name__ == "__main__":
+    test_response_worker()
+    test_learning_menu()
+    test_virtualized_transcript()
+    test_history_restore()